@@ -0,0 +1,126 @@
+# collision.py
+
+import math
+import pygame
+import numpy as np
+
+
+def build_frame_masks(frames, background=None):
+    """
+    Collision masks and tight opaque bounds for animation frames, built once at load.
+    Args:
+        frames (list): Frame Surfaces.
+        background (tuple, optional): RGB colour that counts as empty besides transparent pixels
+            (the ripped CPC sheets have an opaque pen 0 background).
+    Returns:
+        (masks, bounds): one pygame.mask.Mask and one frame-local pygame.Rect per frame
+            (an empty Rect for a fully transparent frame).
+    """
+    masks, bounds = [], []
+    for frame in frames:
+        mask = pygame.mask.from_surface(frame)
+        if background is not None:
+            mask.erase(pygame.mask.from_threshold(frame, (*background, 255), (1, 1, 1, 255)), (0, 0))
+        rects = mask.get_bounding_rects()
+        masks.append(mask)
+        bounds.append(rects[0].unionall(rects[1:]) if rects else pygame.Rect(0, 0, 0, 0))
+    return masks, bounds
+
+
+def sprites_overlap(a, b):
+    """
+    Pixel-accurate overlap of two sprites (damage, item pickup).
+    Phase 1 rejects on the rects and, where the sprites provide them, their tight opaque
+    bounds (`opaque_rect`); phase 2 is a single Mask.overlap on the sprites' `mask`.
+    Returns:
+        tuple or None: The first overlapping point in `a`'s frame coordinates, or None.
+    """
+    if not a.rect.colliderect(b.rect):
+        return None
+    a_bounds = getattr(a, "opaque_rect", a.rect)
+    b_bounds = getattr(b, "opaque_rect", b.rect)
+    if not a_bounds.colliderect(b_bounds):
+        return None
+    return a.mask.overlap(b.mask, (b.rect.x - a.rect.x, b.rect.y - a.rect.y))
+
+
+class CollisionGrid:
+    """
+    Solid/empty tile grid for continuous (swept) collision.
+    Cells outside the grid are open; screen edges are handled by the caller.
+    """
+    def __init__(self, grid, tile_size):
+        """
+        Args:
+            grid: (rows, cols) array or nested lists, non-zero = solid
+                (collision JSON, RoomPack Room.collision_grid(), flowfield.grid_from_rects()).
+            tile_size (int): Cell size in the pixels the swept boxes use (e.g. settings.TILE_WIDTH).
+        """
+        self.solid = (np.asarray(grid) != 0).tolist()  # Nested lists: fastest per-cell lookups
+        self.rows = len(self.solid)
+        self.cols = len(self.solid[0]) if self.rows else 0
+        self.tile_size = tile_size
+
+    def column_blocked(self, col, first_row, last_row):
+        """True if any cell of column `col` between the two rows (inclusive) is solid."""
+        if not 0 <= col < self.cols:
+            return False
+        return any(self.solid[row][col] for row in range(max(first_row, 0), min(last_row + 1, self.rows)))
+
+    def row_blocked(self, row, first_col, last_col):
+        """True if any cell of row `row` between the two columns (inclusive) is solid."""
+        if not 0 <= row < self.rows or last_col < 0:
+            return False
+        return any(self.solid[row][max(first_col, 0):min(last_col + 1, self.cols)])
+
+    def sweep_x(self, x, y, width, height, dx):
+        """
+        Move a box horizontally, stopping at the first solid column its leading edge would cross.
+        Only the columns between the current and the target leading edge are visited.
+        Returns:
+            (new x, hit)
+        """
+        size = self.tile_size
+        first_row, last_row = math.floor(y / size), math.ceil((y + height) / size) - 1
+        if dx > 0:
+            start_col = math.ceil((x + width) / size)           # First column right of the box
+            end_col = math.ceil((x + width + dx) / size) - 1    # Last column the moved box reaches
+            for col in range(start_col, end_col + 1):
+                if self.column_blocked(col, first_row, last_row):
+                    return col * size - width, True
+        elif dx < 0:
+            start_col = math.floor(x / size) - 1                # First column left of the box
+            end_col = math.floor((x + dx) / size)
+            for col in range(start_col, end_col - 1, -1):
+                if self.column_blocked(col, first_row, last_row):
+                    return (col + 1) * size, True
+        return x + dx, False
+
+    def sweep_y(self, x, y, width, height, dy):
+        """Vertical counterpart of sweep_x. Returns (new y, hit)."""
+        size = self.tile_size
+        first_col, last_col = math.floor(x / size), math.ceil((x + width) / size) - 1
+        if dy > 0:
+            start_row = math.ceil((y + height) / size)
+            end_row = math.ceil((y + height + dy) / size) - 1
+            for row in range(start_row, end_row + 1):
+                if self.row_blocked(row, first_col, last_col):
+                    return row * size - height, True
+        elif dy < 0:
+            start_row = math.floor(y / size) - 1
+            end_row = math.floor((y + dy) / size)
+            for row in range(start_row, end_row - 1, -1):
+                if self.row_blocked(row, first_col, last_col):
+                    return (row + 1) * size, True
+        return y + dy, False
+
+    def sweep(self, x, y, width, height, dx, dy):
+        """
+        Move a box by (dx, dy): horizontal axis first, then vertical from the resolved x
+        (the same order as Player.handle_platform_collisions).
+        Returns:
+            (new x, new y, hit_x, hit_y)
+        """
+        x, hit_x = self.sweep_x(x, y, width, height, dx)
+        y, hit_y = self.sweep_y(x, y, width, height, dy)
+        return x, y, hit_x, hit_y
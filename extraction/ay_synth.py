@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Offline AY-3-8912 synthesizer: render AY register frames to PCM
+The CPC's AY chip is emulated on whole arrays: register frames (50 Hz) are
+expanded to per-sample register values, and tone, noise and envelope counters
+are running sums of per-sample increments, so an effect renders without any
+per-sample Python loop.
+
+Chip model (1 MHz clock on the CPC):
+    tone A/B/C   square wave, f = clock / (16 * period), 12-bit periods (R0-R5)
+    noise        17-bit LFSR (taps 0 and 3), f = clock / (16 * period), 5-bit period (R6)
+    mixer        R7 bits 0-2 disable tone, bits 3-5 disable noise (0 = enabled)
+    amplitude    R8-R10 bits 0-3 fixed level, bit 4 = follow the envelope
+    envelope     16 steps per cycle, step rate = clock / (16 * period) (R11/R12),
+                 shape R13 (continue, attack, alternate, hold); restarts when R13 is written
+
+Input: register frame dumps, (num_frames, 14) uint8 arrays of R0..R13 saved with
+numpy (.npy), e.g. logged from an emulator. Sound effects are not rendered from
+SOUND.DAT: how the game's sound driver (in MUCODE.BIN) turns its records into
+register writes is not decoded yet.
+
+Usage:
+    python ay_synth.py FRAMES.npy [--output OUT.wav] [--rate 44100] [--frame-rate 50]
+"""
+
+import os
+import wave
+import argparse
+from functools import lru_cache
+
+import numpy as np
+
+AY_CLOCK = 1000000
+FRAME_RATE = 50
+
+# AY DAC output per amplitude level (normalized, logarithmic steps)
+AY_VOLUMES = np.array([
+    0.0, 0.0137, 0.0205, 0.0291, 0.0423, 0.0618, 0.0847, 0.1369,
+    0.1691, 0.2647, 0.3527, 0.4499, 0.5704, 0.6873, 0.8482, 1.0,
+])
+
+
+@lru_cache(maxsize=1)
+def noise_sequence():
+    """Output bits of the 17-bit noise LFSR over one full period (131071 steps)."""
+    bits = np.empty(131071, dtype=np.uint8)
+    state = 1
+    for i in range(len(bits)):
+        bits[i] = state & 1
+        state = (state >> 1) | (((state ^ (state >> 3)) & 1) << 16)
+    return bits
+
+
+def envelope_levels(steps, shape):
+    """
+    Envelope level (0..15) after `steps` envelope steps for R13 shape values.
+
+    Args:
+        steps: int array of steps since the envelope was (re)started
+        shape: R13 values (array of the same shape or scalar)
+    """
+    cont, attack, alternate, hold = ((shape >> bit) & 1 for bit in (3, 2, 1, 0))
+    cycle, pos = steps // 16, steps % 16
+
+    # Continuing shapes flip direction every cycle when alternating (unless holding)
+    direction = attack ^ (alternate & (cycle & 1) & (1 - hold))
+    level = np.where(direction == 1, pos, 15 - pos)
+
+    # After the first cycle: shapes 0-7 drop to 0, hold shapes keep their final level
+    held = np.where(cont == 0, 0, np.where(attack ^ alternate, 15, 0))
+    return np.where((cycle > 0) & ((cont == 0) | (hold == 1)), held, level)
+
+
+def envelope_steps(env_period, sample_restarts, sample_rate):
+    """
+    Envelope steps elapsed at every sample since the last restart.
+
+    Args:
+        env_period: (n,) per-sample R11/R12 period (>= 1)
+        sample_restarts: (n,) bool, True where the envelope restarts (R13 written)
+        sample_rate: Output sample rate in Hz
+
+    Returns:
+        (n,) int64 step counts (16 steps per envelope cycle)
+    """
+    n = len(env_period)
+    env_inc = AY_CLOCK / (16.0 * env_period * sample_rate)
+    env_total = np.cumsum(env_inc)
+    segment_start = np.maximum.accumulate(np.where(sample_restarts, np.arange(n), 0))
+    return (env_total - env_total[segment_start] + env_inc[segment_start]).astype(np.int64)
+
+
+def render(frames, restarts=None, sample_rate=44100, frame_rate=FRAME_RATE):
+    """
+    Render AY register frames to mono PCM.
+
+    Args:
+        frames: (num_frames, 14) uint8 register values R0..R13, one row per frame
+        restarts: (num_frames,) bool, True where R13 was written (envelope restart);
+                  default: first frame only
+        sample_rate: Output sample rate in Hz
+        frame_rate: Register update rate in Hz (50 on the CPC)
+
+    Returns:
+        int16 array of samples
+    """
+    frames = np.asarray(frames, dtype=np.int64)
+    num_frames = len(frames)
+    if restarts is None:
+        restarts = np.zeros(num_frames, dtype=bool)
+        restarts[0] = True
+
+    # Sample -> frame index; every register becomes a per-sample array
+    frame_of_sample = (np.arange(num_frames * sample_rate // frame_rate) * frame_rate) // sample_rate
+    regs = frames[frame_of_sample]
+    n = len(frame_of_sample)
+
+    # Noise and envelope (shared by all channels)
+    noise_period = np.maximum(regs[:, 6] & 0x1F, 1)
+    noise_steps = np.cumsum(AY_CLOCK / (16.0 * noise_period * sample_rate)).astype(np.int64)
+    noise = noise_sequence()[noise_steps % 131071]
+
+    env_period = np.maximum(regs[:, 11] | (regs[:, 12] << 8), 1)
+    sample_restarts = np.zeros(n, dtype=bool)
+    sample_restarts[np.searchsorted(frame_of_sample, np.nonzero(restarts)[0])] = True
+    env_steps = envelope_steps(env_period, sample_restarts, sample_rate)
+    env_level = envelope_levels(env_steps, regs[:, 13] & 0x0F)
+
+    mixer = regs[:, 7]
+    output = np.zeros(n)
+    for channel in range(3):
+        period = np.maximum(regs[:, 2 * channel] | ((regs[:, 2 * channel + 1] & 0x0F) << 8), 1)
+        phase = np.cumsum(AY_CLOCK / (16.0 * period * sample_rate))
+        tone = (phase * 2).astype(np.int64) & 1
+
+        tone_off = (mixer >> channel) & 1
+        noise_off = (mixer >> (channel + 3)) & 1
+        gate = (tone | tone_off) & (noise | noise_off)
+
+        amplitude = regs[:, 8 + channel]
+        level = np.where(amplitude & 0x10, env_level, amplitude & 0x0F)
+        output += gate * AY_VOLUMES[level]
+
+    output -= output.mean()  # The AY output is unipolar; remove the DC offset
+    peak = np.abs(output).max()
+    if peak > 0:
+        output *= 0.8 / max(peak, 1.0)
+    return (output * 32767).astype(np.int16)
+
+
+def save_wav(pcm, output_path, sample_rate=44100):
+    """Write int16 mono PCM to a WAV file."""
+    with wave.open(output_path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(np.ascontiguousarray(pcm, dtype="<i2").tobytes())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render AY-3-8912 register frames to WAV")
+    parser.add_argument("frames", help="(num_frames, 14) register frames saved with numpy (.npy)")
+    parser.add_argument("--output", default=None, help="Output WAV (default: FRAMES with .wav)")
+    parser.add_argument("--rate", type=int, default=44100, help="Sample rate in Hz (default: 44100)")
+    parser.add_argument("--frame-rate", type=int, default=FRAME_RATE,
+                        help=f"Register update rate in Hz (default: {FRAME_RATE})")
+    args = parser.parse_args()
+
+    frames = np.load(args.frames)
+    output_path = args.output or os.path.splitext(args.frames)[0] + ".wav"
+    print(f"Rendering {args.frames}")
+    pcm = render(frames, sample_rate=args.rate, frame_rate=args.frame_rate)
+    save_wav(pcm, output_path, args.rate)
+    print(f"  {len(frames)} frames -> {len(pcm) / args.rate:.2f} s")
+    print(f"  Saved to: {output_path}")
+    print()
+
+
+if __name__ == '__main__':
+    main()
@@ -4,48 +4,13 @@ Convert Amstrad CPC Mode 0 graphics to PNG
 Based on CPC Mode 0 format: 160x200, 16 colors
 """
 
-from PIL import Image
 import sys
 import os
 
-# Amstrad CPC Mode 0 Palette (Hardware colors)
-CPC_PALETTE = [
-    (0, 0, 0),         # 0: Black
-    (0, 0, 128),       # 1: Blue
-    (0, 0, 255),       # 2: Bright Blue
-    (128, 0, 0),       # 3: Red
-    (128, 0, 128),     # 4: Magenta
-    (128, 0, 255),     # 5: Mauve
-    (255, 0, 0),       # 6: Bright Red
-    (255, 0, 128),     # 7: Purple
-    (255, 0, 255),     # 8: Bright Magenta
-    (0, 128, 0),       # 9: Green
-    (0, 128, 128),     # 10: Cyan
-    (0, 128, 255),     # 11: Sky Blue
-    (128, 128, 0),     # 12: Yellow
-    (128, 128, 128),   # 13: White (Gray)
-    (128, 128, 255),   # 14: Pastel Blue
-    (255, 128, 0),     # 15: Orange
-]
-
-def decode_mode0_byte(byte_val):
-    """
-    Decode a Mode 0 byte into 2 pixels (4 bits per pixel)
-    Mode 0 uses a complex bit interleaving pattern
-    """
-    # Mode 0 bit pattern for 2 pixels:
-    # Byte: b7 b6 b5 b4 b3 b2 b1 b0
-    # Pixel 0: b7 b5 b3 b1 (bits 7,5,3,1)
-    # Pixel 1: b6 b4 b2 b0 (bits 6,4,2,0)
-
-    pixel0 = ((byte_val & 0x80) >> 4) | ((byte_val & 0x20) >> 3) | \
-             ((byte_val & 0x08) >> 2) | ((byte_val & 0x02) >> 1)
-    pixel1 = ((byte_val & 0x40) >> 3) | ((byte_val & 0x10) >> 2) | \
-             ((byte_val & 0x04) >> 1) | (byte_val & 0x01)
+# Decoding (byte -> pen lookup tables, CPC_PALETTE) lives in cpc_decode.py
+from cpc_decode import read_bytes, decode_linear, pens_to_image, PIXELS_PER_BYTE
 
-    return pixel0, pixel1
-
-def convert_cpc_to_png(input_file, output_file, width=160, height=None, offset=0):
+def convert_cpc_to_png(input_file, output_file, width=160, height=None, offset=0, mode=0):
     """
     Convert CPC Mode 0 graphics file to PNG
 
@@ -55,55 +20,22 @@ def convert_cpc_to_png(input_file, output_file, width=160, height=None, offset=0
         width: Width in pixels (default 160 for Mode 0)
         height: Height in pixels (auto-calculated if None)
         offset: Bytes to skip at start (for headers)
+        mode: CPC screen mode (0, 1 or 2)
     """
     # Read binary data
-    with open(input_file, 'rb') as f:
-        data = f.read()[offset:]  # Skip header if specified
-
-    # Calculate dimensions
-    # Each byte = 2 pixels in Mode 0
-    # Each line = width/2 bytes
-    bytes_per_line = width // 2
+    data = read_bytes(input_file, offset)  # Skip header if specified
 
-    if height is None:
-        # Auto-calculate height from file size
-        height = len(data) // bytes_per_line
-        if height == 0:
-            height = 200  # Default CPC screen height
+    # Each byte = 2 pixels in Mode 0, 4 in Mode 1, 8 in Mode 2
+    bytes_per_line = width // PIXELS_PER_BYTE[mode]
+    pens = decode_linear(data, width, mode, height)
 
     print(f"Converting {input_file}")
     print(f"  File size: {len(data)} bytes (offset: {offset})")
-    print(f"  Dimensions: {width}x{height}")
+    print(f"  Dimensions: {width}x{pens.shape[0]} (mode {mode})")
     print(f"  Bytes per line: {bytes_per_line}")
 
-    # Create image
-    img = Image.new('RGB', (width, height))
-    pixels = img.load()
-
-    # Decode pixels
-    byte_index = 0
-    for y in range(height):
-        for x in range(0, width, 2):
-            if byte_index >= len(data):
-                break
-
-            byte_val = data[byte_index]
-            pixel0, pixel1 = decode_mode0_byte(byte_val)
-
-            # Clamp color indices to palette range
-            pixel0 = pixel0 % len(CPC_PALETTE)
-            pixel1 = pixel1 % len(CPC_PALETTE)
-
-            # Set pixels
-            if x < width:
-                pixels[x, y] = CPC_PALETTE[pixel0]
-            if x + 1 < width:
-                pixels[x + 1, y] = CPC_PALETTE[pixel1]
-
-            byte_index += 1
-
     # Save PNG
-    img.save(output_file)
+    pens_to_image(pens).save(output_file)
     print(f"  Saved to: {output_file}")
     print()
 
@@ -174,6 +106,7 @@ def main():
 
     print("=" * 60)
     print("Conversion complete! Check the png/ folder for results.")
+    print("For unknown files, find_stride.py ranks width/offset/mode guesses first.")
     print("=" * 60)
 
 if __name__ == '__main__':
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Analyse LOCDATA.BIN location records
+
+LOCDATA.BIN (5120 bytes after the AMSDOS header) is XOR-obfuscated with its
+padding byte (&B8) and splits into 80 fixed-size records of 64 bytes, one per
+location. Observed layout of a de-obfuscated record (offsets in bytes):
+    0..9, 10..19  two 10-byte blocks of the same shape (offsets 1, 8, 9 are always 0)
+    20..39        varying fields
+    40..43        a flag group (each offset takes one non-zero value or 0)
+    44..51        varying fields
+    52..63        four 3-byte entries (same value sets at 52/55/58/61, 53/56/59/62, 54/57/60/63)
+The mapping from these fields to the tiles drawn on screen is NOT decoded: a
+64-byte record is far smaller than an 18x20 tilemap, so rooms are built from
+objects or compressed data handled by the game code. This tool only dumps the
+records and per-offset statistics for analysis; it does not render rooms or
+build collision grids.
+
+Usage:
+    python convert_locations.py [--input raw/LOCDATA.BIN] [--output-dir png/]
+"""
+
+import os
+import json
+import argparse
+
+import numpy as np
+
+from cpc_decode import read_bytes, parse_amsdos_header
+
+RECORD_SIZE = 64
+
+
+def read_locdata(path, xor_key=None):
+    """
+    Read LOCDATA.BIN into de-obfuscated records.
+
+    Args:
+        path: Path to LOCDATA.BIN (with or without AMSDOS header)
+        xor_key: Obfuscation key (default: the most common byte, i.e. the padding)
+
+    Returns:
+        ((num_records, 64) uint8 array, xor_key)
+    """
+    data = read_bytes(path)
+    header = parse_amsdos_header(data)
+    if header is not None:
+        data = data[128:128 + header["length"]]
+    if xor_key is None:
+        xor_key = int(np.bincount(data, minlength=256).argmax())
+    num_records = len(data) // RECORD_SIZE
+    return (data[:num_records * RECORD_SIZE] ^ np.uint8(xor_key)).reshape(num_records, RECORD_SIZE), xor_key
+
+
+def describe_records(records):
+    """Per-offset statistics across all records: distinct values and how many records use the field."""
+    return [
+        {"offset": offset, "distinct": int(len(np.unique(records[:, offset]))),
+         "used": int(np.count_nonzero(records[:, offset]))}
+        for offset in range(records.shape[1])
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyse LOCDATA.BIN location records")
+    parser.add_argument("--input", default=None, help="LOCDATA.BIN (default: raw/LOCDATA.BIN)")
+    parser.add_argument("--output-dir", default=None, help="Output directory (default: png/)")
+    args = parser.parse_args()
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    output_dir = args.output_dir or os.path.join(script_dir, 'png')
+    os.makedirs(output_dir, exist_ok=True)
+
+    input_path = args.input or os.path.join(script_dir, 'raw', 'LOCDATA.BIN')
+    records, xor_key = read_locdata(input_path)
+    print(f"Decoding {input_path}")
+    print(f"  {len(records)} records of {RECORD_SIZE} bytes, XOR key &{xor_key:02X}")
+
+    dump_path = os.path.join(output_dir, 'locdata_records.json')
+    with open(dump_path, "w") as f:
+        json.dump({
+            "xorKey": xor_key,
+            "recordSize": RECORD_SIZE,
+            "fields": describe_records(records),
+            "records": [record.tobytes().hex() for record in records],
+        }, f, indent=2)
+    print(f"  Records: {dump_path}")
+    print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Convert Amstrad CPC screen memory dumps to PNG
+Screen dumps store each character row's 8 scanlines 2048 bytes apart, so they
+are de-interleaved through the CRTC address mapping instead of read linearly.
+
+Screens on sorcerpe.dsk (read straight from the disk image by default):
+- STRANGE.SCN: loading screen, a full 16K dump of bank &C000
+- TISCRN.BIN:  title screen rows, 720 bytes from &C000 (the first raster line
+               of the top 9 character rows; the rest is drawn by the game)
+Both load into a buffer at &1800 and are XOR-obfuscated with &B6. TITLEP.BIN
+(loaded at &4000) is not a screen dump and is not converted.
+
+XOR key: the most common byte is taken as the background (pen 0), so a
+non-zero most common byte is used as the key (as in find_stride.py).
+
+Usage:
+    python convert_screen.py                      # loading / title screens from raw/sorcerpe.dsk
+    python convert_screen.py FILE [--mode 0] [--base C000] [--r1 40] [--r6 25] [--xor B6]
+    python convert_screen.py NAME --dsk DISK.DSK  # a file on another disk image
+"""
+
+import os
+import argparse
+
+import numpy as np
+
+from cpc_decode import read_bytes, parse_amsdos_header, decode_screen, pens_to_image, screen_offsets
+from dsk import DskImage
+
+DEFAULT_SCREENS = ("STRANGE.SCN", "TISCRN.BIN")
+
+
+def detect_xor_key(data):
+    """The most common byte, assumed to be pen 0 background (0 = not obfuscated)."""
+    return int(np.bincount(data, minlength=256).argmax()) if len(data) else 0
+
+
+def convert_screen_to_png(input_file, output_file, mode=0, r1=40, r6=25, r9=7,
+                          start_address=None, load_address=None, xor_key=None, dsk=None):
+    """
+    Convert a CPC screen memory dump to PNG
+
+    Args:
+        input_file: Path to the dump (.BIN/.SCN, with or without AMSDOS header),
+                    or a file name on `dsk`
+        output_file: Path to output .PNG file
+        mode: CPC screen mode (0, 1 or 2)
+        r1, r6, r9: CRTC registers (chars per line, char rows, max raster address)
+        start_address: Screen start address (default: &C000)
+        load_address: Memory address of the first data byte (default: from the AMSDOS
+                      header when it lies in the screen's 16K bank; a file loaded into a
+                      buffer elsewhere is a copy of the screen from the bank base)
+        xor_key: Byte every data byte is XORed with (default: detect_xor_key())
+        dsk: Optional DskImage to read input_file from
+    """
+    if dsk is not None:
+        data = np.frombuffer(dsk.read_file(input_file, strip_header=False), dtype=np.uint8)
+    else:
+        data = read_bytes(input_file)
+    header = parse_amsdos_header(data)
+    if start_address is None:
+        start_address = 0xC000
+    bank = start_address & 0xC000
+    buffered = False
+    if header is not None:
+        data = data[128:128 + header["length"]]
+        if load_address is None:
+            load_address = header["load_address"]
+            if load_address & 0xC000 != bank:
+                load_address, buffered = bank, True
+    if load_address is None:
+        load_address = start_address
+    if xor_key is None:
+        xor_key = detect_xor_key(data)
+    if xor_key:
+        data = data ^ np.uint8(xor_key)
+
+    pens = decode_screen(data, mode, r1, r6, r9, start_address, load_address)
+    offsets = screen_offsets(r1, r6, r9, start_address, load_address)
+    covered = np.mean((offsets >= 0) & (offsets < len(data)))
+
+    print(f"Converting {input_file}" + (f" from {dsk.path}" if dsk is not None else ""))
+    print(f"  Data: {len(data)} bytes at &{load_address:04X} ({'AMSDOS header' if header else 'headerless'}"
+          + (f", loaded at &{header['load_address']:04X}" if buffered else "")
+          + (f", XOR &{xor_key:02X}" if xor_key else "") + ")")
+    print(f"  Screen: &{start_address:04X}, mode {mode}, R1={r1} R6={r6} R9={r9} -> {pens.shape[1]}x{pens.shape[0]}")
+    if covered < 1:
+        print(f"  WARNING: dump covers {100 * covered:.0f}% of the screen; missing bytes are drawn as pen 0")
+
+    pens_to_image(pens).save(output_file)
+    print(f"  Saved to: {output_file}")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert CPC screen memory dumps to PNG")
+    parser.add_argument("files", nargs="*",
+                        help="Dumps to convert (default: loading and title screens on raw/sorcerpe.dsk)")
+    parser.add_argument("--dsk", default=None, help="Read the files from this disk image")
+    parser.add_argument("--mode", type=int, choices=(0, 1, 2), default=0, help="Screen mode (default: 0)")
+    parser.add_argument("--base", type=lambda v: int(v, 16), default=None,
+                        help="Screen start address in hex (default: C000)")
+    parser.add_argument("--load-address", type=lambda v: int(v, 16), default=None,
+                        help="Address of the dump's first byte in hex (default: AMSDOS header if in the "
+                             "screen bank, else the bank base)")
+    parser.add_argument("--xor", type=lambda v: int(v, 16), default=None,
+                        help="XOR key in hex (default: the most common byte; 0 = none)")
+    parser.add_argument("--r1", type=int, default=40, help="CRTC R1, characters per line (default: 40)")
+    parser.add_argument("--r6", type=int, default=25, help="CRTC R6, character rows (default: 25)")
+    parser.add_argument("--r9", type=int, default=7, help="CRTC R9, max raster address (default: 7)")
+    args = parser.parse_args()
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    png_dir = os.path.join(script_dir, 'png')
+    os.makedirs(png_dir, exist_ok=True)
+
+    files = args.files
+    dsk_path = args.dsk
+    if not files:
+        files = DEFAULT_SCREENS
+        dsk_path = dsk_path or os.path.join(script_dir, 'raw', 'sorcerpe.dsk')
+
+    dsk = None
+    if dsk_path:
+        if not os.path.exists(dsk_path):
+            print(f"SKIPPED: {dsk_path} (not found)")
+            return
+        dsk = DskImage(dsk_path)
+
+    try:
+        for input_path in files:
+            if dsk is not None and input_path not in dsk.directory:
+                print(f"SKIPPED: {input_path} (not on {dsk_path})")
+                print()
+                continue
+            if dsk is None and not os.path.exists(input_path):
+                print(f"SKIPPED: {input_path} (not found)")
+                print()
+                continue
+            base_name = os.path.splitext(os.path.basename(input_path))[0].lower()
+            output_path = os.path.join(png_dir, f"{base_name}_screen.png")
+            convert_screen_to_png(input_path, output_path, args.mode, args.r1, args.r6, args.r9,
+                                  args.base, args.load_address, args.xor, dsk)
+    finally:
+        if dsk is not None:
+            dsk.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Decode SPRITES1.BIN / SPRITES2.BIN straight into a packed RGBA atlas
+Replaces the screenshot-derived character sheet with frames decoded from the
+original data: exact pixels and exact bounding boxes in one vectorized pass.
+
+Layout (found with find_stride.py; same in both files):
+    AMSDOS header, then 96 frames of 24 lines x 6 bytes (Mode 0, 12x24 pixels),
+    XOR-obfuscated with &B6
+The frames fill the files exactly, so there are no separate mask bytes: pen 0 is
+the transparent ink and becomes alpha 0. Mode 0 pixels are doubled horizontally
+(24x24, the size the game draws sprites at on its 320-pixel-wide base screen).
+
+The game sets its own inks at runtime and they are not stored in these files;
+frames use CPC_PALETTE unless a palette JSON (16 [r, g, b] entries, one per pen)
+is given with --palette.
+
+Output (loadable with spritesheet.Spritesheet.from_atlas):
+    <name>_<page>.png, <name>.json     frames named sprites1_000 ... sprites2_095
+    png/<file>_frames.png               preview grid, 16 frames per row (the frames' sourceRect)
+
+Usage:
+    python convert_sprites.py [--output-dir ../assets/atlas] [--name sprites] [--palette inks.json]
+"""
+
+import os
+import sys
+import json
+import argparse
+
+import numpy as np
+from PIL import Image
+
+from cpc_decode import read_bytes, parse_amsdos_header, decode_bytes, pens_to_rgb, CPC_PALETTE
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tools'))
+from pack_atlas import write_atlas  # noqa: E402
+
+FRAME_BYTES_PER_LINE = 6
+FRAME_LINES = 24
+XOR_KEY = 0xB6
+FRAMES_PER_ROW = 16
+
+
+def decode_sprite_file(path, bytes_per_line=FRAME_BYTES_PER_LINE, lines=FRAME_LINES, xor_key=XOR_KEY):
+    """Decode a sprite file into a (num_frames, lines, bytes_per_line * 2) Mode 0 pen array."""
+    data = read_bytes(path)
+    header = parse_amsdos_header(data)
+    if header is not None:
+        data = data[128:128 + header["length"]]
+    frame_size = bytes_per_line * lines
+    num_frames = len(data) // frame_size
+    frames = data[:num_frames * frame_size] ^ np.uint8(xor_key)
+    return decode_bytes(frames.reshape(num_frames, lines, bytes_per_line))
+
+
+def frames_to_rgba(pens, palette=CPC_PALETTE, double_width=True):
+    """(n, h, w) pens -> (n, h, w [* 2], 4) RGBA with pen 0 transparent."""
+    if double_width:
+        pens = np.repeat(pens, 2, axis=2)
+    rgba = np.zeros(pens.shape + (4,), dtype=np.uint8)
+    rgba[..., :3] = pens_to_rgb(pens, palette)
+    rgba[..., 3] = np.where(pens > 0, 255, 0)
+    return rgba
+
+
+def bounding_boxes(rgba):
+    """
+    Exact opaque bounds of every frame at once.
+
+    Returns:
+        (n, 4) int array of (left, top, right, bottom), exclusive; all zero for blank frames
+    """
+    opaque = rgba[..., 3] > 0
+    rows, cols = opaque.any(axis=2), opaque.any(axis=1)
+    top = rows.argmax(axis=1)
+    bottom = rows.shape[1] - rows[:, ::-1].argmax(axis=1)
+    left = cols.argmax(axis=1)
+    right = cols.shape[1] - cols[:, ::-1].argmax(axis=1)
+    boxes = np.stack([left, top, right, bottom], axis=1)
+    boxes[~rows.any(axis=1)] = 0
+    return boxes
+
+
+def sprite_frames(prefix, source_name, rgba):
+    """Trimmed frame dicts in the format pack_atlas.write_atlas() expects (blank frames skipped)."""
+    frame_h, frame_w = rgba.shape[1:3]
+    frames = []
+    for index, (left, top, right, bottom) in enumerate(bounding_boxes(rgba)):
+        if right == 0:
+            continue
+        col, row = index % FRAMES_PER_ROW, index // FRAMES_PER_ROW
+        frames.append({
+            "name": f"{prefix}_{index:03d}",
+            "pixels": rgba[index, top:bottom, left:right],
+            "offset": (int(left), int(top)),
+            "sourceSize": (frame_w, frame_h),
+            "source": source_name,
+            "sourceRect": (col * frame_w, row * frame_h, frame_w, frame_h),
+        })
+    return frames
+
+
+def save_preview(rgba, output_file):
+    """Write all frames as a grid, FRAMES_PER_ROW per row."""
+    n, h, w = rgba.shape[:3]
+    rows = (n + FRAMES_PER_ROW - 1) // FRAMES_PER_ROW
+    grid = np.zeros((rows * FRAMES_PER_ROW, h, w, 4), dtype=np.uint8)
+    grid[:n] = rgba
+    grid = grid.reshape(rows, FRAMES_PER_ROW, h, w, 4).transpose(0, 2, 1, 3, 4)
+    Image.fromarray(grid.reshape(rows * h, FRAMES_PER_ROW * w, 4), "RGBA").save(output_file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Decode SPRITES1/2.BIN into a packed RGBA atlas")
+    parser.add_argument("files", nargs="*", help="Sprite files (default: SPRITES1.BIN and SPRITES2.BIN in raw/)")
+    parser.add_argument("--output-dir", default=None, help="Atlas directory (default: assets/atlas)")
+    parser.add_argument("--name", default="sprites", help="Atlas base name (default: sprites)")
+    parser.add_argument("--palette", default=None, help="JSON list of 16 [r, g, b] inks (default: CPC_PALETTE)")
+    parser.add_argument("--max-size", type=int, default=1024, help="Maximum page size in pixels (default: 1024)")
+    args = parser.parse_args()
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    raw_dir = os.path.join(script_dir, 'raw')
+    png_dir = os.path.join(script_dir, 'png')
+    output_dir = args.output_dir or os.path.join(script_dir, '..', 'assets', 'atlas')
+    os.makedirs(png_dir, exist_ok=True)
+    os.makedirs(output_dir, exist_ok=True)
+
+    palette = CPC_PALETTE
+    if args.palette:
+        with open(args.palette) as f:
+            palette = [tuple(rgb) for rgb in json.load(f)]
+
+    files = args.files or [os.path.join(raw_dir, name) for name in ('SPRITES1.BIN', 'SPRITES2.BIN')]
+    frames = []
+    for path in files:
+        base_name = os.path.splitext(os.path.basename(path))[0].lower()
+        rgba = frames_to_rgba(decode_sprite_file(path), palette)
+        file_frames = sprite_frames(base_name, os.path.basename(path), rgba)
+        save_preview(rgba, os.path.join(png_dir, f"{base_name}_frames.png"))
+        print(f"{path}: {len(rgba)} frames ({len(file_frames)} non-blank), {rgba.shape[2]}x{rgba.shape[1]}")
+        frames.extend(file_frames)
+
+    write_atlas(frames, output_dir, args.name, args.max_size)
+    print(f"\n  Metadata: {os.path.join(output_dir, args.name + '.json')}")
+
+
+if __name__ == '__main__':
+    main()
@@ -2,39 +2,86 @@
 """
 Convert Amstrad CPC Character/Tile data to PNG
 Character sets are typically 8x8 tiles, 8 bytes per character
+
+Besides the PNG, every charset is cached as <name>_tiles.npz holding its
+deduplicated (N, 8, 8) pen array and a remap table, and all charsets are merged
+into png/tile_bank.npz so consumers load pens directly instead of re-decoding PNGs:
+
+    tiles = load_tile_bank("png/tile_bank.npz", "conset1")   # (num_tiles, 8, 8) pens
 """
 
-from PIL import Image
+import numpy as np
 import sys
 import os
 
-# Amstrad CPC Mode 0 Palette
-CPC_PALETTE = [
-    (0, 0, 0),         # 0: Black
-    (0, 0, 128),       # 1: Blue
-    (0, 0, 255),       # 2: Bright Blue
-    (128, 0, 0),       # 3: Red
-    (128, 0, 128),     # 4: Magenta
-    (128, 0, 255),     # 5: Mauve
-    (255, 0, 0),       # 6: Bright Red
-    (255, 0, 128),     # 7: Purple
-    (255, 0, 255),     # 8: Bright Magenta
-    (0, 128, 0),       # 9: Green
-    (0, 128, 128),     # 10: Cyan
-    (0, 128, 255),     # 11: Sky Blue
-    (128, 128, 0),     # 12: Yellow
-    (128, 128, 128),   # 13: White (Gray)
-    (128, 128, 255),   # 14: Pastel Blue
-    (255, 128, 0),     # 15: Orange
-]
-
-def decode_mode0_byte(byte_val):
-    """Decode a Mode 0 byte into 2 pixels"""
-    pixel0 = ((byte_val & 0x80) >> 4) | ((byte_val & 0x20) >> 3) | \
-             ((byte_val & 0x08) >> 2) | ((byte_val & 0x02) >> 1)
-    pixel1 = ((byte_val & 0x40) >> 3) | ((byte_val & 0x10) >> 2) | \
-             ((byte_val & 0x04) >> 1) | (byte_val & 0x01)
-    return pixel0, pixel1
+# Decoding (byte -> pen lookup tables, CPC_PALETTE) lives in cpc_decode.py
+from cpc_decode import read_bytes, decode_bytes, pens_to_image
+
+def decode_charset(data, tile_width=8, tile_height=8):
+    """Decode Mode 0 charset bytes into a (num_tiles, tile_height, tile_width) pen array."""
+    bytes_per_tile_line = tile_width // 2  # Mode 0: 2 pixels per byte
+    bytes_per_tile = bytes_per_tile_line * tile_height
+    num_tiles = len(data) // bytes_per_tile
+    return decode_bytes(data[:num_tiles * bytes_per_tile].reshape(num_tiles, tile_height, bytes_per_tile_line))
+
+
+def dedupe_tiles(tiles):
+    """
+    Merge identical tiles.
+
+    Returns:
+        (unique, remap) where unique keeps first occurrences in their original
+        order and unique[remap] reproduces tiles
+    """
+    flat = tiles.reshape(len(tiles), -1)
+    _, first, inverse = np.unique(flat, axis=0, return_index=True, return_inverse=True)
+    order = np.argsort(first)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return tiles[first[order]], rank[inverse.reshape(-1)].astype(np.uint16)
+
+
+def save_tile_cache(path, tiles):
+    """Write a deduplicated tile cache (.npz with "tiles" and "remap")."""
+    unique, remap = dedupe_tiles(tiles)
+    np.savez_compressed(path, tiles=unique, remap=remap)
+    return unique, remap
+
+
+def load_tile_bank(path, name=None):
+    """
+    Load pens from a tile cache or the merged tile bank.
+
+    Args:
+        path: <name>_tiles.npz or tile_bank.npz
+        name: Charset inside the merged bank (e.g. "conset1"); None for a single-charset cache
+
+    Returns:
+        (num_tiles, tile_height, tile_width) uint8 pen array in the charset's original order
+    """
+    with np.load(path) as cache:
+        remap = cache["remap" if name is None else f"remap_{name}"]
+        return cache["tiles"][remap]
+
+
+def build_tile_bank(path, charsets):
+    """
+    Merge several charsets into one deduplicated bank.
+
+    Args:
+        path: Output .npz path
+        charsets: {name: (num_tiles, h, w) pen array}; all tiles must share one size
+
+    Returns:
+        Number of unique tiles in the bank
+    """
+    names = list(charsets)
+    unique, remap = dedupe_tiles(np.concatenate([charsets[n] for n in names]))
+    bounds = np.cumsum([0] + [len(charsets[n]) for n in names])
+    remaps = {f"remap_{n}": remap[bounds[i]:bounds[i + 1]] for i, n in enumerate(names)}
+    np.savez_compressed(path, tiles=unique, **remaps)
+    return len(unique)
+
 
 def convert_charset_to_png(input_file, output_file, tile_width=8, tile_height=8, tiles_per_row=16):
     """
@@ -42,16 +89,18 @@ def convert_charset_to_png(input_file, output_file, tile_width=8, tile_height=8,
 
     Args:
         input_file: Path to character set .BIN file
-        output_file: Path to output .PNG file
+        output_file: Path to output .PNG file (the .npz tile cache is written next to it)
         tile_width: Width of each tile in pixels (default 8)
         tile_height: Height of each tile in pixels (default 8)
         tiles_per_row: Number of tiles per row in output (default 16)
+
+    Returns:
+        (num_tiles, tile_height, tile_width) pen array
     """
-    with open(input_file, 'rb') as f:
-        data = f.read()
+    data = read_bytes(input_file)
 
     # Calculate number of tiles
-    # Each 8x8 tile = 4 bytes per line * 8 lines = 32 bytes (Mode 0: 4 pixels per byte)
+    # Each 8x8 tile = 4 bytes per line * 8 lines = 32 bytes (Mode 0: 2 pixels per byte)
     bytes_per_tile_line = tile_width // 2  # Mode 0: 2 pixels per byte
     bytes_per_tile = bytes_per_tile_line * tile_height
     num_tiles = len(data) // bytes_per_tile
@@ -69,47 +118,25 @@ def convert_charset_to_png(input_file, output_file, tile_width=8, tile_height=8,
 
     print(f"  Output dimensions: {img_width}x{img_height} ({tiles_per_row} tiles per row)")
 
-    # Create image
-    img = Image.new('RGB', (img_width, img_height), color=(0, 0, 0))
-    pixels = img.load()
+    # Decode every tile at once: (num_tiles, tile_height, tile_width) pens
+    tiles = decode_charset(data, tile_width, tile_height)
 
-    # Process each tile
-    for tile_idx in range(num_tiles):
-        tile_offset = tile_idx * bytes_per_tile
-
-        # Calculate tile position in output image
-        tile_x = (tile_idx % tiles_per_row) * tile_width
-        tile_y = (tile_idx // tiles_per_row) * tile_height
-
-        # Decode tile pixels
-        for y in range(tile_height):
-            line_offset = tile_offset + y * bytes_per_tile_line
-
-            for x in range(0, tile_width, 2):
-                byte_offset = line_offset + x // 2
-
-                if byte_offset >= len(data):
-                    break
-
-                byte_val = data[byte_offset]
-                pixel0, pixel1 = decode_mode0_byte(byte_val)
-
-                # Clamp to palette
-                pixel0 = pixel0 % len(CPC_PALETTE)
-                pixel1 = pixel1 % len(CPC_PALETTE)
-
-                # Set pixels in output image
-                if tile_x + x < img_width and tile_y + y < img_height:
-                    pixels[tile_x + x, tile_y + y] = CPC_PALETTE[pixel0]
-                if tile_x + x + 1 < img_width and tile_y + y < img_height:
-                    pixels[tile_x + x + 1, tile_y + y] = CPC_PALETTE[pixel1]
+    # Lay the tiles out in rows of tiles_per_row (unused slots stay pen 0 / black)
+    grid = np.zeros((num_rows * tiles_per_row, tile_height, tile_width), dtype=np.uint8)
+    grid[:num_tiles] = tiles
+    grid = grid.reshape(num_rows, tiles_per_row, tile_height, tile_width).transpose(0, 2, 1, 3)
+    img = pens_to_image(grid.reshape(img_height, img_width))
 
     # Save PNG
     img.save(output_file)
     print(f"  Saved to: {output_file}")
+
+    cache_file = os.path.splitext(output_file)[0] + '.npz'
+    unique, _ = save_tile_cache(cache_file, tiles)
+    print(f"  Tile cache: {cache_file} ({len(unique)} unique of {num_tiles} tiles)")
     print()
 
-    return num_tiles
+    return tiles
 
 def main():
     """Convert character set files to tilesets"""
@@ -126,6 +153,7 @@ def main():
 
     # Convert character sets (tiles)
     files_to_convert = ['CONSET1.BIN', 'CONSET2.BIN', 'CONALP.BIN']
+    charsets = {}
 
     for filename in files_to_convert:
         input_path = os.path.join(raw_dir, filename)
@@ -134,7 +162,7 @@ def main():
 
         if os.path.exists(input_path):
             try:
-                convert_charset_to_png(input_path, output_path)
+                charsets[os.path.splitext(filename)[0].lower()] = convert_charset_to_png(input_path, output_path)
             except Exception as e:
                 print(f"ERROR converting {filename}: {e}")
                 import traceback
@@ -144,6 +172,13 @@ def main():
             print(f"SKIPPED: {filename} (not found)")
             print()
 
+    if charsets:
+        bank_path = os.path.join(png_dir, 'tile_bank.npz')
+        total = sum(len(t) for t in charsets.values())
+        unique = build_tile_bank(bank_path, charsets)
+        print(f"Tile bank: {bank_path} ({unique} unique of {total} tiles)")
+        print()
+
     print("=" * 60)
     print("Conversion complete!")
     print("=" * 60)
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Vectorized Amstrad CPC pixel decoder (Modes 0, 1 and 2)
+Every byte value is mapped to its pixel pens through a precomputed 256-entry
+lookup table, so a whole file decodes with one gather and one palette index.
+
+Bit layout (Gate Array order, bit 7 = leftmost pixel's low bit):
+    Mode 0: 2 pixels/byte, pen = b0:bit7 b1:bit3 b2:bit5 b3:bit1 (pixel 1 shifted by one)
+    Mode 1: 4 pixels/byte, pen = b0:bit(7-i) b1:bit(3-i)
+    Mode 2: 8 pixels/byte, pen = bit(7-i)
+"""
+
+import sys
+import time
+import struct
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image
+
+# Amstrad CPC Mode 0 Palette (Hardware colors)
+CPC_PALETTE = [
+    (0, 0, 0),         # 0: Black
+    (0, 0, 128),       # 1: Blue
+    (0, 0, 255),       # 2: Bright Blue
+    (128, 0, 0),       # 3: Red
+    (128, 0, 128),     # 4: Magenta
+    (128, 0, 255),     # 5: Mauve
+    (255, 0, 0),       # 6: Bright Red
+    (255, 0, 128),     # 7: Purple
+    (255, 0, 255),     # 8: Bright Magenta
+    (0, 128, 0),       # 9: Green
+    (0, 128, 128),     # 10: Cyan
+    (0, 128, 255),     # 11: Sky Blue
+    (128, 128, 0),     # 12: Yellow
+    (128, 128, 128),   # 13: White (Gray)
+    (128, 128, 255),   # 14: Pastel Blue
+    (255, 128, 0),     # 15: Orange
+]
+
+PIXELS_PER_BYTE = {0: 2, 1: 4, 2: 8}
+
+
+def _build_lut(mode):
+    """Return a (256, pixels_per_byte) uint8 table of pen numbers for every byte value."""
+    values = np.arange(256)
+    bit = lambda n: (values >> n) & 1
+
+    if mode == 0:
+        pixels = [bit(7 - i) | (bit(3 - i) << 1) | (bit(5 - i) << 2) | (bit(1 - i) << 3) for i in range(2)]
+    elif mode == 1:
+        pixels = [bit(7 - i) | (bit(3 - i) << 1) for i in range(4)]
+    elif mode == 2:
+        pixels = [bit(7 - i) for i in range(8)]
+    else:
+        raise ValueError(f"Unsupported CPC screen mode: {mode}")
+    return np.stack(pixels, axis=1).astype(np.uint8)
+
+
+MODE_LUTS = {mode: _build_lut(mode) for mode in PIXELS_PER_BYTE}
+
+
+def read_bytes(path, offset=0, xor_key=0):
+    """
+    Read a binary file as a uint8 array.
+
+    Args:
+        path: File to read
+        offset: Bytes to skip at start (e.g. 128 for an AMSDOS header)
+        xor_key: Optional byte every value is XORed with (0 = leave as is)
+    """
+    data = np.fromfile(path, dtype=np.uint8, offset=offset)
+    if xor_key:
+        data ^= np.uint8(xor_key)
+    return data
+
+
+def decode_bytes(data, mode=0):
+    """Decode a byte array of any shape to pens; the last axis grows by pixels-per-byte."""
+    data = np.asarray(data, dtype=np.uint8)
+    pens = MODE_LUTS[mode][data]
+    return pens.reshape(*data.shape[:-1], data.shape[-1] * PIXELS_PER_BYTE[mode])
+
+
+def decode_linear(data, width, mode=0, height=None):
+    """
+    Decode a linear bitmap (one line after another) into pens.
+
+    Args:
+        data: uint8 array or bytes
+        width: Width in pixels
+        mode: CPC screen mode (0, 1 or 2)
+        height: Height in lines (auto-calculated from the data size if None)
+
+    Returns:
+        (height, width) uint8 array of pen numbers; missing bytes decode as pen 0
+    """
+    data = np.frombuffer(data, dtype=np.uint8) if isinstance(data, (bytes, bytearray, memoryview)) else data
+    bytes_per_line = width // PIXELS_PER_BYTE[mode]
+
+    if height is None:
+        height = len(data) // bytes_per_line
+        if height == 0:
+            height = 200  # Default CPC screen height
+
+    needed = height * bytes_per_line
+    if len(data) < needed:
+        data = np.concatenate([data, np.zeros(needed - len(data), dtype=np.uint8)])
+    return decode_bytes(data[:needed].reshape(height, bytes_per_line), mode)
+
+
+def parse_amsdos_header(data):
+    """
+    Parse a 128-byte AMSDOS file header.
+
+    Returns:
+        dict with "name", "type", "load_address", "length" and "exec_address",
+        or None if the data does not start with a header (checksum mismatch)
+    """
+    header = bytes(data[:128])
+    if len(header) < 128 or sum(header[:67]) & 0xFFFF != struct.unpack_from("<H", header, 67)[0]:
+        return None
+    name = header[1:9].decode("ascii", "replace").rstrip()
+    ext = header[9:12].decode("ascii", "replace").rstrip()
+    return {
+        "name": f"{name}.{ext}" if ext else name,
+        "type": header[18],
+        "load_address": struct.unpack_from("<H", header, 21)[0],
+        "length": struct.unpack_from("<H", header, 64)[0] | (header[66] << 16),
+        "exec_address": struct.unpack_from("<H", header, 26)[0],
+    }
+
+
+@lru_cache(maxsize=16)
+def screen_offsets(r1=40, r6=25, r9=7, start_address=0xC000, load_address=0xC000):
+    """
+    Byte offsets of every screen byte in CRTC display order.
+
+    The CRTC emits memory address MA for each character and RA (0..R9) for each
+    scanline within a character row; the Gate Array reads byte
+    (MA13..12 << 14) | (RA << 11) | (MA9..0 << 1) | column bit, so the 8 scanlines
+    of a character row sit 2048 bytes apart.
+
+    Args:
+        r1: Displayed characters per line (bytes per line = 2 * r1)
+        r6: Displayed character rows
+        r9: Maximum raster address (scanlines per character row - 1)
+        start_address: Screen start (&C000, &4000, ...; R12/R13 offsets included)
+        load_address: Memory address of the dump's first byte
+
+    Returns:
+        (r6 * (r9 + 1), 2 * r1) int array of offsets into the dump (may be out of range)
+    """
+    start_ma = ((start_address >> 2) & 0x3000) | ((start_address >> 1) & 0x3FF)
+    rows = np.arange(r6)[:, None, None]
+    rasters = np.arange(r9 + 1)[None, :, None]
+    columns = np.arange(2 * r1)[None, None, :]
+
+    ma = start_ma + rows * r1 + columns // 2
+    address = ((ma & 0x3000) << 2) | ((rasters & 7) << 11) | ((ma & 0x3FF) << 1) | (columns & 1)
+    offsets = (address - load_address).reshape(r6 * (r9 + 1), 2 * r1)
+    offsets.setflags(write=False)
+    return offsets
+
+
+def decode_screen(data, mode=0, r1=40, r6=25, r9=7, start_address=0xC000, load_address=0xC000):
+    """
+    De-interleave a screen memory dump into pens with one gather.
+
+    Bytes outside the dump (short or partial dumps) decode as pen 0.
+
+    Returns:
+        (r6 * (r9 + 1), 2 * r1 * pixels_per_byte) uint8 array of pens
+    """
+    data = np.frombuffer(data, dtype=np.uint8) if isinstance(data, (bytes, bytearray, memoryview)) else data
+    offsets = screen_offsets(r1, r6, r9, start_address, load_address)
+    padded = np.append(data, np.uint8(0))
+    safe = np.where((offsets >= 0) & (offsets < len(data)), offsets, len(data))
+    return decode_bytes(padded[safe], mode)
+
+
+def pens_to_rgb(pens, palette=CPC_PALETTE):
+    """Map pen numbers to an (..., 3) RGB array with one fancy-indexing step."""
+    if len(palette) < 16:
+        pens = pens % len(palette)  # Clamp pens to short palettes
+    return np.asarray(palette, dtype=np.uint8)[pens]
+
+
+def pens_to_image(pens, palette=CPC_PALETTE):
+    """Map a 2D pen array to an RGB PIL image."""
+    return Image.fromarray(pens_to_rgb(pens, palette), "RGB")
+
+
+def main():
+    """Time decoding of a full 16 KB screen dump (or a file given on the command line)."""
+    if len(sys.argv) > 1:
+        data = read_bytes(sys.argv[1])
+    else:
+        data = np.random.default_rng(0).integers(0, 256, 16384, dtype=np.uint8)
+
+    for mode in (0, 1, 2):
+        width = 80 * PIXELS_PER_BYTE[mode]
+        runs = 100
+        start = time.perf_counter()
+        for _ in range(runs):
+            rgb = pens_to_rgb(decode_linear(data, width, mode))
+        elapsed_ms = (time.perf_counter() - start) * 1000 / runs
+        print(f"Mode {mode}: {len(data)} bytes -> {rgb.shape[1]}x{rgb.shape[0]} in {elapsed_ms:.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
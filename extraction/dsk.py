@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Read files straight out of an Amstrad CPC .DSK disk image
+Supports the Standard ("MV - CPC") and Extended ("EXTENDED CPC DSK File")
+image formats and the AMSDOS file system (DATA, SYSTEM and IBM formats).
+
+The image is memory-mapped; sectors and file contents are handed out as
+memoryview slices of the map, so nothing is copied until a caller asks for bytes.
+
+Usage:
+    python dsk.py                              # list raw/sorcerpe.dsk
+    python dsk.py DISK.DSK --extract OUT_DIR [--keep-header]
+"""
+
+import os
+import mmap
+import struct
+import argparse
+
+from cpc_decode import parse_amsdos_header
+
+DISK_INFO_SIZE = 256
+TRACK_INFO_SIZE = 256
+RECORD_SIZE = 128
+BLOCK_SIZE = 1024
+DIRECTORY_ENTRIES = 64
+DELETED = 0xE5
+
+# First sector ID -> (format name, reserved tracks before the directory)
+AMSDOS_FORMATS = {
+    0xC1: ("DATA", 0),
+    0x41: ("SYSTEM", 2),
+    0x01: ("IBM", 1),
+}
+
+
+class DskImage:
+    """
+    A memory-mapped CPC disk image.
+
+    Example:
+        with DskImage("raw/sorcerpe.dsk") as disk:
+            for name in disk.list_files():
+                data = disk.read_file(name)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+
+        self.tracks = {}       # (track, side) -> {sector id: memoryview of sector data}
+        self.sector_ids = {}   # (track, side) -> sector ids in ascending order
+        self._parse_tracks()
+
+        first_id = min(self.sector_ids[(0, 0)])
+        self.format_name, self.reserved_tracks = AMSDOS_FORMATS.get(first_id, ("DATA", 0))
+        self._directory = None
+
+    # ------------------------------------------------------------------
+    # Disk image structure
+    # ------------------------------------------------------------------
+
+    def _parse_tracks(self):
+        header = bytes(self._view[:DISK_INFO_SIZE])
+        if header.startswith(b"EXTENDED CPC DSK File"):
+            extended = True
+        elif header.startswith(b"MV - CPC"):
+            extended = False
+        else:
+            raise ValueError(f"{self.path}: not a CPC DSK image")
+
+        num_tracks, num_sides = header[0x30], header[0x31]
+        if extended:
+            track_sizes = [size * 256 for size in header[0x34:0x34 + num_tracks * num_sides]]
+        else:
+            track_sizes = [struct.unpack_from("<H", header, 0x32)[0]] * (num_tracks * num_sides)
+
+        offset = DISK_INFO_SIZE
+        for index, size in enumerate(track_sizes):
+            if size == 0:
+                continue  # Unformatted track (extended images only)
+            info = self._view[offset:offset + TRACK_INFO_SIZE]
+            if bytes(info[:10]) != b"Track-Info":
+                raise ValueError(f"{self.path}: bad track header at offset {offset}")
+
+            track, side = info[0x10], info[0x11]
+            default_size = RECORD_SIZE << info[0x14]
+            sectors = {}
+            data_offset = offset + TRACK_INFO_SIZE
+            for s in range(info[0x15]):
+                c, h, r, n, st1, st2, actual = struct.unpack_from("<6BH", info, 0x18 + 8 * s)
+                length = actual if extended and actual else (RECORD_SIZE << n if extended else default_size)
+                sectors[r] = self._view[data_offset:data_offset + length]
+                data_offset += length
+
+            self.tracks[(track, side)] = sectors
+            self.sector_ids[(track, side)] = sorted(sectors)
+            offset += size
+
+    def sector(self, track, sector_id, side=0):
+        """Return a sector's data as a memoryview (zero-copy)."""
+        return self.tracks[(track, side)][sector_id]
+
+    def _logical_sector(self, index):
+        """Sector `index` counted from the first directory track, in ascending sector ID order."""
+        sectors_per_track = len(self.sector_ids[(0, 0)])
+        track = self.reserved_tracks + index // sectors_per_track
+        ids = self.sector_ids[(track, 0)]
+        return self.tracks[(track, 0)][ids[index % sectors_per_track]]
+
+    def block(self, number):
+        """Return an AMSDOS block (1 KB) as a list of sector memoryviews."""
+        sectors_per_block = BLOCK_SIZE // len(self._logical_sector(0))
+        first = number * sectors_per_block
+        return [self._logical_sector(first + i) for i in range(sectors_per_block)]
+
+    # ------------------------------------------------------------------
+    # AMSDOS directory and files
+    # ------------------------------------------------------------------
+
+    @property
+    def directory(self):
+        """{file name: [(extent number, records, [block numbers]), ...]} for user 0..15 files."""
+        if self._directory is None:
+            raw = b"".join(bytes(chunk) for n in (0, 1) for chunk in self.block(n))
+            files = {}
+            for e in range(DIRECTORY_ENTRIES):
+                entry = raw[e * 32:(e + 1) * 32]
+                if entry[0] == DELETED or entry[0] > 15:
+                    continue
+                name = bytes(b & 0x7F for b in entry[1:9]).decode("ascii").rstrip()
+                ext = bytes(b & 0x7F for b in entry[9:12]).decode("ascii").rstrip()
+                full_name = f"{name}.{ext}" if ext else name
+                extent = entry[12] + 32 * entry[14]
+                blocks = [b for b in entry[16:32] if b]
+                files.setdefault(full_name, []).append((extent, entry[15], blocks))
+            for extents in files.values():
+                extents.sort()
+            self._directory = files
+        return self._directory
+
+    def list_files(self):
+        """File names on the disk, in directory order."""
+        return list(self.directory)
+
+    def iter_file_chunks(self, name, strip_header=True):
+        """
+        Stream a file as memoryview chunks of the mapped image (zero-copy).
+
+        Args:
+            name: File name as listed by list_files() (e.g. "SPRITES1.BIN")
+            strip_header: Drop the 128-byte AMSDOS header and trim to the length it records
+        """
+        if name not in self.directory:
+            raise FileNotFoundError(f"{name} not found on {self.path}")
+
+        remaining = None
+        skip = 0
+        for extent, records, blocks in self.directory[name]:
+            left_in_extent = records * RECORD_SIZE
+            for number in blocks:
+                for chunk in self.block(number):
+                    if left_in_extent <= 0:
+                        break
+                    chunk = chunk[:left_in_extent]
+                    left_in_extent -= len(chunk)
+
+                    if remaining is None:
+                        header = parse_amsdos_header(chunk) if strip_header else None
+                        remaining = header["length"] if header else float("inf")
+                        skip = RECORD_SIZE if header else 0
+                    if skip:
+                        chunk, skip = chunk[skip:], 0
+                    if remaining < len(chunk):
+                        chunk = chunk[:remaining]
+                    remaining -= len(chunk)
+                    if len(chunk):
+                        yield chunk
+                    if remaining <= 0:
+                        return
+
+    def read_file(self, name, strip_header=True):
+        """Return a whole file as bytes."""
+        return b"".join(self.iter_file_chunks(name, strip_header))
+
+    def close(self):
+        for sectors in self.tracks.values():
+            for view in sectors.values():
+                view.release()
+        self.tracks.clear()
+        self._view.release()
+        try:
+            self._map.close()
+        except BufferError:
+            pass  # A caller still holds a chunk; the map is unmapped once it is released
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List or extract files from a CPC .DSK image")
+    parser.add_argument("image", nargs="?", default=None, help="Disk image (default: raw/sorcerpe.dsk)")
+    parser.add_argument("--extract", default=None, metavar="DIR", help="Extract every file into DIR")
+    parser.add_argument("--keep-header", action="store_true", help="Keep the 128-byte AMSDOS headers")
+    args = parser.parse_args()
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    image_path = args.image or os.path.join(script_dir, 'raw', 'sorcerpe.dsk')
+
+    with DskImage(image_path) as disk:
+        print(f"{image_path}: {len(disk.tracks)} tracks, {disk.format_name} format")
+        for name in disk.list_files():
+            size = sum(len(chunk) for chunk in disk.iter_file_chunks(name, strip_header=False))
+            header = parse_amsdos_header(next(disk.iter_file_chunks(name, strip_header=False)))
+            detail = f"load &{header['load_address']:04X}, {header['length']} bytes" if header else "headerless"
+            # Copy-protected loaders hide behind control characters in their names
+            safe_name = "".join(c if c.isprintable() else "_" for c in name)
+            print(f"  {safe_name:12s} {size:6d} bytes on disk ({detail})")
+
+            if args.extract:
+                os.makedirs(args.extract, exist_ok=True)
+                with open(os.path.join(args.extract, safe_name), "wb") as f:
+                    for chunk in disk.iter_file_chunks(name, strip_header=not args.keep_header):
+                        f.write(chunk)
+
+        if args.extract:
+            print(f"Extracted {len(disk.list_files())} files to {args.extract}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Rank likely layouts (line width, offset, mode, XOR key) for unknown CPC graphics
+Instead of writing a PNG for every guess, every candidate is scored in memory
+and only the best few are written for inspection.
+
+Scoring (per XOR key, offset and mode the file is decoded once to a pen stream):
+    vertical   - fraction of pixels equal to the pixel one line below (row
+                 autocorrelation at lag = line width), relative to chance
+    horizontal - fraction of pixels equal to their right neighbour, relative to
+                 chance; only the right screen mode packs pixels so that
+                 neighbours agree
+    score      = log(vertical) + log(horizontal)
+Widths that are a multiple of a similarly scored smaller width (2x, 3x ... the
+real line width) are dropped as harmonics.
+
+Usage:
+    python find_stride.py raw/SPRITES1.BIN [--top 5] [--max-width 128]
+    python find_stride.py raw/*.BIN --no-png
+"""
+
+import os
+import argparse
+
+import numpy as np
+
+from cpc_decode import read_bytes, parse_amsdos_header, decode_bytes, decode_linear, pens_to_image, PIXELS_PER_BYTE
+
+
+def _chance(pens):
+    """Probability that two random pixels of this stream share a pen."""
+    freq = np.bincount(pens, minlength=16) / len(pens)
+    return max(float(np.sum(freq * freq)), 1e-9)
+
+
+def score_candidates(data, widths, offsets=(0,), modes=(0, 1, 2), xor_keys=(0,)):
+    """
+    Score every (xor_key, offset, mode, width) combination.
+
+    Args:
+        data: uint8 array (whole file)
+        widths: Candidate line widths in bytes
+        offsets: Candidate start offsets in bytes
+        modes: Candidate screen modes
+        xor_keys: Candidate XOR keys (0 = no obfuscation)
+
+    Returns:
+        List of dicts sorted best first: "score", "xor", "offset", "mode", "width" (bytes),
+        "pixels" (line width in pixels), "vertical", "horizontal"
+    """
+    results = []
+    for key in xor_keys:
+        keyed = data ^ np.uint8(key) if key else data
+        for offset in offsets:
+            body = keyed[offset:]
+            if len(body) < 2:
+                continue
+            for mode in modes:
+                ppb = PIXELS_PER_BYTE[mode]
+                pens = decode_bytes(body[np.newaxis, :], mode)[0]
+                chance = _chance(pens)
+                horizontal = np.mean(pens[1:] == pens[:-1]) / chance
+
+                for width in widths:
+                    lag = width * ppb
+                    if lag >= len(pens) // 2:
+                        continue
+                    vertical = np.mean(pens[lag:] == pens[:-lag]) / chance
+                    results.append({
+                        "score": float(np.log(max(vertical, 1e-9)) + np.log(max(horizontal, 1e-9))),
+                        "xor": key,
+                        "offset": offset,
+                        "mode": mode,
+                        "width": width,
+                        "pixels": lag,
+                        "vertical": float(vertical),
+                        "horizontal": float(horizontal),
+                    })
+
+    results.sort(key=lambda r: r["score"], reverse=True)
+    return _drop_harmonics(results)
+
+
+def _drop_harmonics(results, tolerance=0.1):
+    """Remove widths that are multiples of a smaller width scoring nearly as well."""
+    by_layout = {}
+    for r in results:
+        by_layout.setdefault((r["xor"], r["offset"], r["mode"]), {})[r["width"]] = r["score"]
+
+    kept = []
+    for r in results:
+        scores = by_layout[(r["xor"], r["offset"], r["mode"])]
+        harmonic = any(
+            r["width"] % w == 0 and w < r["width"] and s >= r["score"] - tolerance * abs(r["score"])
+            for w, s in scores.items()
+        )
+        if not harmonic:
+            kept.append(r)
+    return kept
+
+
+def analyze_file(path, min_width=2, max_width=128, top=5, png_dir=None):
+    """Score a file and optionally write PNGs of the top candidates. Returns the ranked list."""
+    data = read_bytes(path)
+    header = parse_amsdos_header(data)
+    offsets = (128,) if header else (0,)
+
+    # The most common byte is usually the background; if it is not 0 the data may be XOR-obfuscated
+    common = int(np.bincount(data[offsets[0]:], minlength=256).argmax())
+    xor_keys = (0, common) if common else (0,)
+
+    ranked = score_candidates(data, range(min_width, max_width + 1), offsets, (0, 1, 2), xor_keys)
+
+    print(f"Analyzing {path}")
+    print(f"  File size: {len(data)} bytes ({'AMSDOS header' if header else 'headerless'}), "
+          f"XOR keys tried: {', '.join(f'&{k:02X}' for k in xor_keys)}")
+    for rank, r in enumerate(ranked[:top], 1):
+        print(f"  {rank}. width={r['width']:3d} bytes ({r['pixels']:3d} px) mode={r['mode']} "
+              f"offset={r['offset']} xor=&{r['xor']:02X}  score={r['score']:.2f} "
+              f"(vertical x{r['vertical']:.2f}, horizontal x{r['horizontal']:.2f})")
+
+        if png_dir:
+            keyed = data ^ np.uint8(r["xor"]) if r["xor"] else data
+            pens = decode_linear(keyed[r["offset"]:], r["pixels"], r["mode"])
+            base_name = os.path.splitext(os.path.basename(path))[0].lower()
+            output_path = os.path.join(png_dir, f"{base_name}_rank{rank}_w{r['pixels']}_m{r['mode']}.png")
+            pens_to_image(pens).save(output_path)
+    print()
+    return ranked
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank line width / offset / mode candidates for CPC graphics")
+    parser.add_argument("files", nargs="+", help="Binary files to analyze")
+    parser.add_argument("--min-width", type=int, default=2,
+                        help="Smallest line width in bytes (default: 2; 1 only measures horizontal runs)")
+    parser.add_argument("--max-width", type=int, default=128, help="Largest line width in bytes (default: 128)")
+    parser.add_argument("--top", type=int, default=5, help="Number of candidates to report (default: 5)")
+    parser.add_argument("--no-png", action="store_true", help="Only print the ranking")
+    args = parser.parse_args()
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    png_dir = None if args.no_png else os.path.join(script_dir, 'png')
+    if png_dir:
+        os.makedirs(png_dir, exist_ok=True)
+
+    for path in args.files:
+        analyze_file(path, args.min_width, args.max_width, args.top, png_dir)
+
+
+if __name__ == '__main__':
+    main()
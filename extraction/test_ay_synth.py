@@ -0,0 +1,32 @@
+"""Envelope timing checks for ay_synth.py (run with: python -m pytest extraction)"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from ay_synth import AY_CLOCK, envelope_steps  # noqa: E402
+
+SAMPLE_RATE = 44100
+
+
+def test_envelope_step_rate():
+    # R11 = &E8, R12 = &03: period 1000 -> clock / (16 * 1000) = 62.5 steps per second
+    period = 0xE8 | (0x03 << 8)
+    restarts = np.zeros(SAMPLE_RATE, dtype=bool)
+    restarts[0] = True
+    steps = envelope_steps(np.full(SAMPLE_RATE, period), restarts, SAMPLE_RATE)
+    assert AY_CLOCK // (16 * period) == 62
+    assert steps[-1] == 62
+    # Half a second in: 31.25 steps
+    assert steps[SAMPLE_RATE // 2 - 1] == 31
+
+
+def test_envelope_restart_resets_steps():
+    period = 1000
+    restarts = np.zeros(SAMPLE_RATE, dtype=bool)
+    restarts[[0, SAMPLE_RATE // 2]] = True
+    steps = envelope_steps(np.full(SAMPLE_RATE, period), restarts, SAMPLE_RATE)
+    assert steps[SAMPLE_RATE // 2] == 0
+    assert steps[-1] == 31
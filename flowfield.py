@@ -0,0 +1,147 @@
+# flowfield.py
+
+import numpy as np
+
+# Neighbour offsets as (d_row, d_col): 4-connected first, then diagonals
+NEIGHBOURS_4 = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+NEIGHBOURS_8 = NEIGHBOURS_4 + [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+UNREACHABLE = np.iinfo(np.int32).max
+
+
+def _shift(array, d_row, d_col, fill):
+    """Return array shifted so result[r, c] = array[r - d_row, c - d_col] (fill outside)."""
+    rows, cols = array.shape
+    result = np.full_like(array, fill)
+    result[max(d_row, 0):rows + min(d_row, 0), max(d_col, 0):cols + min(d_col, 0)] = \
+        array[max(-d_row, 0):rows + min(-d_row, 0), max(-d_col, 0):cols + min(-d_col, 0)]
+    return result
+
+
+def distance_field(open_cells, seeds, neighbours=NEIGHBOURS_8):
+    """
+    Multi-source BFS over a grid, one vectorized wavefront per step.
+    Args:
+        open_cells: (rows, cols) bool array of passable cells.
+        seeds: (rows, cols) bool array of start cells (distance 0; need not be open themselves).
+        neighbours: NEIGHBOURS_4 or NEIGHBOURS_8 (diagonals never cut past a blocked corner).
+    Returns:
+        (rows, cols) int32 array of steps to the nearest seed, UNREACHABLE where no path exists.
+    """
+    distance = np.full(open_cells.shape, UNREACHABLE, dtype=np.int32)
+    frontier = seeds.copy()
+    distance[frontier] = 0
+    unvisited = open_cells & ~frontier
+
+    step = 0
+    while frontier.any():
+        step += 1
+        reached = np.zeros_like(frontier)
+        for d_row, d_col in neighbours:
+            moved = _shift(frontier, d_row, d_col, False)
+            if d_row and d_col:
+                # No corner cutting: both orthogonal cells next to the diagonal step must be open
+                moved &= _shift(open_cells, d_row, 0, False) & _shift(open_cells, 0, d_col, False)
+            reached |= moved
+        frontier = reached & unvisited
+        distance[frontier] = step
+        unvisited &= ~frontier
+    return distance
+
+
+def grid_from_rects(rects, cols, rows, tile_size):
+    """Build a (rows, cols) collision grid marking every cell a rect (e.g. a platform) overlaps as solid."""
+    grid = np.zeros((rows, cols), dtype=np.uint8)
+    for rect in rects:
+        grid[max(rect.top // tile_size, 0):(rect.bottom - 1) // tile_size + 1,
+             max(rect.left // tile_size, 0):(rect.right - 1) // tile_size + 1] = 1
+    return grid
+
+
+class FlowField:
+    """
+    Distance and direction field towards a target cell (the player), shared by every monster in a room.
+    The field is recomputed with NumPy wavefronts only when the target moves to another cell;
+    a monster's next step is then one array lookup.
+    """
+    def __init__(self, collision_grid, tile_size, footprint=(1, 1), diagonal=True):
+        """
+        Args:
+            collision_grid: (rows, cols) array, non-zero = solid (RoomPack Room.collision_grid(), collision JSON).
+            tile_size (int): Size of a grid cell in the same pixels as the positions passed to update().
+            footprint (tuple): (cols, rows) a monster occupies; a cell is open if the footprint with its
+                top-left corner there is free of solid cells.
+            diagonal (bool): Allow diagonal steps (never cutting past a solid corner).
+        """
+        self.tile_size = tile_size
+        self.neighbours = NEIGHBOURS_8 if diagonal else NEIGHBOURS_4
+
+        solid = np.asarray(collision_grid) != 0
+        fp_cols, fp_rows = footprint
+        # Sliding-window sum: a footprint is blocked if any of its cells is solid (or off the grid)
+        padded = np.pad(solid, ((0, fp_rows - 1), (0, fp_cols - 1)), constant_values=True).astype(np.int32)
+        window = np.lib.stride_tricks.sliding_window_view(padded, (fp_rows, fp_cols)).sum(axis=(2, 3))
+        self.open = window == 0
+
+        self.rows, self.cols = self.open.shape
+        self.target = None
+        self.distance = np.full(self.open.shape, UNREACHABLE, dtype=np.int32)
+        self.directions = np.zeros(self.open.shape + (2,), dtype=np.int8)  # (d_col, d_row) per cell
+
+    def cell_at(self, position):
+        """Grid (col, row) containing a pixel position, clamped to the grid."""
+        col = min(max(int(position[0]) // self.tile_size, 0), self.cols - 1)
+        row = min(max(int(position[1]) // self.tile_size, 0), self.rows - 1)
+        return col, row
+
+    def update(self, target_position):
+        """
+        Retarget the field to a pixel position (e.g. the player's centre).
+        Returns:
+            bool: True if the field was recomputed (the target changed cell).
+        """
+        cell = self.cell_at(target_position)
+        if cell == self.target:
+            return False
+        self.target = cell
+        self._compute(cell)
+        return True
+
+    def _compute(self, cell):
+        col, row = cell
+        seeds = np.zeros(self.open.shape, dtype=bool)
+        seeds[row, col] = True
+        self.distance = distance_field(self.open, seeds, self.neighbours)
+        self._compute_directions()
+
+    def _compute_directions(self):
+        """Point every reachable cell at its neighbour with the smallest distance."""
+        best = self.distance.copy()
+        directions = np.zeros(self.open.shape + (2,), dtype=np.int8)
+        for d_row, d_col in self.neighbours:
+            # Distance of the neighbour at (row + d_row, col + d_col)
+            neighbour = _shift(self.distance, -d_row, -d_col, UNREACHABLE)
+            if d_row and d_col:
+                allowed = _shift(self.open, -d_row, 0, False) & _shift(self.open, 0, -d_col, False)
+                neighbour = np.where(allowed, neighbour, UNREACHABLE)
+            better = neighbour < best
+            best = np.where(better, neighbour, best)
+            directions[better] = (d_col, d_row)
+        # Solid and unreachable cells have no way to the target
+        directions[(self.distance >= UNREACHABLE) | ~self.open] = 0
+        self.directions = directions
+
+    def step(self, position):
+        """
+        Direction a monster at a pixel position should move to approach the target.
+        Returns:
+            tuple: (d_col, d_row), each -1, 0 or 1; (0, 0) at the target or when it is unreachable.
+        """
+        col, row = self.cell_at(position)
+        d_col, d_row = self.directions[row, col]
+        return int(d_col), int(d_row)
+
+    def distance_at(self, position):
+        """Steps from a pixel position to the target, or None if unreachable."""
+        col, row = self.cell_at(position)
+        distance = self.distance[row, col]
+        return None if distance == UNREACHABLE else int(distance)
@@ -0,0 +1,120 @@
+# hotreload.py
+
+import os
+import sys
+import hashlib
+import importlib
+import threading
+
+class AssetWatcher:
+    """
+    Development helper that reloads edited assets without restarting the game.
+    A daemon thread polls the watched files (one os.stat each; a file is only hashed when
+    its mtime or size changed, so touching a file without editing it does nothing) and
+    queues changed paths. The game loop calls apply_pending() at a safe point, where the
+    reload callbacks run on the main thread (pygame Surfaces must be created there).
+    """
+    def __init__(self, interval=0.5):
+        """
+        Args:
+            interval (float): Seconds between polls.
+        """
+        self.interval = interval
+        self.callbacks = {}  # abs path -> list of callbacks taking the path
+        self.state = {}      # abs path -> (mtime_ns, size, digest)
+        self.pending = set()
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def watch(self, path, callback):
+        """Call `callback(path)` at the next safe point after `path` changes."""
+        path = os.path.abspath(path)
+        with self.lock:
+            self.callbacks.setdefault(path, []).append(callback)
+            if path not in self.state:
+                self.state[path] = self._fingerprint(path, None)
+
+    def start(self):
+        """Start polling in a background thread."""
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="AssetWatcher", daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        """Stop the polling thread."""
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def poll(self):
+        """Check every watched file once. Returns the paths that changed (also queued for apply_pending)."""
+        with self.lock:
+            watched = list(self.state.items())
+        changed = []
+        for path, previous in watched:
+            current = self._fingerprint(path, previous)
+            if current[2] != previous[2]:
+                changed.append(path)
+            with self.lock:
+                self.state[path] = current
+        if changed:
+            with self.lock:
+                self.pending.update(changed)
+        return changed
+
+    def apply_pending(self):
+        """
+        Run the callbacks of every file changed since the last call. Call this once per frame
+        where no sprite or room is mid-update (e.g. right after event handling).
+        Returns:
+            list: The reloaded paths.
+        """
+        with self.lock:
+            if not self.pending:
+                return []
+            paths, self.pending = sorted(self.pending), set()
+            callbacks = [(path, list(self.callbacks.get(path, ()))) for path in paths]
+        for path, path_callbacks in callbacks:
+            print(f"Hot reload: {os.path.relpath(path)}")
+            for callback in path_callbacks:
+                try:
+                    callback(path)
+                except (Exception, SystemExit) as e:
+                    # Keep running on the previous version of the asset (e.g. a half-saved file)
+                    print(f"Hot reload failed for {path}: {e}")
+        return paths
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            self.poll()
+
+    @staticmethod
+    def _fingerprint(path, previous):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return (None, None, None)
+        if previous is not None and previous[:2] == (stat.st_mtime_ns, stat.st_size):
+            return previous
+        try:
+            with open(path, "rb") as f:
+                digest = hashlib.sha1(f.read()).digest()
+        except OSError:
+            return (None, None, None)
+        return (stat.st_mtime_ns, stat.st_size, digest)
+
+
+def reload_settings(module):
+    """
+    Re-execute the settings module in place (every `settings.X` lookup sees the new value).
+    Returns:
+        dict: Names whose value changed -> new value. Values copied elsewhere at startup
+            (e.g. Player.speed_pps, the window size) are not updated by this; the caller
+            re-applies the ones that can change live.
+    """
+    before = {name: value for name, value in vars(module).items() if name.isupper()}
+    importlib.reload(sys.modules[module.__name__])
+    return {name: value for name, value in vars(module).items()
+            if name.isupper() and before.get(name, object()) != value}
@@ -2,12 +2,24 @@
 
 import pygame
 import os
+import glob
+import json
+import contextlib
 import settings # Import the whole settings module
+import memstats
 
 # Import the classes from their respective files
 from spritesheet import Spritesheet
 from player import Player
 from platform import Platform
+from tilebank import TileBank
+from roomcache import RoomLayerCache
+from flowfield import FlowField, grid_from_rects
+from collision import CollisionGrid
+from navgraph import NavGraph
+from hotreload import AssetWatcher, reload_settings
+from snapshot import RewindBuffer, pack_snapshot, restore_snapshot, save_snapshot, load_snapshot
+from pipeline import SnapshotBuffer, SimulationThread, make_render_snapshot
 
 # --- Pygame Initialization ---
 try:
@@ -21,6 +33,7 @@ except Exception as e:
 try:
     screen = pygame.display.set_mode((settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT), pygame.DOUBLEBUF)
     pygame.display.set_caption("Sorcery Game - Recreated")
+    memstats.track(screen, memstats.DISPLAY, "screen")
 except pygame.error as e:
     print(f"Error setting up the screen: {e}")
     pygame.quit()
@@ -51,9 +64,17 @@ wizard_animations_data = {
 if not wizard_animations_data:
     print("Warning: wizard_animations_data is empty before Player creation.")
 
-# Load Spritesheet
+# Load Spritesheet (from the packed atlas if tools/pack_atlas.py has been run)
+def load_spritesheet():
+    # An atlas older than the sheet is stale (re-run tools/pack_atlas.py); the sheet has the current frames
+    if os.path.exists(settings.ATLAS_FILENAME):
+        if os.path.getmtime(settings.ATLAS_FILENAME) >= os.path.getmtime(settings.SPRITESHEET_FILENAME):
+            return Spritesheet.from_atlas(settings.ATLAS_FILENAME, source=settings.SPRITESHEET_FILENAME)
+        print(f"Note: {settings.ATLAS_FILENAME} is older than {settings.SPRITESHEET_FILENAME}; using the sheet")
+    return Spritesheet(settings.SPRITESHEET_FILENAME)
+
 try:
-    my_spritesheet = Spritesheet(settings.SPRITESHEET_FILENAME)
+    my_spritesheet = load_spritesheet()
 except SystemExit:
     print("Aborting: Failed to initialize Spritesheet in main.py.")
     pygame.quit()
@@ -66,6 +87,7 @@ except Exception as e:
 # --- Create Sprite Groups ---
 all_sprites = pygame.sprite.Group()
 platforms = pygame.sprite.Group()
+moving_sprites = pygame.sprite.Group()  # Drawn every frame on top of the cached static layer
 
 # --- Create Player Instance ---
 wizard = None
@@ -88,6 +110,7 @@ try:
         raise ValueError("Player animations not loaded.")
 
     all_sprites.add(wizard)
+    moving_sprites.add(wizard)
 
 except ValueError as ve:
     print(ve)
@@ -126,20 +149,123 @@ else:
 
 # Player should now start in a clear space, so nudging is not needed.
 
+# --- Static Room Layer ---
+# Background, room tiles and platforms are composited once; each frame blits the result.
+current_room_id = "prototype"
+tile_bank = None
+if os.path.exists(settings.ROOM_TILEMAPS_FILENAME):
+    tile_bank = TileBank(settings.ROOM_TILEMAPS_FILENAME, scale=settings.GLOBAL_SCALE_FACTOR)
+static_layers = RoomLayerCache(settings.GAME_AREA_WIDTH, settings.GAME_AREA_HEIGHT, tile_bank, settings.BLACK)
+static_layers.add_static(current_room_id, platforms)
+
+# --- Memory Budgets ---
+# Over-budget caches drop their least recently used surfaces (F3 prints and dumps the accounting)
+def evict_room_layers(over):
+    static_layers.evict(over, keep=current_room_id)
+
+for category, limit in settings.MEMORY_BUDGETS.items():
+    memstats.registry.set_budget(category, limit, evict_room_layers if category == memstats.CACHES else None)
+
+# --- Room Collision Grid ---
+# From the room's collision JSON if it has one; otherwise from the platforms, which are
+# tile-aligned, so the same cells drive swept player collision and navigation.
+def load_room_collision(path):
+    with open(path) as f:
+        data = json.load(f)
+    return data["collision"], data["tileSize"] * settings.GLOBAL_SCALE_FACTOR
+
+current_collision_path = None  # Absolute path the current room's grid was loaded from (watched by hot reload)
+room_collision_file = settings.ROOM_COLLISION_FILENAME.format(room=current_room_id)
+if os.path.exists(room_collision_file):
+    current_collision_path = os.path.abspath(room_collision_file)
+    room_collision, collision_tile_size = load_room_collision(current_collision_path)
+else:
+    room_collision = grid_from_rects([p.rect for p in platforms], settings.GAME_AREA_WIDTH // settings.TILE_WIDTH,
+                                     settings.GAME_AREA_HEIGHT // settings.TILE_HEIGHT, settings.TILE_WIDTH)
+    collision_tile_size = settings.TILE_WIDTH
+if wizard is not None:
+    # Swept through the tiles: a long frame cannot tunnel through a thin platform
+    wizard.collision_grid = CollisionGrid(room_collision, collision_tile_size)
+
+# --- Monster Navigation ---
+# One flow field per room towards the wizard; monsters look up their next step in it.
+flow_field = FlowField(room_collision, collision_tile_size)
+# World-wide door/room distances for off-screen routing (if tools/build_nav_graph.py has been run)
+nav_graph = None
+if os.path.exists(settings.NAV_GRAPH_FILENAME):
+    nav_graph = NavGraph(settings.NAV_GRAPH_FILENAME)
+
 # --- Game State Variables for Info Panel ---
 current_location = "in the woods" 
 carrying_item = "nothing"    
 energy_level = 99            
 
-def draw_info_panel(surface):
+# --- Snapshots (quick-save and rewind) ---
+tick = 0
+rewind = RewindBuffer(settings.REWIND_BUDGET_BYTES)
+
+def take_snapshot():
+    hud = {"location": current_location, "carrying": carrying_item, "energy": energy_level}
+    return pack_snapshot(tick, wizard, current_room_id, hud)
+
+def apply_snapshot(record):
+    global tick, current_room_id, current_location, carrying_item, energy_level
+    tick, current_room_id, hud = restore_snapshot(record, wizard)
+    current_location, carrying_item, energy_level = hud["location"], hud["carrying"], hud["energy"]
+
+# --- Hot Reload (development) ---
+# Changed files are queued by a background thread and swapped in at the top of the next frame.
+def reload_sprites(path):
+    global my_spritesheet
+    my_spritesheet = load_spritesheet()
+    wizard.reload_animations(my_spritesheet, wizard_animations_data)
+
+def reload_tiles(path):
+    global tile_bank
+    tile_bank = TileBank(settings.ROOM_TILEMAPS_FILENAME, scale=settings.GLOBAL_SCALE_FACTOR)
+    static_layers.tile_bank = tile_bank
+    static_layers.tilemaps.clear()
+    static_layers.invalidate()
+
+def reload_collision(path):
+    global room_collision, flow_field
+    if os.path.abspath(path) == current_collision_path:
+        room_collision, tile_size = load_room_collision(path)
+        flow_field = FlowField(room_collision, tile_size)
+        wizard.collision_grid = CollisionGrid(room_collision, tile_size)
+
+def reload_game_settings(path):
+    changed = reload_settings(settings)
+    if changed:
+        print(f"  Changed: {', '.join(sorted(changed))}")
+    # Values the player copied at creation; window and tile sizes need a restart
+    wizard.speed_pps = settings.PLAYER_SPEED_PPS
+    wizard.gravity_pps = settings.PLAYER_GRAVITY_PPS
+    wizard.animation_ticks_per_frame = settings.PLAYER_ANIMATION_TICKS_PER_FRAME
+
+asset_watcher = None
+if settings.HOT_RELOAD_ENABLED and wizard is not None:
+    asset_watcher = AssetWatcher(settings.HOT_RELOAD_INTERVAL)
+    for sprite_path in (settings.SPRITESHEET_FILENAME, settings.ATLAS_FILENAME):
+        asset_watcher.watch(sprite_path, reload_sprites)
+    asset_watcher.watch(settings.ROOM_TILEMAPS_FILENAME, reload_tiles)
+    for collision_path in glob.glob(settings.ROOM_COLLISION_FILENAME.format(room="*")):
+        asset_watcher.watch(collision_path, reload_collision)
+    asset_watcher.watch(settings.__file__, reload_game_settings)
+    asset_watcher.start()
+
+hud_text_cache = {}  # HUD line -> rendered Surface (the lines rarely change between frames)
+
+def draw_info_panel(surface, hud):
     # Draw background for info panel
     info_panel_rect = pygame.Rect(0, settings.INFO_PANEL_Y_START, settings.SCREEN_WIDTH, settings.INFO_PANEL_HEIGHT)
     pygame.draw.rect(surface, settings.INFO_PANEL_BG_COLOR, info_panel_rect)
 
     # Text lines
-    line1_text = f"you are {current_location},"
-    line2_text = f"carrying {carrying_item}."
-    line3_text = f"energy....{energy_level}%"
+    location, carrying, energy = hud
+    line1_text = f"you are {location},"
+    line2_text = f"carrying {carrying}."
+    line3_text = f"energy....{energy}%"
 
     texts_to_render = [line1_text, line2_text, line3_text]
     # Margins and spacing are now scaled in settings.py
@@ -147,7 +273,12 @@ def draw_info_panel(surface):
 
     for text_content in texts_to_render:
         if info_font:
-            text_surface = info_font.render(text_content, True, settings.INFO_PANEL_TEXT_COLOR)
+            text_surface = hud_text_cache.get(text_content)
+            if text_surface is None:
+                if len(hud_text_cache) >= settings.HUD_TEXT_CACHE_SIZE:
+                    hud_text_cache.clear()
+                text_surface = info_font.render(text_content, True, settings.INFO_PANEL_TEXT_COLOR)
+                hud_text_cache[text_content] = memstats.track(text_surface, memstats.HUD, text_content)
             surface.blit(text_surface, (settings.TEXT_MARGIN_X, current_y))
             current_y += text_surface.get_height() + settings.LINE_SPACING
         else: # Fallback if font failed to load
@@ -155,48 +286,105 @@ def draw_info_panel(surface):
             current_y += 20 + settings.LINE_SPACING
 
 
+# --- Simulation and Rendering ---
+def simulate(dt):
+    """Advance the game one tick and return what the renderer needs to draw it."""
+    global tick
+    if pygame.key.get_pressed()[pygame.K_BACKSPACE]:
+        # Rewind: step back one tick per frame while history remains
+        record = rewind.pop()
+        if record is not None:
+            apply_snapshot(record)
+    else:
+        # The Group.update() method will call wizard.update(dt, platforms)
+        # because Player.update is defined to accept these arguments.
+        all_sprites.update(dt, platforms)
+        tick += 1
+        rewind.push(take_snapshot())
+    # Recomputed only when the wizard enters a different cell
+    flow_field.update(wizard.rect.center)
+    return make_render_snapshot(tick, current_room_id, moving_sprites, (current_location, carrying_item, energy_level))
+
+def draw_frame(surface, frame):
+    # 1. Blit the cached static layer (background, tiles, platforms) over the game area
+    surface.blit(static_layers.get(frame.room_id), (0, 0))
+
+    # 2. Draw the moving sprites (player) on top
+    # These sprites are positioned within the GAME_AREA_WIDTH and GAME_AREA_HEIGHT
+    surface.blits(frame.sprites, doreturn=False)
+
+    # 3. Draw Info Panel on top of everything at the bottom
+    draw_info_panel(surface, frame.hud)
+
+# Optional pipelined mode: the simulation runs on its own thread at settings.FPS and
+# publishes immutable render snapshots; this loop only pumps events and draws the newest one.
+simulation = None
+if settings.THREADED_SIMULATION and wizard is not None:
+    simulation = SimulationThread(simulate, settings.FPS, SnapshotBuffer(settings.RENDER_BUFFER_COUNT))
+    simulation.start()
+
 # --- Game Loop ---
 running = True
 
 while running:
     dt = clock.tick(settings.FPS) / 1000.0
 
-    # Event Handling
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_ESCAPE:
+    # Event Handling (game state changes wait for the simulation thread's current tick)
+    with simulation.lock if simulation is not None else contextlib.nullcontext():
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
                 running = False
-    
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    running = False
+                elif event.key == pygame.K_F5 and wizard is not None:
+                    save_snapshot(settings.QUICKSAVE_FILENAME, take_snapshot())
+                elif event.key == pygame.K_F9 and wizard is not None:
+                    record = load_snapshot(settings.QUICKSAVE_FILENAME)
+                    if record is not None:
+                        apply_snapshot(record)
+                        rewind.clear()
+                elif event.key == pygame.K_F3:
+                    print(memstats.registry.report(settings.MEMORY_REPORT_TOP))
+                    memstats.registry.dump(settings.MEMORY_REPORT_FILENAME)
+
+        # Safe point: swap in assets edited since the last frame
+        if asset_watcher is not None:
+            asset_watcher.apply_pending()
+
+    # Drop cached surfaces if a memory budget is exceeded
+    memstats.registry.enforce()
+
     # Update Game State
-    if wizard is not None:
-        # The Group.update() method will call wizard.update(dt, platforms)
-        # because Player.update is defined to accept these arguments.
-        all_sprites.update(dt, platforms)
+    if simulation is not None:
+        if simulation.error is not None:
+            print(f"Error in simulation thread: {simulation.error}")
+            running = False
+        frame = simulation.buffer.latest()
+    elif wizard is not None:
+        frame = simulate(dt)
     else:
         print("Error: wizard object is None, cannot update.")
+        frame = None
 
     # Draw / Render
-    # 1. Fill the entire screen (this will be the background for the game area too)
-    screen.fill(settings.BLACK) # Or settings.SKY_BLUE for the game area if preferred
-
-    # 2. Draw all game sprites (player, platforms) onto the screen
-    # These sprites are positioned within the GAME_AREA_WIDTH and GAME_AREA_HEIGHT
-    if wizard is not None:
-        all_sprites.draw(screen)
-    else:
+    if frame is not None:
+        draw_frame(screen, frame)
+    elif wizard is None:
         # Fallback rendering if player missing
+        screen.blit(static_layers.get(current_room_id), (0, 0))
         font = pygame.font.Font(None, 36) # A generic font for error message
         text_surface = font.render("Error: Player missing. Cannot draw game.", True, settings.WHITE)
         text_rect = text_surface.get_rect(center=(settings.SCREEN_WIDTH/2, settings.SCREEN_HEIGHT/2))
         screen.blit(text_surface, text_rect)
-        
-    # 3. Draw Info Panel on top of everything at the bottom
-    draw_info_panel(screen)
-        
+        draw_info_panel(screen, (current_location, carrying_item, energy_level))
+
     pygame.display.flip()
 
 # --- Cleanup ---
+if simulation is not None:
+    simulation.stop()
+if asset_watcher is not None:
+    asset_watcher.stop()
 pygame.quit()
 print("Game exited cleanly.")
\ No newline at end of file
@@ -0,0 +1,154 @@
+# memstats.py
+
+import os
+import json
+import weakref
+import threading
+
+# Categories used by the game; any other string works too
+SPRITES = "sprites"
+BACKGROUNDS = "backgrounds"
+HUD = "hud"
+CACHES = "caches"
+DISPLAY = "display"
+
+
+def surface_bytes(surface):
+    """Pixel memory owned by a Surface (0 for subsurfaces, which share their parent's pixels)."""
+    if surface.get_parent() is not None:
+        return 0
+    return surface.get_pitch() * surface.get_height()
+
+
+class SurfaceRegistry:
+    """
+    Byte accounting for pygame Surfaces by category and owner.
+    Surfaces are held by weak reference: a surface drops out of the totals as soon as it is
+    freed, so loaders only need to call track() when they create one. Optional per-category
+    budgets call an eviction callback (e.g. RoomLayerCache.evict) when exceeded.
+    """
+    def __init__(self):
+        self.entries = {}  # id(surface) -> (weakref, category, owner, bytes, size)
+        self.totals = {}   # category -> bytes
+        self.budgets = {}  # category -> (limit in bytes, eviction callback or None)
+        self.over_budget = set()  # Categories already reported as over budget
+        self.lock = threading.RLock()  # Reentrant: a weakref callback can fire while it is held
+
+    def track(self, surface, category, owner=""):
+        """
+        Count a surface under `category` until it is freed (tracking it again re-labels it).
+        Returns:
+            pygame.Surface: The same surface, so loaders can wrap their return value.
+        """
+        key = id(surface)
+        size = surface_bytes(surface)
+        ref = weakref.ref(surface, lambda ref, key=key: self._forget(key, ref))
+        with self.lock:
+            previous = self.entries.get(key)
+            if previous is not None:
+                self.totals[previous[1]] -= previous[3]
+            self.entries[key] = (ref, category, owner, size, surface.get_size())
+            self.totals[category] = self.totals.get(category, 0) + size
+        return surface
+
+    def untrack(self, surface):
+        """Stop counting a surface that is still alive (e.g. handed over to another owner)."""
+        with self.lock:
+            entry = self.entries.pop(id(surface), None)
+            if entry is not None:
+                self.totals[entry[1]] -= entry[3]
+
+    def total(self, category=None):
+        """Bytes tracked in one category, or in all of them."""
+        with self.lock:
+            if category is None:
+                return sum(self.totals.values())
+            return self.totals.get(category, 0)
+
+    def top(self, count=10):
+        """The `count` largest tracked surfaces as (bytes, category, owner, (w, h)), largest first."""
+        with self.lock:
+            entries = list(self.entries.values())
+        entries.sort(key=lambda entry: entry[3], reverse=True)
+        return [(size, category, owner, dimensions) for _, category, owner, size, dimensions in entries[:count]]
+
+    def set_budget(self, category, limit, evict=None):
+        """
+        Cap a category's bytes.
+        Args:
+            category (str): Category to cap.
+            limit (int): Bytes allowed; None removes the budget.
+            evict (callable, optional): evict(bytes_over) frees what it can when enforce() finds
+                the category over budget (e.g. by dropping cached surfaces).
+        """
+        if limit is None:
+            self.budgets.pop(category, None)
+        else:
+            self.budgets[category] = (limit, evict)
+
+    def enforce(self):
+        """
+        Run the eviction callback of every category over its budget. Call once per frame at a
+        safe point. A category still over budget afterwards is reported once.
+        Returns:
+            dict: Category -> bytes over budget after eviction, for categories still over.
+        """
+        still_over = {}
+        for category, (limit, evict) in list(self.budgets.items()):
+            over = self.total(category) - limit
+            if over > 0 and evict is not None:
+                evict(over)
+                over = self.total(category) - limit
+            if over > 0:
+                still_over[category] = over
+                if category not in self.over_budget:
+                    print(f"Memory budget exceeded: {category} is {over} bytes over {limit}")
+        self.over_budget = set(still_over)
+        return still_over
+
+    def report(self, count=10):
+        """Human-readable totals and the `count` largest surfaces."""
+        with self.lock:
+            totals = sorted(self.totals.items(), key=lambda item: item[1], reverse=True)
+            surface_count = len(self.entries)
+        lines = [f"Surface memory: {sum(size for _, size in totals) / 1024:.1f} KB in {surface_count} surfaces"]
+        for category, size in totals:
+            budget = self.budgets.get(category)
+            limit = f" / {budget[0] / 1024:.1f} KB" if budget else ""
+            lines.append(f"  {category:<12} {size / 1024:10.1f} KB{limit}")
+        lines.append(f"Top {count}:")
+        for size, category, owner, (width, height) in self.top(count):
+            lines.append(f"  {size / 1024:10.1f} KB  {width}x{height}  {category}  {owner}")
+        return "\n".join(lines)
+
+    def dump(self, filename, count=50):
+        """Write totals, budgets and the `count` largest surfaces to a JSON file."""
+        with self.lock:
+            totals = dict(self.totals)
+            surface_count = len(self.entries)
+        data = {
+            "totalBytes": sum(totals.values()),
+            "surfaces": surface_count,
+            "categories": totals,
+            "budgets": {category: limit for category, (limit, _) in self.budgets.items()},
+            "top": [{"bytes": size, "category": category, "owner": owner, "size": list(dimensions)}
+                    for size, category, owner, dimensions in self.top(count)],
+        }
+        try:
+            with open(filename, "w") as f:
+                json.dump(data, f, indent=2)
+        except OSError as e:
+            print(f"Unable to write memory report: {filename} (abs path: {os.path.abspath(filename)})")
+            print(f"Error: {e}")
+
+    def _forget(self, key, ref):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] is ref:
+                del self.entries[key]
+                self.totals[entry[1]] -= entry[3]
+
+
+# Shared registry for the running game; loaders call memstats.track(...)
+registry = SurfaceRegistry()
+track = registry.track
@@ -0,0 +1,82 @@
+# navgraph.py
+
+import os
+import numpy as np
+
+NO_PATH = 0xFFFF  # Unreachable marker in the tables (see tools/build_nav_graph.py)
+
+
+class NavGraph:
+    """
+    Precomputed world navigation tables written by tools/build_nav_graph.py.
+    Distances are in 8-pixel collision cells (a door transition counts as one step);
+    every query is a table lookup.
+    """
+    def __init__(self, filename):
+        """
+        Load the navigation tables.
+        Args:
+            filename (str): Path to nav_graph.npz.
+        """
+        try:
+            with np.load(filename) as data:
+                self.room_ids = [str(room_id) for room_id in data["rooms"]]
+                self.door_ids = [str(door_id) for door_id in data["doors"]]
+                self.door_rooms = data["doorRooms"]
+                self.door_distances = data["doorDistance"]
+                self.door_next = data["doorNext"]
+                self.room_distances = data["roomDistance"]
+                self.room_hop_counts = data["roomHops"]
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Unable to load navigation graph: {filename} (abs path: {os.path.abspath(filename)})")
+            raise SystemExit(e)
+
+        self.room_index = {room_id: i for i, room_id in enumerate(self.room_ids)}
+        self.door_index = {door_id: i for i, door_id in enumerate(self.door_ids)}
+
+    @staticmethod
+    def _value(value):
+        return None if value == NO_PATH else int(value)
+
+    def room_distance(self, from_room, to_room):
+        """Steps from a door of `from_room` into `to_room` (0 for the same room), or None if unreachable."""
+        return self._value(self.room_distances[self.room_index[from_room], self.room_index[to_room]])
+
+    def room_hops(self, from_room, to_room):
+        """Number of doors to pass through from one room to another, or None if unreachable."""
+        return self._value(self.room_hop_counts[self.room_index[from_room], self.room_index[to_room]])
+
+    def door_distance(self, from_door, to_door):
+        """Steps from one door to another, or None if unreachable."""
+        return self._value(self.door_distances[self.door_index[from_door], self.door_index[to_door]])
+
+    def next_door(self, from_door, to_door):
+        """The next door on a shortest path from `from_door` towards `to_door`, or None if unreachable."""
+        hop = self.door_next[self.door_index[from_door], self.door_index[to_door]]
+        return None if hop == NO_PATH else self.door_ids[hop]
+
+    def route(self, from_door, to_door):
+        """Door ids along a shortest path, both ends included; empty if unreachable."""
+        if self.next_door(from_door, to_door) is None:
+            return []
+        path = [from_door]
+        while path[-1] != to_door:
+            path.append(self.next_door(path[-1], to_door))
+        return path
+
+    def exit_towards(self, from_room, to_room):
+        """
+        The door of `from_room` to head for to reach `to_room` fastest.
+        Returns:
+            str or None: Door id, or None if `to_room` is unreachable (or is `from_room`).
+        """
+        if from_room == to_room:
+            return None
+        room, target = self.room_index[from_room], self.room_index[to_room]
+        doors = np.flatnonzero(self.door_rooms == room)
+        targets = np.flatnonzero(self.door_rooms == target)
+        if not len(doors) or not len(targets):
+            return None
+        distances = self.door_distances[np.ix_(doors, targets)].min(axis=1)
+        best = distances.argmin()
+        return None if distances[best] == NO_PATH else self.door_ids[doors[best]]
@@ -0,0 +1,98 @@
+# pipeline.py
+
+import time
+import threading
+from collections import namedtuple
+
+# Everything the render stage needs for one tick. Images are shared animation frames,
+# never modified after loading, so a snapshot can be drawn while the next tick runs.
+RenderSnapshot = namedtuple("RenderSnapshot", ["tick", "room_id", "sprites", "hud"])
+# sprites: tuple of (Surface, (x, y)) in draw order; hud: (location, carrying, energy)
+
+
+def make_render_snapshot(tick, room_id, sprites, hud):
+    """Capture the drawable state of a sprite group (anything with .image and .rect)."""
+    return RenderSnapshot(tick, room_id, tuple((sprite.image, sprite.rect.topleft) for sprite in sprites), hud)
+
+
+class SnapshotBuffer:
+    """
+    Ring of the most recent render snapshots (2 = double, 3 = triple buffering).
+    The simulation publishes into the next slot while the renderer reads the newest
+    complete one; neither waits for the other.
+    """
+    def __init__(self, slots=3):
+        """
+        Args:
+            slots (int): Number of snapshots kept.
+        """
+        self.slots = [None] * slots
+        self.newest = -1
+        self.lock = threading.Lock()
+
+    def publish(self, snapshot):
+        with self.lock:
+            self.newest = (self.newest + 1) % len(self.slots)
+            self.slots[self.newest] = snapshot
+
+    def latest(self):
+        """The newest published snapshot, or None before the first tick."""
+        with self.lock:
+            return self.slots[self.newest] if self.newest >= 0 else None
+
+
+class SimulationThread:
+    """
+    Runs the game simulation at a fixed tick rate on a worker thread and publishes a
+    RenderSnapshot after every tick. The main thread keeps the event pump and rendering;
+    pygame's blits and display flips release the GIL, so they overlap with the next tick.
+    Code on the main thread that changes game state (key commands, hot reload) must hold
+    `lock`, which the simulation holds for the duration of each tick.
+    """
+    def __init__(self, step, tick_rate, buffer, max_catch_up=5):
+        """
+        Args:
+            step (callable): step(dt) advances the game one tick and returns its RenderSnapshot.
+            tick_rate (int): Ticks per second (e.g. settings.FPS).
+            buffer (SnapshotBuffer): Where snapshots are published.
+            max_catch_up (int): Most ticks run back to back after a stall before time is dropped.
+        """
+        self.step = step
+        self.dt = 1.0 / tick_rate
+        self.buffer = buffer
+        self.max_catch_up = max_catch_up
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.error = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name="Simulation", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def is_alive(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def _run(self):
+        next_tick = time.perf_counter()
+        try:
+            while not self.stop_event.is_set():
+                delay = next_tick - time.perf_counter()
+                if delay > 0:
+                    self.stop_event.wait(delay)
+                    continue
+                if delay < -self.max_catch_up * self.dt:
+                    next_tick = time.perf_counter()  # Too far behind (e.g. a breakpoint): drop the backlog
+                with self.lock:
+                    snapshot = self.step(self.dt)
+                self.buffer.publish(snapshot)
+                next_tick += self.dt
+        except Exception as e:
+            # Reported by the main loop, which then shuts down
+            self.error = e
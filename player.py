@@ -2,13 +2,16 @@
 
 import pygame
 import settings # Import the whole settings module to access its constants
+from collision import build_frame_masks
 
 class Player(pygame.sprite.Sprite):
     def __init__(self, spritesheet_obj, animation_frames_data, initial_animation, position=(100,100),
-                 animation_ticks_per_frame=settings.PLAYER_ANIMATION_TICKS_PER_FRAME):
+                 animation_ticks_per_frame=settings.PLAYER_ANIMATION_TICKS_PER_FRAME, collision_grid=None):
         super().__init__()
         self.spritesheet = spritesheet_obj
         self.animations = {}
+        self.frame_masks = {}   # Animation name -> mask per frame (built once in load_animations)
+        self.frame_bounds = {}  # Animation name -> tight opaque Rect per frame, frame-local
         # self.scale_factor = settings.PLAYER_SCALE_FACTOR # Old: Replaced by direct use of GLOBAL_SCALE_FACTOR
 
         # Native sprite dimensions (these are unscaled)
@@ -35,6 +38,8 @@ class Player(pygame.sprite.Sprite):
         self.gravity_pps = settings.PLAYER_GRAVITY_PPS
 
         self.is_on_ground = False # Will be set by collision logic
+        # Optional collision.CollisionGrid: swept tile collision instead of testing platform sprites
+        self.collision_grid = collision_grid
 
         self.image = None 
         self.rect = None 
@@ -68,9 +73,22 @@ class Player(pygame.sprite.Sprite):
             if not frames: 
                 print(f"Warning: No frames loaded for '{name}' in Player.load_animations.")
             self.animations[name] = frames
+            self.frame_masks[name], self.frame_bounds[name] = build_frame_masks(frames, settings.SPRITE_BACKGROUND_COLOR)
         if not self.animations: 
             print("CRITICAL: Player animations still empty after loading.")
 
+    def reload_animations(self, spritesheet_obj, animation_frames_data):
+        """Swap in frames from a reloaded spritesheet, keeping position, velocity and animation state."""
+        state = self.snapshot_state()
+        self.spritesheet = spritesheet_obj
+        self.animations = {}
+        self.frame_masks = {}
+        self.frame_bounds = {}
+        self.load_animations(animation_frames_data)
+        self.current_animation_name = None
+        self.current_frames = []
+        self.restore_state(state)
+
     def set_animation(self, animation_name):
         if self.current_animation_name == animation_name and self.current_frames: 
             return
@@ -125,6 +143,55 @@ class Player(pygame.sprite.Sprite):
             self.image = new_image
             self.rect = self.image.get_rect(topleft=self.position)
 
+    def _frame_key(self):
+        """(animation name, frame index) if the current image is a loaded animation frame, else None."""
+        frames = self.current_frames
+        if frames and self.current_frame_index < len(frames) and self.image is frames[self.current_frame_index]:
+            return self.current_animation_name, self.current_frame_index
+        return None
+
+    @property
+    def mask(self):
+        """Collision mask of the current image (cached per frame; used by pygame.sprite.collide_mask too)."""
+        key = self._frame_key()
+        if key is not None and key[0] in self.frame_masks:
+            return self.frame_masks[key[0]][key[1]]
+        # Images without cached masks (placeholders): same background handling as the cached frames
+        masks, _ = build_frame_masks([self.image], settings.SPRITE_BACKGROUND_COLOR)
+        return masks[0]
+
+    @property
+    def opaque_rect(self):
+        """Tight bounds of the current image's opaque pixels, in screen coordinates."""
+        key = self._frame_key()
+        if key is not None and key[0] in self.frame_bounds:
+            return self.frame_bounds[key[0]][key[1]].move(self.rect.topleft)
+        return self.rect
+
+    def snapshot_state(self):
+        """
+        The state snapshot.py packs for quick-save and rewind.
+        Returns:
+            tuple: (x, y, velocity x, velocity y, is_on_ground, animation name, frame index, animation ticks)
+        """
+        return (self.position.x, self.position.y, self.velocity.x, self.velocity.y, self.is_on_ground,
+                self.current_animation_name or "", self.current_frame_index, self.ticks_since_last_frame_change)
+
+    def restore_state(self, state):
+        """Restore a tuple returned by snapshot_state()."""
+        x, y, vx, vy, on_ground, animation_name, frame_index, animation_ticks = state
+        self.position.update(x, y)
+        self.velocity.update(vx, vy)
+        self.is_on_ground = on_ground
+        if animation_name in self.animations:
+            self.set_animation(animation_name)
+        if self.current_frames:
+            self.current_frame_index = frame_index % len(self.current_frames)
+            self.image = self.current_frames[self.current_frame_index]
+        self.ticks_since_last_frame_change = animation_ticks
+        if self.image is not None:
+            self.rect = self.image.get_rect(topleft=(round(x), round(y)))
+
     def handle_input_and_movement(self, dt):
         keys = pygame.key.get_pressed()
         
@@ -186,6 +253,21 @@ class Player(pygame.sprite.Sprite):
             self.position.y = float(self.rect.y)
             self.velocity.y = 0 
 
+    def handle_grid_collisions(self, start):
+        """
+        Continuous collision against self.collision_grid: the move from `start` to the current
+        position is swept through the tiles, so a long frame cannot tunnel through thin platforms.
+        """
+        dx, dy = self.position.x - start.x, self.position.y - start.y
+        x, y, hit_x, hit_y = self.collision_grid.sweep(start.x, start.y, self.rect.width, self.rect.height, dx, dy)
+        self.position.update(x, y)
+        if hit_x:
+            self.velocity.x = 0
+        self.is_on_ground = hit_y and dy > 0
+        if hit_y:
+            self.velocity.y = 0
+        self.rect.topleft = (round(x), round(y))
+
     def apply_screen_boundaries(self):
         if self.rect is None: 
             return # Should have a rect by now
@@ -256,6 +338,7 @@ class Player(pygame.sprite.Sprite):
                     self.rect = self.image.get_rect(topleft=self.position)
 
     def update(self, dt, platforms):
+        start = pygame.math.Vector2(self.position)
         self.handle_input_and_movement(dt)
 
         if self.rect is None:
@@ -266,7 +349,10 @@ class Player(pygame.sprite.Sprite):
                 self.rect = pygame.Rect(round(self.position.x), round(self.position.y), 
                                         self.scaled_sprite_width, self.scaled_sprite_height)
 
-        self.handle_platform_collisions(platforms)
+        if self.collision_grid is not None:
+            self.handle_grid_collisions(start)
+        else:
+            self.handle_platform_collisions(platforms)
         self.apply_screen_boundaries() # Uses scaled GAME_AREA_HEIGHT and SCREEN_WIDTH from settings
 
         if self.rect is not None: 
@@ -0,0 +1,178 @@
+# raycast.py
+
+import numpy as np
+
+MIP_BLOCK = 4  # Cells per side of a coarse block
+
+
+PARALLEL = 1e30  # Stand-in for 1/0 so rays parallel to grid lines never reach them (and never make NaNs)
+
+
+class _Level:
+    """One resolution of a RayGrid: blocked cells padded with an open border, flattened for lookups."""
+    def __init__(self, blocked, scale):
+        self.rows, self.cols = blocked.shape
+        self.scale = scale
+        padded = np.zeros((self.rows + 2, self.cols + 2), dtype=bool)
+        padded[1:-1, 1:-1] = blocked
+        self.flat = padded.ravel()
+        self.stride = self.cols + 2
+        self.x_lines = np.arange(self.cols + 1, dtype=np.float64)
+        self.y_lines = np.arange(self.rows + 1, dtype=np.float64)
+
+    def first_blocked(self, ox, oy, dx, dy, inv_dx, inv_dy):
+        """
+        Find where each ray first enters a blocked cell, all rays at once.
+        Every cell a DDA would step into is entered across a grid line, so each ray's crossings
+        of all vertical and horizontal lines are computed in one array; the cell entered at a
+        crossing follows from the line and the ray's position there. The first hit is the
+        nearest crossing into a blocked cell (or the start cell itself).
+
+        Args:
+            ox, oy, dx, dy, inv_dx, inv_dy: (n,) ray origins and unit directions in fine cell units.
+
+        Returns:
+            (t, col, row, from_x): fine-cell distance to the first blocked cell per ray (inf if
+            none), its cell on this level, and whether it was entered across a vertical line
+            (False for the start cell).
+        """
+        ox, oy = ox / self.scale, oy / self.scale
+        stride = self.stride
+        rays = np.arange(len(ox))
+        right = inv_dx > 0
+        down = inv_dy > 0
+
+        # Vertical lines: the column entered is the line (moving right) or the one before it (+1 for the border)
+        t_x = (self.x_lines - ox[:, None]) * inv_dx[:, None]
+        row_x = np.clip(np.floor(oy[:, None] + dy[:, None] * t_x), -1, self.rows).astype(np.int64)
+        t_x[(t_x <= 0) | ~self.flat[(row_x + 1) * stride + self.x_lines.astype(np.int64) + right[:, None]]] = np.inf
+        first_x = t_x.argmin(axis=1)
+
+        # Horizontal lines
+        t_y = (self.y_lines - oy[:, None]) * inv_dy[:, None]
+        col_y = np.clip(np.floor(ox[:, None] + dx[:, None] * t_y), -1, self.cols).astype(np.int64)
+        t_y[(t_y <= 0) | ~self.flat[(self.y_lines.astype(np.int64) + down[:, None]) * stride + col_y + 1]] = np.inf
+        first_y = t_y.argmin(axis=1)
+
+        t_x = t_x[rays, first_x]
+        t_y = t_y[rays, first_y]
+        from_x = t_x <= t_y
+        t = np.minimum(t_x, t_y)
+        col = np.where(from_x, first_x - ~right, col_y[rays, first_y])
+        row = np.where(from_x, row_x[rays, first_x], first_y - ~down)
+
+        # A ray starting inside a blocked cell hits it at distance 0 (on a line: the cell it moves into)
+        start_col = np.clip(np.where(dx < 0, np.ceil(ox) - 1, np.floor(ox)), -1, self.cols).astype(np.int64)
+        start_row = np.clip(np.where(dy < 0, np.ceil(oy) - 1, np.floor(oy)), -1, self.rows).astype(np.int64)
+        at_start = self.flat[(start_row + 1) * stride + start_col + 1]
+        return (np.where(at_start, 0.0, t * self.scale), np.where(at_start, start_col, col),
+                np.where(at_start, start_row, row), from_x & ~at_start)
+
+
+class RayGrid:
+    """
+    Batch ray casting (line of sight, magic bolts, door probes) against a room's collision grid.
+    Rays are traced in two passes over all rays together: first against a coarse level of
+    MIP_BLOCK x MIP_BLOCK blocks (rays that cross only empty blocks within their range are done
+    there, without touching the cells), then against the cells for the remaining rays.
+    """
+    def __init__(self, grid, tile_size):
+        """
+        Args:
+            grid: (rows, cols) array or nested lists, non-zero = solid
+                (collision JSON, RoomPack Room.collision_grid(), flowfield.grid_from_rects()).
+            tile_size (int): Cell size in the pixels ray origins and distances use.
+        """
+        solid = np.asarray(grid) != 0
+        self.rows, self.cols = solid.shape
+        self.tile_size = tile_size
+
+        # Coarse level: a block is occupied if any of its cells is solid
+        block_rows = -(-self.rows // MIP_BLOCK)
+        block_cols = -(-self.cols // MIP_BLOCK)
+        padded = np.zeros((block_rows * MIP_BLOCK, block_cols * MIP_BLOCK), dtype=bool)
+        padded[:self.rows, :self.cols] = solid
+        blocks = padded.reshape(block_rows, MIP_BLOCK, block_cols, MIP_BLOCK).any(axis=(1, 3))
+        self.fine = _Level(solid, 1)
+        self.coarse = _Level(blocks, MIP_BLOCK)
+
+    def cast(self, origins, directions, max_distance=np.inf):
+        """
+        Trace rays until they enter a solid cell, leave the grid or exceed max_distance.
+        Rays starting outside the grid miss.
+        Args:
+            origins: (n, 2) ray start points in pixels.
+            directions: (n, 2) ray directions (any non-zero length; normalized here).
+            max_distance: Scalar or (n,) limit in pixels.
+        Returns:
+            (hit, distance, cells, normals):
+                hit: (n,) bool, True where a solid cell was reached within max_distance
+                distance: (n,) pixels to the hit (to max_distance or the grid edge for misses)
+                cells: (n, 2) int (col, row) of the solid cell hit, -1 for misses
+                normals: (n, 2) int (x, y) unit normal of the face hit ((0, 0) if the ray starts inside a wall)
+        Raises:
+            ValueError: If a direction has zero length.
+        """
+        origins = np.asarray(origins, dtype=np.float64).reshape(-1, 2) / self.tile_size
+        directions = np.asarray(directions, dtype=np.float64).reshape(-1, 2)
+        lengths = np.hypot(directions[:, 0], directions[:, 1])
+        if not lengths.all():
+            raise ValueError(f"Zero-length ray direction at index {int(np.argmin(lengths))}")
+        directions = directions / lengths[:, None]
+        limit = np.broadcast_to(np.asarray(max_distance, dtype=np.float64) / self.tile_size, lengths.shape)
+
+        ox, oy = origins[:, 0], origins[:, 1]
+        dx, dy = directions[:, 0], directions[:, 1]
+        inv_dx = np.where(dx != 0, 1 / np.where(dx != 0, dx, 1), PARALLEL)
+        inv_dy = np.where(dy != 0, 1 / np.where(dy != 0, dy, 1), PARALLEL)
+
+        count = len(ox)
+        hit = np.zeros(count, dtype=bool)
+        distance = np.zeros(count)
+        cells = np.full((count, 2), -1, dtype=np.int64)
+        normals = np.zeros((count, 2), dtype=np.int64)
+
+        # Where each ray leaves the grid (misses report this distance, capped by max_distance)
+        inside = (ox >= 0) & (ox <= self.cols) & (oy >= 0) & (oy <= self.rows)
+        exit_x = np.where(dx > 0, (self.cols - ox) * inv_dx, np.where(dx < 0, -ox * inv_dx, np.inf))
+        exit_y = np.where(dy > 0, (self.rows - oy) * inv_dy, np.where(dy < 0, -oy * inv_dy, np.inf))
+        distance[:] = np.where(inside, np.minimum(np.minimum(exit_x, exit_y), limit), 0)
+
+        # Coarse pass: rays that only cross empty blocks before max_distance are done
+        t_block, _, _, _ = self.coarse.first_blocked(ox, oy, dx, dy, inv_dx, inv_dy)
+        todo = np.flatnonzero(np.isfinite(t_block) & (t_block <= limit) & inside)
+
+        # Fine pass for the rest
+        if len(todo):
+            t_cell, col, row, from_x = self.fine.first_blocked(ox[todo], oy[todo], dx[todo], dy[todo],
+                                                               inv_dx[todo], inv_dy[todo])
+            found = np.isfinite(t_cell) & (t_cell <= limit[todo])
+            done = todo[found]
+            hit[done] = True
+            distance[done] = t_cell[found]
+            cells[done] = np.stack([col[found], row[found]], axis=1)
+            at_start = t_cell[found] == 0
+            normals[done, 0] = np.where(from_x[found] & ~at_start, -np.sign(dx[done]), 0)
+            normals[done, 1] = np.where(~from_x[found] & ~at_start, -np.sign(dy[done]), 0)
+
+        return hit, distance * self.tile_size, cells, normals
+
+    def line_of_sight(self, origins, targets):
+        """
+        Whether each origin can see its target (no solid cell between them).
+        A target at its origin is visible.
+        Args:
+            origins: (n, 2) points in pixels (e.g. monster eyes).
+            targets: (n, 2) points in pixels (e.g. the wizard's centre), or one point for all.
+        Returns:
+            (n,) bool array.
+        """
+        origins = np.asarray(origins, dtype=np.float64).reshape(-1, 2)
+        offsets = np.broadcast_to(np.asarray(targets, dtype=np.float64), origins.shape) - origins
+        lengths = np.hypot(offsets[:, 0], offsets[:, 1])
+        visible = np.ones(len(origins), dtype=bool)
+        apart = np.flatnonzero(lengths > 0)
+        if len(apart):
+            hit, _, _, _ = self.cast(origins[apart], offsets[apart], lengths[apart])
+            visible[apart] = ~hit
+        return visible
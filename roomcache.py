@@ -0,0 +1,119 @@
+# roomcache.py
+
+import pygame
+import memstats
+
+class RoomLayerCache:
+    """
+    Pre-rendered static layer per room: background colour, tilemap tiles and static
+    sprites (platforms, scenery) composited once into one Surface.
+    Each frame then costs one blit of the cached layer plus the moving sprites.
+    A cache renders at one scale (the scale of its TileBank and static sprites);
+    keep one cache per scale.
+    """
+    def __init__(self, width, height, tile_bank=None, background_color=(0, 0, 0)):
+        """
+        Args:
+            width (int): Width of the cached layer in pixels (e.g. settings.GAME_AREA_WIDTH).
+            height (int): Height of the cached layer in pixels.
+            tile_bank (TileBank, optional): Tiles and tilemaps for rooms that have them.
+            background_color (tuple): Fill behind tiles and sprites.
+        """
+        self.width = width
+        self.height = height
+        self.tile_bank = tile_bank
+        self.background_color = background_color
+        self.layers = {}          # room id -> cached Surface, least recently used first
+        self.static_sprites = {}  # room id -> list of sprites baked into the layer
+        self.tilemaps = {}        # room id -> editable copy of the room's tilemap
+
+    def add_static(self, room_id, sprites):
+        """Bake sprites (anything with .image and .rect) into a room's layer."""
+        self.static_sprites.setdefault(room_id, []).extend(sprites)
+        self.invalidate(room_id)
+
+    def get(self, room_id):
+        """Return the room's cached layer, rendering it on first use."""
+        layer = self.layers.pop(room_id, None)
+        if layer is None:
+            layer = pygame.Surface((self.width, self.height)).convert()
+            self._render(layer, room_id, layer.get_rect())
+            memstats.track(layer, memstats.CACHES, f"room layer {room_id}")
+        self.layers[room_id] = layer  # Most recently used last
+        return layer
+
+    def set_tile(self, room_id, col, row, index):
+        """
+        Change one tile and redraw only that cell (Python counterpart of TileMapComponent.SetTile).
+        Args:
+            index (int): Tile bank index to place at (col, row).
+        """
+        self._tilemap(room_id)[row][col] = index
+        self.invalidate_tile(room_id, col, row)
+
+    def invalidate_tile(self, room_id, col, row):
+        """Redraw one grid cell of a cached layer (e.g. after a door opens or an item vanishes)."""
+        layer = self.layers.get(room_id)
+        if layer is None:
+            return  # Rendered in full on next get()
+        size = self._tile_size()
+        self._render(layer, room_id, pygame.Rect(col * size, row * size, size, size))
+
+    def invalidate(self, room_id=None):
+        """Drop a room's cached layer (or every layer) so it is re-rendered on next use."""
+        if room_id is None:
+            self.layers.clear()
+        else:
+            self.layers.pop(room_id, None)
+
+    def evict(self, bytes_needed, keep=None):
+        """
+        Drop least recently used layers until `bytes_needed` bytes are freed (a memstats budget callback).
+        Args:
+            bytes_needed (int): Bytes to free.
+            keep (str, optional): Room whose layer is never dropped (the room on screen).
+        Returns:
+            int: Bytes freed.
+        """
+        freed = 0
+        for room_id in list(self.layers):
+            if freed >= bytes_needed:
+                break
+            if room_id != keep:
+                freed += memstats.surface_bytes(self.layers.pop(room_id))
+        return freed
+
+    def _tile_size(self):
+        if self.tile_bank is not None:
+            return self.tile_bank.tile_size
+        return self.height // 18  # Rooms are 40x18 tiles
+
+    def _tilemap(self, room_id):
+        tilemap = self.tilemaps.get(room_id)
+        if tilemap is None and self.tile_bank is not None and room_id in self.tile_bank.tilemaps:
+            tilemap = [list(row) for row in self.tile_bank.tilemaps[room_id]]
+            self.tilemaps[room_id] = tilemap
+        if tilemap is None:
+            raise KeyError(f"Room '{room_id}' has no tilemap")
+        return tilemap
+
+    def _render(self, layer, room_id, area):
+        """Render everything static that overlaps `area` into the layer."""
+        layer.set_clip(area)
+        layer.fill(self.background_color, area)
+
+        if self.tile_bank is not None and (room_id in self.tilemaps or room_id in self.tile_bank.tilemaps):
+            size = self.tile_bank.tile_size
+            tilemap = self._tilemap(room_id)
+            first_col, last_col = area.left // size, (area.right - 1) // size
+            first_row, last_row = area.top // size, (area.bottom - 1) // size
+            layer.blits([
+                (self.tile_bank.tiles[tilemap[row][col]], (col * size, row * size))
+                for row in range(first_row, min(last_row + 1, len(tilemap)))
+                for col in range(first_col, min(last_col + 1, len(tilemap[row])))
+            ], doreturn=False)
+
+        for sprite in self.static_sprites.get(room_id, ()):
+            if sprite.rect.colliderect(area):
+                layer.blit(sprite.image, sprite.rect)
+        layer.set_clip(None)
@@ -0,0 +1,126 @@
+# roompack.py
+
+import os
+import mmap
+import struct
+import pygame
+import numpy as np
+
+# --- Room pack format (written by tools/build_room_pack.py) ---
+# All values little-endian, every section 4-byte aligned.
+#   Header:  magic, version, room count, offset of the index table
+#   Index:   one ROOM_ENTRY per room
+#   Room:    background (4-bit pens, two pixels per byte, high nibble = left pixel),
+#            palette (16 x RGB), collision bitset (row-major, LSB first), door records
+PACK_MAGIC = b"SRPK"
+PACK_VERSION = 1
+NAME_SIZE = 32  # Room and door ids, NUL-padded ASCII
+HEADER = struct.Struct("<4sHHI")
+ROOM_ENTRY = struct.Struct("<32sIHHIIHHIHhh")  # id, bg offset, w, h, palette offset, collision offset, cols, rows,
+                                               # doors offset, door count, spawn x, spawn y
+DOOR_RECORD = struct.Struct("<32sBxhh32s32s")  # id, type, x, y, target room, target door
+DOOR_TYPES = ("leftOpening", "rightOpening")
+PALETTE_SIZE = 16 * 3
+
+
+def _name(raw):
+    return raw.rstrip(b"\0").decode("ascii")
+
+
+class Room:
+    """
+    One room of a RoomPack. Background, palette and collision are zero-copy views of the mapped pack.
+    """
+    def __init__(self, view, entry):
+        (room_id, bg_offset, self.width, self.height, palette_offset, collision_offset,
+         self.cols, self.rows, doors_offset, door_count, spawn_x, spawn_y) = entry
+        self.room_id = _name(room_id)
+        self.spawn = (spawn_x, spawn_y)
+
+        self.background = view[bg_offset:bg_offset + self.width * self.height // 2]
+        self.palette = view[palette_offset:palette_offset + PALETTE_SIZE]
+        self.collision = view[collision_offset:collision_offset + (self.cols * self.rows + 7) // 8]
+
+        self.doors = []
+        for i in range(door_count):
+            door_id, door_type, x, y, target_room, target_door = DOOR_RECORD.unpack_from(
+                view, doors_offset + i * DOOR_RECORD.size)
+            self.doors.append({
+                "doorId": _name(door_id),
+                "type": DOOR_TYPES[door_type],
+                "x": x,
+                "y": y,
+                "targetRoomId": _name(target_room),
+                "targetDoorId": _name(target_door),
+            })
+
+        self._surface = None
+
+    def is_solid(self, col, row):
+        """True if the collision cell at (col, row) blocks movement. Cells outside the room are open."""
+        if not (0 <= col < self.cols and 0 <= row < self.rows):
+            return False
+        index = row * self.cols + col
+        return bool(self.collision[index >> 3] >> (index & 7) & 1)
+
+    def collision_grid(self):
+        """Collision as a (rows, cols) uint8 numpy array (0 = empty, 1 = solid)."""
+        bits = np.unpackbits(np.frombuffer(self.collision, dtype=np.uint8), bitorder="little")
+        return bits[:self.cols * self.rows].reshape(self.rows, self.cols)
+
+    def background_surface(self):
+        """
+        The background as an 8-bit palettized Surface (built on first use, then reused).
+        Blit it (or a scaled copy) instead of decoding the room again.
+        """
+        if self._surface is None:
+            packed = np.frombuffer(self.background, dtype=np.uint8)
+            pens = np.empty(packed.size * 2, dtype=np.uint8)
+            pens[0::2] = packed >> 4
+            pens[1::2] = packed & 0x0F
+            self._pens = pens  # The surface shares this buffer
+            self._surface = pygame.image.frombuffer(pens, (self.width, self.height), "P")
+            palette = bytes(self.palette)
+            self._surface.set_palette([tuple(palette[i:i + 3]) for i in range(0, PALETTE_SIZE, 3)])
+        return self._surface
+
+
+class RoomPack:
+    """
+    Memory-mapped room pack. The index is read once; room() is a dictionary lookup.
+    """
+    def __init__(self, filename):
+        """
+        Open a room pack.
+        Args:
+            filename (str): Path to the .pack file written by tools/build_room_pack.py.
+        """
+        try:
+            self._file = open(filename, "rb")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            print(f"Unable to open room pack: {filename} (abs path: {os.path.abspath(filename)})")
+            raise SystemExit(e)
+        self._view = memoryview(self._map)
+
+        magic, version, room_count, index_offset = HEADER.unpack_from(self._view, 0)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            raise SystemExit(f"Unsupported room pack {filename}: {magic!r} version {version}")
+
+        self.rooms = {}
+        for i in range(room_count):
+            room = Room(self._view, ROOM_ENTRY.unpack_from(self._view, index_offset + i * ROOM_ENTRY.size))
+            self.rooms[room.room_id] = room
+
+    def room(self, room_id):
+        """Return the Room with this id (KeyError if the pack has no such room)."""
+        return self.rooms[room_id]
+
+    def close(self):
+        for room in self.rooms.values():
+            for view in (room.background, room.palette, room.collision):
+                view.release()
+        self.rooms.clear()
+        self._view.release()
+        self._map.close()
+        self._file.close()
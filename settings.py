@@ -53,14 +53,43 @@ INFO_PANEL_TEXT_COLOR = (255, 255, 0)
 #         |-- Amstrad CPC - Sorcery - Characters.png
 SPRITESHEET_BASENAME = "Amstrad CPC - Sorcery - Characters.png"
 SPRITESHEET_FILENAME = os.path.join("assets", "images", SPRITESHEET_BASENAME)
+# Packed texture atlas written by tools/pack_atlas.py. Used instead of the sheet above when present.
+ATLAS_FILENAME = os.path.join("assets", "atlas", "atlas.json")
+# Binary room pack written by tools/build_room_pack.py from assets/data/rooms.json
+ROOM_PACK_FILENAME = os.path.join("assets", "data", "rooms.pack")
+# Shared 8x8 room tile bank and per-room tilemaps written by tools/decompose_rooms.py
+ROOM_TILEMAPS_FILENAME = os.path.join("assets", "data", "room_tilemaps.json")
+ROOM_COLLISION_FILENAME = os.path.join("assets", "data", "collision_{room}.json")  # .format(room=room id)
+# Door-to-door and room-to-room distance tables written by tools/build_nav_graph.py
+NAV_GRAPH_FILENAME = os.path.join("assets", "data", "nav_graph.npz")
+# Quick-save (F5 save, F9 load) and rewind (hold Backspace); see snapshot.py
+QUICKSAVE_FILENAME = "quicksave.snp"
+REWIND_BUDGET_BYTES = 4 * 1024 * 1024  # Several minutes of per-tick history at 60 FPS
+# Development: reload edited sprites, collision data and settings while running (SORCERY_HOT_RELOAD=1)
+HOT_RELOAD_ENABLED = os.environ.get("SORCERY_HOT_RELOAD") == "1"
+HOT_RELOAD_INTERVAL = 0.5  # Seconds between file polls
+# Run the simulation on its own thread, rendering the newest tick snapshot (SORCERY_THREADED_SIM=1)
+THREADED_SIMULATION = os.environ.get("SORCERY_THREADED_SIM") == "1"
+RENDER_BUFFER_COUNT = 3  # Render snapshots kept: 2 = double, 3 = triple buffering
+# Surface memory accounting (see memstats.py); F3 prints the report and writes the JSON dump
+MEMORY_BUDGETS = {"caches": 16 * 1024 * 1024}  # Bytes per category; over-budget caches evict old room layers
+MEMORY_REPORT_FILENAME = "memory_report.json"
+MEMORY_REPORT_TOP = 10  # Largest surfaces listed in the report
+HUD_TEXT_CACHE_SIZE = 32  # Rendered info panel lines kept
 
 # Player Settings
 PLAYER_SPRITE_WIDTH = 24
 PLAYER_SPRITE_HEIGHT = 24
 # PLAYER_SCALE_FACTOR = 3
 PLAYER_ANIMATION_TICKS_PER_FRAME = 7
+# Colour treated as empty in sprite collision masks (the ripped sheets have an opaque black background)
+SPRITE_BACKGROUND_COLOR = (0, 0, 0)
 PLAYER_ANIMATION_VELOCITY_THRESHOLD = 0.1 * GLOBAL_SCALE_FACTOR # Example: 0.3 pixels/frame at scale 3
 
+# Door Settings (base pixels, as DoorConfig.DOOR_WIDTH/HEIGHT; same as the player)
+DOOR_WIDTH = 24
+DOOR_HEIGHT = 24
+
 
 # Player movement speeds
 # Define base speeds in a way that's easy to understand (e.g., conceptual pixels per game tick if tied to FPS)
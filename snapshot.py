@@ -0,0 +1,134 @@
+# snapshot.py
+
+import os
+import sys
+import struct
+from collections import deque
+import numpy as np
+
+# --- Snapshot record (fixed layout, little-endian) ---
+# tick, player position x/y, velocity x/y, on ground, animation name, frame index, animation ticks,
+# room id, HUD location, HUD carried item, HUD energy. Strings are NUL-padded UTF-8.
+SNAPSHOT = struct.Struct("<Idddd?16sHH32s32s32sH")
+SNAPSHOT_MAGIC = b"SSNP"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_HEADER = struct.Struct("<4sHH")  # magic, version, record size (quick-save files)
+
+
+def _text(raw):
+    return raw.rstrip(b"\0").decode("utf-8", "replace")
+
+
+def pack_snapshot(tick, player, room_id, hud):
+    """
+    Pack the game state into one fixed-size record.
+    Args:
+        tick (int): Simulation tick the state belongs to.
+        player (Player): Source of position, velocity, ground flag and animation state.
+        room_id (str): Current room.
+        hud (dict): "location", "carrying" and "energy" as shown in the info panel.
+    Returns:
+        bytes: SNAPSHOT.size bytes.
+    """
+    (x, y, vx, vy, on_ground, animation, frame_index, animation_ticks) = player.snapshot_state()
+    return SNAPSHOT.pack(tick & 0xFFFFFFFF, x, y, vx, vy, on_ground, animation.encode("utf-8"),
+                         frame_index, animation_ticks, room_id.encode("utf-8"),
+                         hud["location"].encode("utf-8"), hud["carrying"].encode("utf-8"), hud["energy"])
+
+
+def restore_snapshot(record, player):
+    """
+    Apply a record to the player.
+    Returns:
+        (tick, room_id, hud) for the caller to restore the rest of the game state.
+    """
+    (tick, x, y, vx, vy, on_ground, animation, frame_index, animation_ticks,
+     room_id, location, carrying, energy) = SNAPSHOT.unpack(record)
+    player.restore_state((x, y, vx, vy, on_ground, _text(animation), frame_index, animation_ticks))
+    return tick, _text(room_id), {"location": _text(location), "carrying": _text(carrying), "energy": energy}
+
+
+def save_snapshot(filename, record):
+    """Write one record as a quick-save file."""
+    with open(filename, "wb") as f:
+        f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(record)))
+        f.write(record)
+
+
+def load_snapshot(filename):
+    """
+    Read a quick-save file.
+    Returns:
+        bytes or None: The record, or None if the file is missing or from another format version.
+    """
+    try:
+        with open(filename, "rb") as f:
+            magic, version, size = SNAPSHOT_HEADER.unpack(f.read(SNAPSHOT_HEADER.size))
+            record = f.read(size)
+    except (OSError, struct.error) as e:
+        print(f"Unable to load snapshot: {filename} (abs path: {os.path.abspath(filename)})")
+        print(f"Error: {e}")
+        return None
+    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION or size != SNAPSHOT.size or len(record) != size:
+        print(f"Warning: {filename} is not a version {SNAPSHOT_VERSION} snapshot. Ignored.")
+        return None
+    return record
+
+
+class RewindBuffer:
+    """
+    Per-tick snapshot history for rewinding, stored as sparse XOR deltas.
+    Only the newest record is kept in full; each older tick is the list of bytes that
+    changed (position + new value XOR old value), typically a few dozen bytes. XOR is its
+    own inverse, so stepping back one tick is applying the newest delta to the current
+    record. When the history exceeds the memory budget the oldest deltas are dropped.
+    """
+    def __init__(self, budget_bytes):
+        """
+        Args:
+            budget_bytes (int): Upper bound for the memory the stored deltas may use.
+        """
+        if SNAPSHOT.size > 256:
+            raise ValueError("Sparse deltas store byte positions as uint8; records must be <= 256 bytes")
+        self.budget_bytes = budget_bytes
+        self.deltas = deque()
+        self.used_bytes = 0
+        self.current = None  # Newest record as a uint8 array
+
+    def __len__(self):
+        """Number of ticks that can be rewound."""
+        return len(self.deltas)
+
+    def push(self, record):
+        """Store a new tick's record."""
+        new = np.frombuffer(record, dtype=np.uint8).copy()
+        if self.current is not None:
+            diff = self.current ^ new
+            changed = np.flatnonzero(diff).astype(np.uint8)
+            delta = changed.tobytes() + diff[changed].tobytes()
+            self.deltas.append(delta)
+            self.used_bytes += sys.getsizeof(delta)
+            while self.used_bytes > self.budget_bytes and self.deltas:
+                self.used_bytes -= sys.getsizeof(self.deltas.popleft())
+        self.current = new
+
+    def pop(self):
+        """
+        Step back one tick.
+        Returns:
+            bytes or None: The previous tick's record, or None if the history is exhausted.
+        """
+        if not self.deltas:
+            return None
+        delta = self.deltas.pop()
+        self.used_bytes -= sys.getsizeof(delta)
+        count = len(delta) // 2
+        changed = np.frombuffer(delta, dtype=np.uint8, count=count)
+        self.current[changed] ^= np.frombuffer(delta, dtype=np.uint8, offset=count)
+        return self.current.tobytes()
+
+    def clear(self):
+        """Forget the history (e.g. after loading a quick-save)."""
+        self.deltas.clear()
+        self.used_bytes = 0
+        self.current = None
@@ -2,6 +2,8 @@
 
 import pygame
 import os # Needed for os.path.abspath in the error message
+import json
+import memstats
 
 class Spritesheet:
     """
@@ -20,6 +22,65 @@ class Spritesheet:
             print(f"Unable to load spritesheet image: {filename} (abs path: {abs_path})")
             print(f"Pygame Error: {e}")
             raise SystemExit(e)
+        memstats.track(self.sheet, memstats.SPRITES, os.path.basename(filename))
+        self.filename = os.path.basename(filename)
+        self.pages = [self.sheet]
+        self.frames = {}         # Atlas frames by name (empty for plain sheets)
+        self.source_rects = {}   # (x, y, w, h) on the original sheet -> atlas frame name
+        self.source_path = None  # Original sheet of an atlas, loaded for rects the atlas lacks
+        self.source_sheet = None
+
+    @classmethod
+    def from_atlas(cls, metadata_path, source=None):
+        """
+        Load a packed texture atlas written by tools/pack_atlas.py.
+        Args:
+            metadata_path (str): Path to the atlas JSON; page images are loaded from the same folder.
+            source (str, optional): Path of the original sheet (e.g. settings.SPRITESHEET_FILENAME).
+                When given, get_image()/get_animation_frames() keep working with coordinates on
+                that original sheet, so existing animation data can be used unchanged. Rects the
+                atlas has no frame for (blank or off-grid cells) are cut from the original sheet.
+        Returns:
+            Spritesheet: A spritesheet backed by the atlas pages.
+        """
+        try:
+            with open(metadata_path) as f:
+                metadata = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Unable to load atlas metadata: {metadata_path} (abs path: {os.path.abspath(metadata_path)})")
+            raise SystemExit(e)
+
+        atlas_dir = os.path.dirname(metadata_path)
+        first_page = os.path.join(atlas_dir, metadata["pages"][0]["image"])
+        atlas = cls(first_page)
+        for page in metadata["pages"][1:]:
+            atlas.pages.append(cls(os.path.join(atlas_dir, page["image"])).sheet)
+
+        atlas.frames = metadata["frames"]
+        if source:
+            atlas.source_path = source
+            source_name = os.path.basename(source)
+            for name, frame in atlas.frames.items():
+                if frame.get("source") == source_name:
+                    atlas.source_rects[tuple(frame["sourceRect"])] = name
+        return atlas
+
+    def get_frame(self, name, scale=None):
+        """
+        Extract a named frame from an atlas, restoring the transparent border removed by trimming.
+        Args:
+            name (str): Frame name from the atlas metadata (e.g. "characters_r3c0").
+            scale (float, optional): Factor by which to scale the image. Defaults to None (no scaling).
+        Returns:
+            pygame.Surface: The frame at its original (untrimmed) size, optionally scaled.
+        """
+        frame = self.frames[name]
+        image = pygame.Surface([frame["sourceW"], frame["sourceH"]], pygame.SRCALPHA)
+        image.blit(self.pages[frame["page"]], (frame["offsetX"], frame["offsetY"]),
+                   (frame["x"], frame["y"], frame["w"], frame["h"]))
+        if scale:
+            image = pygame.transform.scale(image, (int(frame["sourceW"] * scale), int(frame["sourceH"] * scale)))
+        return memstats.track(image, memstats.SPRITES, f"{self.filename}:{name}")
 
     def get_image(self, x, y, width, height, scale=None):
         """
@@ -33,14 +94,29 @@ class Spritesheet:
         Returns:
             pygame.Surface: The extracted (and optionally scaled) image.
         """
+        atlas_frame = self.source_rects.get((x, y, width, height))
+        if atlas_frame is not None:
+            return self.get_frame(atlas_frame, scale)
+
         image = pygame.Surface([width, height], pygame.SRCALPHA) # Use SRCALPHA for transparency
-        image.blit(self.sheet, (0, 0), (x, y, width, height))
+        image.blit(self._source_sheet(x, y, width, height), (0, 0), (x, y, width, height))
         if scale:
             # Ensure dimensions are integers after scaling for transform.scale
             new_width = int(width * scale)
             new_height = int(height * scale)
             image = pygame.transform.scale(image, (new_width, new_height))
-        return image
+        return memstats.track(image, memstats.SPRITES, f"{self.filename}:({x},{y},{width},{height})")
+
+    def _source_sheet(self, x, y, width, height):
+        """The sheet that original-sheet coordinates refer to (the original file for an atlas)."""
+        if not self.frames:
+            return self.sheet  # Plain sheet
+        if self.source_path is None:
+            raise ValueError(f"Rect {(x, y, width, height)} is not an atlas frame and the atlas has no source sheet")
+        if self.source_sheet is None:
+            print(f"Note: rect {(x, y, width, height)} is not in the atlas; loading {self.source_path}")
+            self.source_sheet = Spritesheet(self.source_path).sheet
+        return self.source_sheet
 
     def get_animation_frames(self, start_x, y, frame_width, frame_height, num_frames, spacing=0, scale=None):
         """
@@ -0,0 +1,53 @@
+# tilebank.py
+
+import os
+import json
+import pygame
+import memstats
+
+class TileBank:
+    """
+    Shared room tile bank and per-room tilemaps written by tools/decompose_rooms.py.
+    Tiles are cut from the bank image once (at the requested scale) and drawn by index.
+    """
+    def __init__(self, filename, scale=1):
+        """
+        Load the tile bank.
+        Args:
+            filename (str): Path to room_tilemaps.json; the bank image is loaded from the same folder.
+            scale (int, optional): Integer factor the tiles are scaled by once at load. Defaults to 1.
+        """
+        try:
+            with open(filename) as f:
+                metadata = json.load(f)
+            bank_path = os.path.join(os.path.dirname(filename), metadata["bank"])
+            bank = pygame.image.load(bank_path).convert()
+        except (OSError, ValueError, KeyError, pygame.error) as e:
+            print(f"Unable to load tile bank: {filename} (abs path: {os.path.abspath(filename)})")
+            raise SystemExit(e)
+
+        if scale != 1:
+            bank = pygame.transform.scale(bank, (bank.get_width() * scale, bank.get_height() * scale))
+        self.bank = memstats.track(bank, memstats.BACKGROUNDS, metadata["bank"])  # Tiles are subsurfaces of it
+        self.tile_size = metadata["tileSize"] * scale
+        self.tilemaps = metadata["rooms"]   # room id -> rows of tile indices
+
+        columns = metadata["bankColumns"]
+        self.tiles = [
+            bank.subsurface((i % columns * self.tile_size, i // columns * self.tile_size,
+                             self.tile_size, self.tile_size))
+            for i in range(metadata["tileCount"])
+        ]
+
+    def draw_tile(self, surface, index, col, row, origin=(0, 0)):
+        """Draw tile `index` into grid cell (col, row) of `surface`."""
+        surface.blit(self.tiles[index], (origin[0] + col * self.tile_size, origin[1] + row * self.tile_size))
+
+    def draw_room(self, surface, room_id, origin=(0, 0)):
+        """Draw a room's whole tilemap (one blit per tile)."""
+        size = self.tile_size
+        surface.blits([
+            (self.tiles[index], (origin[0] + col * size, origin[1] + row * size))
+            for row, indices in enumerate(self.tilemaps[room_id])
+            for col, index in enumerate(indices)
+        ], doreturn=False)
@@ -1,11 +1,17 @@
 """
 Analyze the door area of Spritesheet2.png with grid overlays
 to find exact sprite boundaries.
+
+The vertical run scan works on numpy arrays and a foreground mask
+(see detect_sprites.py).
 """
 
 from PIL import Image, ImageDraw
+import numpy as np
 import os
 
+from detect_sprites import foreground_mask
+
 script_dir = os.path.dirname(os.path.abspath(__file__))
 project_dir = os.path.dirname(script_dir)
 spritesheet_path = os.path.join(project_dir, "Content", "Spritesheet2.png")
@@ -78,27 +84,18 @@ print(f"Saved 24px grid overlay: {grid24_path}")
 
 print("\n=== Scanning for door-like vertical patterns ===")
 # Look for vertical stripes (same color in a column for multiple rows)
+pixels = np.asarray(region.convert("RGB"))
+mask = foreground_mask(region, black_threshold=1)  # True = non-black pixel
+# A run starts on the first row and wherever a pixel differs from the one above it
+run_starts = np.ones((region.height, region.width), dtype=bool)
+run_starts[1:] = np.any(pixels[1:] != pixels[:-1], axis=2)
 for x in range(region.width):
-    col_pixels = [region.getpixel((x, y)) for y in range(region.height)]
-    # Check if this column has long runs of the same color (>8 pixels)
-    runs = []
-    current_color = col_pixels[0]
-    run_len = 1
-    for y in range(1, len(col_pixels)):
-        if col_pixels[y] == current_color:
-            run_len += 1
-        else:
-            if run_len >= 8 and current_color != (0, 0, 0) and current_color != (0, 0, 0, 255):
-                runs.append((current_color, run_len, y - run_len))
-            current_color = col_pixels[y]
-            run_len = 1
-    if run_len >= 8 and current_color != (0, 0, 0) and current_color != (0, 0, 0, 255):
-        runs.append((current_color, run_len, len(col_pixels) - run_len))
-
-    if runs:
-        abs_x = region_x1 + x
-        for color, length, start_y in runs:
-            if length >= 12:  # Only show long runs
-                print(f"  X={abs_x} (region x={x}): {length}px run of {color[:3]} starting at Y={start_y}")
+    starts = np.nonzero(run_starts[:, x])[0]
+    lengths = np.diff(np.append(starts, region.height))
+    abs_x = region_x1 + x
+    for start_y, length in zip(starts, lengths):
+        if length >= 12 and mask[start_y, x]:  # Only show long runs
+            color = tuple(int(c) for c in pixels[start_y, x])
+            print(f"  X={abs_x} (region x={x}): {length}px run of {color} starting at Y={start_y}")
 
 print("\nDone!")
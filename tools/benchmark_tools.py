@@ -0,0 +1,297 @@
+"""
+Benchmark the Asset Tools on Synthetic Inputs
+=============================================
+Times the asset pipeline stages on generated inputs far larger than the real
+asset set, records throughput and peak memory, and compares against a stored
+baseline.
+
+Stages:
+- crop_room_backgrounds: process_screenshot() on N 1152x816 WinAPE-style screenshots
+- generate_collision_grid: process_room() on the N cropped 320x144 backgrounds
+- find_door_bounds: foreground_mask() + find_door_bounds.find_band_spans() over every
+  band and column of a large sprite sheet
+- convert_cpc_graphics: convert_cpc_to_png() on a multi-megabyte Mode 0 dump
+- convert_tiles: convert_charset_to_png() (PNG + deduplicated tile cache) on the same dump
+
+Method:
+- Inputs are generated once per run (seeded, so runs are comparable) in a
+  temporary folder; generation is not timed
+- Each stage runs --repeat times and the fastest run is reported; tool output is
+  suppressed while timing
+- Peak memory is measured in one extra run under tracemalloc (Python and numpy
+  allocations; Pillow's internal image buffers are not traced)
+
+Baseline:
+- --save-baseline writes the results; later runs compare against it and report
+  stages more than --tolerance slower or bigger (exit code 1 if any)
+- Results are only compared for the same input sizes
+- tools/benchmark_baseline.json is committed, recorded with the default config;
+  timings depend on the machine, so re-record it locally before comparing:
+      python benchmark_tools.py --save-baseline
+
+Usage:
+    python benchmark_tools.py [--screenshots 200] [--dump-mb 4] [--sheet-size 2048]
+                              [--repeat 3] [--stage NAME ...]
+                              [--baseline tools/benchmark_baseline.json] [--save-baseline]
+                              [--tolerance 0.10]
+"""
+
+import io
+import sys
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+import contextlib
+from pathlib import Path
+
+try:
+    from PIL import Image
+    import numpy as np
+except ImportError:
+    print("ERROR: Requires Pillow and numpy. Install with: pip install Pillow numpy")
+    sys.exit(1)
+
+TOOLS_DIR = Path(__file__).parent
+sys.path.insert(0, str(TOOLS_DIR))
+sys.path.insert(0, str(TOOLS_DIR.parent / "extraction"))
+import crop_room_backgrounds  # noqa: E402
+import generate_collision_grid  # noqa: E402
+from detect_sprites import foreground_mask  # noqa: E402
+from find_door_bounds import find_band_spans  # noqa: E402
+from convert_cpc_graphics import convert_cpc_to_png  # noqa: E402
+from convert_tiles import convert_charset_to_png  # noqa: E402
+
+BASELINE_VERSION = 1
+SEED = 1234
+SCREENSHOT_SIZE = (1152, 816)
+BORDER_COLOR = (0, 0, 128)
+CELL = 24  # One 8x8 native cell in a 3x screenshot
+TILE_POOL = 1024  # Distinct 8x8 tiles the synthetic dump repeats (so tile dedupe has work to do)
+BYTES_PER_TILE = 32  # Mode 0: 4 bytes x 8 lines
+
+
+# --- Synthetic inputs ---
+
+def make_screenshot(rng):
+    """A WinAPE-style capture: border, a game area of coloured 3x cells on black and a HUD strip."""
+    pixels = np.empty((SCREENSHOT_SIZE[1], SCREENSHOT_SIZE[0], 3), dtype=np.uint8)
+    pixels[:] = BORDER_COLOR
+    top, left = crop_room_backgrounds.CONTENT_TOP, crop_room_backgrounds.CONTENT_LEFT
+    cols = (crop_room_backgrounds.CONTENT_RIGHT - left) // CELL
+    rows = (crop_room_backgrounds.GAME_AREA_BOTTOM - top) // CELL
+    cells = rng.integers(0, 256, (rows, cols, 3), dtype=np.uint8)
+    cells[rng.random((rows, cols)) < 0.7] = 0  # Mostly open space
+    pixels[top:top + rows * CELL, left:left + cols * CELL] = cells.repeat(CELL, axis=0).repeat(CELL, axis=1)
+    pixels[crop_room_backgrounds.HUD_TOP:crop_room_backgrounds.HUD_BOTTOM, left:crop_room_backgrounds.CONTENT_RIGHT] = 0
+    return Image.fromarray(pixels)
+
+
+def make_sprite_sheet(rng, size):
+    """A square sheet of random opaque rectangles on black, laid out on a loose grid."""
+    pixels = np.zeros((size, size, 3), dtype=np.uint8)
+    for y in range(0, size - CELL, CELL + 1):
+        for x in range(0, size - CELL, CELL + 1):
+            if rng.random() < 0.6:
+                w, h = rng.integers(4, CELL + 1, 2)
+                pixels[y:y + h, x:x + w] = rng.integers(1, 256, 3, dtype=np.uint8)
+    return Image.fromarray(pixels)
+
+
+def make_cpc_dump(rng, size_bytes):
+    """Mode 0 bytes built from a pool of tiles, as a charset or graphics bank would repeat them."""
+    pool = rng.integers(0, 256, (TILE_POOL, BYTES_PER_TILE), dtype=np.uint8)
+    tiles = pool[rng.integers(0, TILE_POOL, size_bytes // BYTES_PER_TILE)]
+    return tiles.tobytes()
+
+
+def generate_inputs(work_dir, screenshots, dump_mb, sheet_size):
+    """Write every synthetic input under work_dir. Returns a dict of paths."""
+    rng = np.random.default_rng(SEED)
+    shots_dir = work_dir / "screenshots"
+    shots_dir.mkdir()
+    for i in range(screenshots):
+        make_screenshot(rng).save(shots_dir / f"Room{i:04d}.png", compress_level=1)
+
+    sheet_path = work_dir / "sheet.png"
+    make_sprite_sheet(rng, sheet_size).save(sheet_path, compress_level=1)
+
+    dump_path = work_dir / "dump.bin"
+    dump_path.write_bytes(make_cpc_dump(rng, int(dump_mb * 1024 * 1024)))
+
+    for name in ("backgrounds", "collision", "graphics", "tiles"):
+        (work_dir / name).mkdir()
+    return {
+        "screenshots": sorted(shots_dir.glob("*.png")),
+        "sheet": sheet_path,
+        "dump": dump_path,
+        "work": work_dir,
+    }
+
+
+# --- Stages ---
+# Each stage takes the inputs and returns (work done, unit) for the throughput column.
+
+def stage_crop(inputs):
+    output_dir = inputs["work"] / "backgrounds"
+    for path in inputs["screenshots"]:
+        crop_room_backgrounds.process_screenshot(str(path), str(output_dir))
+    return len(inputs["screenshots"]), "screenshots"
+
+
+def stage_collision(inputs):
+    backgrounds = sorted((inputs["work"] / "backgrounds").glob("RoomBG_*.png"))
+    output_dir = inputs["work"] / "collision"
+    for path in backgrounds:
+        generate_collision_grid.process_room(str(path), str(output_dir))
+    return len(backgrounds), "rooms"
+
+
+def stage_door_bounds(inputs):
+    img = Image.open(inputs["sheet"])
+    mask = foreground_mask(img, black_threshold=1)
+    find_band_spans(mask, 0, mask.shape[1], num_bands=None)
+    return mask.size / 1e6, "Mpixels"
+
+
+def stage_cpc_graphics(inputs):
+    convert_cpc_to_png(str(inputs["dump"]), str(inputs["work"] / "graphics" / "dump.png"))
+    return inputs["dump"].stat().st_size / (1024 * 1024), "MB"
+
+
+def stage_tiles(inputs):
+    convert_charset_to_png(str(inputs["dump"]), str(inputs["work"] / "tiles" / "dump.png"))
+    return inputs["dump"].stat().st_size / (1024 * 1024), "MB"
+
+
+STAGES = {
+    "crop_room_backgrounds": stage_crop,
+    "generate_collision_grid": stage_collision,
+    "find_door_bounds": stage_door_bounds,
+    "convert_cpc_graphics": stage_cpc_graphics,
+    "convert_tiles": stage_tiles,
+}
+
+
+def run_stage(stage, inputs, repeat):
+    """Time a stage (fastest of `repeat` runs) and measure its traced peak memory in one more run."""
+    best = None
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            amount, unit = stage(inputs)
+            elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            stage(inputs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"seconds": best, "throughput": amount / best, "unit": f"{unit}/s", "peakBytes": peak}
+
+
+# --- Baseline ---
+
+def load_baseline(path):
+    try:
+        with open(path) as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"WARNING: Could not read baseline {path}: {e}")
+        return None
+    if baseline.get("version") != BASELINE_VERSION:
+        print(f"WARNING: Baseline {path} has version {baseline.get('version')}, expected {BASELINE_VERSION}; ignoring it")
+        return None
+    return baseline
+
+
+def compare(results, baseline, tolerance):
+    """Print each stage against the baseline. Returns the names of stages that regressed."""
+    regressions = []
+    print(f"\n{'Stage':<26}{'Time':>10}{'Baseline':>11}{'Change':>9}{'Peak MB':>10}{'Baseline':>10}")
+    for name, result in results.items():
+        previous = baseline["stages"].get(name)
+        if previous is None:
+            print(f"{name:<26}{result['seconds']:>9.3f}s{'-':>11}{'':>9}{result['peakBytes'] / 1e6:>10.1f}{'-':>10}")
+            continue
+        time_change = result["seconds"] / previous["seconds"] - 1
+        memory_change = result["peakBytes"] / max(previous["peakBytes"], 1) - 1
+        flags = []
+        if time_change > tolerance:
+            flags.append("SLOWER")
+        if memory_change > tolerance:
+            flags.append("MORE MEMORY")
+        if flags:
+            regressions.append(name)
+        print(f"{name:<26}{result['seconds']:>9.3f}s{previous['seconds']:>10.3f}s{time_change:>+9.0%}"
+              f"{result['peakBytes'] / 1e6:>10.1f}{previous['peakBytes'] / 1e6:>10.1f}  {' '.join(flags)}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the asset tools on synthetic inputs")
+    parser.add_argument("--screenshots", type=int, default=200, help="Synthetic screenshots to crop (default: 200)")
+    parser.add_argument("--dump-mb", type=float, default=4, help="Size of the synthetic CPC dump in MB (default: 4)")
+    parser.add_argument("--sheet-size", type=int, default=2048, help="Side of the synthetic sprite sheet (default: 2048)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per stage; the fastest counts (default: 3)")
+    parser.add_argument("--stage", action="append", choices=list(STAGES), default=None,
+                        help="Run only this stage (repeatable; default: all)")
+    parser.add_argument("--baseline", default=None, help="Baseline JSON (default: tools/benchmark_baseline.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="Slowdown / memory growth reported as a regression (default: 0.10)")
+    args = parser.parse_args()
+
+    baseline_path = Path(args.baseline) if args.baseline else TOOLS_DIR / "benchmark_baseline.json"
+    config = {"screenshots": args.screenshots, "dumpMb": args.dump_mb, "sheetSize": args.sheet_size}
+    stages = args.stage or list(STAGES)
+
+    print("=" * 60)
+    print("Asset Tool Benchmark")
+    print("=" * 60)
+    print(f"Inputs: {args.screenshots} screenshots {SCREENSHOT_SIZE[0]}x{SCREENSHOT_SIZE[1]}, "
+          f"{args.dump_mb:g} MB CPC dump, {args.sheet_size}x{args.sheet_size} sprite sheet")
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="sorcery_bench_") as work_dir:
+        start = time.perf_counter()
+        inputs = generate_inputs(Path(work_dir), args.screenshots, args.dump_mb, args.sheet_size)
+        if "generate_collision_grid" in stages and "crop_room_backgrounds" not in stages:
+            with contextlib.redirect_stdout(io.StringIO()):
+                stage_crop(inputs)  # Its backgrounds are the collision stage's input
+        print(f"Generated inputs in {time.perf_counter() - start:.1f}s\n")
+
+        for name in stages:
+            result = run_stage(STAGES[name], inputs, args.repeat)
+            results[name] = result
+            print(f"  {name:<26}{result['seconds']:>9.3f}s  {result['throughput']:>10.1f} {result['unit']:<16}"
+                  f"peak {result['peakBytes'] / 1e6:.1f} MB")
+
+    regressions = []
+    baseline = load_baseline(baseline_path)
+    if baseline is not None and baseline.get("config") != config:
+        print(f"\nBaseline {baseline_path} was recorded with {baseline.get('config')}; not comparing")
+    elif baseline is not None:
+        regressions = compare(results, baseline, args.tolerance)
+
+    if args.save_baseline:
+        stored = baseline["stages"] if baseline is not None and baseline.get("config") == config else {}
+        stored.update(results)
+        with open(baseline_path, "w") as f:
+            json.dump({"version": BASELINE_VERSION, "config": config, "stages": stored}, f, indent=2)
+        print(f"\nBaseline saved: {baseline_path}")
+
+    if regressions:
+        print(f"\nRegressions (> {args.tolerance:.0%}): {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
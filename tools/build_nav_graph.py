@@ -0,0 +1,243 @@
+"""
+Build the World Navigation Graph
+================================
+Door links (targetRoomId/targetDoorId) only describe one door at a time. This
+reads every room's collision grid and door list and precomputes how the whole
+map hangs together, so "how far is room X from here" is a table lookup.
+
+Algorithm:
+- Door rects (settings.DOOR_WIDTH x DOOR_HEIGHT) are painted into the room
+  backgrounds and so marked solid; they are opened in the navigation grid
+- Per room, one multi-source flood fill per door (flowfield.distance_field,
+  8-connected, no corner cutting) gives the steps to every other door in the room
+- Door links add an edge of DOOR_TRANSITION_COST to the target door
+- All-pairs shortest paths over the doors (vectorized Floyd-Warshall) with a
+  next-hop table for routing; room-to-room distances are reduced from it
+- A second pass over the same edges, weighted 1 per door link and 0 inside a
+  room, gives the fewest room transitions; room hop counts are reduced from it,
+  so they are unreachable exactly where the distances are
+
+Validation (printed): links to missing rooms/doors, one-way links, doors that
+cannot reach each other inside a room and rooms that cannot reach each other.
+
+Output:
+- nav_graph.npz: rooms, doors, doorRooms, doorDistance, doorNext, roomDistance,
+  roomHops (uint16 tables, 0xFFFF = unreachable); navgraph.NavGraph loads it.
+
+Usage:
+    python build_nav_graph.py [--rooms assets/data/rooms.json | --pack assets/data/rooms.pack]
+                              [--output assets/data/nav_graph.npz]
+"""
+
+import os
+import sys
+import json
+import argparse
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:
+    print("ERROR: Requires numpy. Install with: pip install numpy")
+    sys.exit(1)
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import settings  # noqa: E402
+from flowfield import distance_field, NEIGHBOURS_8, UNREACHABLE  # noqa: E402
+
+NAV_VERSION = 1
+TILE_SIZE = 8
+DOOR_TRANSITION_COST = 1
+NO_PATH = 0xFFFF
+INFINITY = np.int64(1) << 40
+
+
+def load_rooms_json(rooms_path, project_dir):
+    """Read rooms.json and the collision JSONs it references. Returns [(room_id, grid, doors)]."""
+    with open(rooms_path) as f:
+        rooms = json.load(f)["rooms"]
+    result = []
+    for room in rooms:
+        with open(project_dir / room["collision"]) as f:
+            grid = np.array(json.load(f)["collision"], dtype=np.uint8)
+        result.append((room["roomId"], grid, room["doors"]))
+    return result
+
+
+def load_rooms_pack(pack_path):
+    """Read the same data from a binary room pack. Returns [(room_id, grid, doors)]."""
+    from roompack import RoomPack
+    pack = RoomPack(pack_path)
+    result = [(room_id, room.collision_grid().copy(), room.doors) for room_id, room in pack.rooms.items()]
+    pack.close()
+    return result
+
+
+def door_mask(door, shape):
+    """Boolean mask of the grid cells a door's rect covers."""
+    mask = np.zeros(shape, dtype=bool)
+    col, row = door["x"] // TILE_SIZE, door["y"] // TILE_SIZE
+    width = -(-settings.DOOR_WIDTH // TILE_SIZE)
+    height = -(-settings.DOOR_HEIGHT // TILE_SIZE)
+    mask[max(row, 0):row + height, max(col, 0):col + width] = True
+    return mask
+
+
+def room_door_distances(grid, doors):
+    """
+    Steps between every pair of doors inside one room.
+
+    Returns:
+        (k, k) int64 array, INFINITY where a door cannot reach another
+    """
+    masks = [door_mask(door, grid.shape) for door in doors]
+    open_cells = grid == 0
+    for mask in masks:
+        open_cells |= mask
+
+    distances = np.full((len(doors), len(doors)), INFINITY, dtype=np.int64)
+    for i, mask in enumerate(masks):
+        field = distance_field(open_cells, mask, NEIGHBOURS_8)
+        for j, other in enumerate(masks):
+            steps = field[other].min()
+            if steps != UNREACHABLE:
+                distances[i, j] = steps
+    return distances
+
+
+def all_pairs(weights):
+    """
+    Floyd-Warshall, one vectorized relaxation per intermediate node.
+
+    Returns:
+        (distance, next_hop) where next_hop[i, j] is the first node after i on a
+        shortest path to j (-1 if none)
+    """
+    n = len(weights)
+    distance = weights.copy()
+    next_hop = np.where(distance < INFINITY, np.arange(n)[None, :], -1)
+    np.fill_diagonal(distance, 0)
+    np.fill_diagonal(next_hop, np.arange(n))
+    for k in range(n):
+        through = distance[:, k, None] + distance[None, k, :]
+        better = through < distance
+        distance = np.where(better, through, distance)
+        next_hop = np.where(better, next_hop[:, k, None], next_hop)
+    return distance, next_hop
+
+
+def build_nav_graph(rooms):
+    """
+    Build the door graph and its tables.
+
+    Args:
+        rooms: [(room_id, grid, doors)] as returned by load_rooms_json / load_rooms_pack
+
+    Returns:
+        dict of arrays as written to nav_graph.npz, plus a list of validation warnings
+    """
+    room_ids = [room_id for room_id, _, _ in rooms]
+    door_ids, door_rooms = [], []
+    for r, (room_id, _, doors) in enumerate(rooms):
+        door_ids.extend(door["doorId"] for door in doors)
+        door_rooms.extend([r] * len(doors))
+    door_index = {door_id: i for i, door_id in enumerate(door_ids)}
+    door_rooms = np.array(door_rooms, dtype=np.int64)
+    warnings = []
+
+    weights = np.full((len(door_ids), len(door_ids)), INFINITY, dtype=np.int64)
+    start = 0
+    for room_id, grid, doors in rooms:
+        local = room_door_distances(grid, doors)
+        weights[start:start + len(doors), start:start + len(doors)] = local
+        for i, j in zip(*np.nonzero(local >= INFINITY)):
+            if i < j:
+                warnings.append(f"{room_id}: {doors[i]['doorId']} and {doors[j]['doorId']} are not connected")
+        for door in doors:
+            target = door["targetDoorId"]
+            if door["targetRoomId"] not in room_ids or target not in door_index:
+                warnings.append(f"{door['doorId']}: links to missing {door['targetRoomId']}/{target}")
+                continue
+            if room_ids[door_rooms[door_index[target]]] != door["targetRoomId"]:
+                warnings.append(f"{door['doorId']}: {target} is not in room {door['targetRoomId']}")
+            weights[door_index[door["doorId"]], door_index[target]] = DOOR_TRANSITION_COST
+        start += len(doors)
+
+    for i, j in zip(*np.nonzero(weights == DOOR_TRANSITION_COST)):
+        if door_rooms[i] != door_rooms[j] and weights[j, i] != DOOR_TRANSITION_COST:
+            warnings.append(f"{door_ids[i]} -> {door_ids[j]} is one-way")
+
+    door_distance, door_next = all_pairs(weights)
+
+    # Hop counts over the same edges: a door link is one hop, walking inside a room is free
+    transitions = door_rooms[:, None] != door_rooms[None, :]
+    hop_weights = np.where(weights >= INFINITY, INFINITY, transitions.astype(np.int64))
+    door_hops, _ = all_pairs(hop_weights)
+
+    # Room to room: best over (door in from-room, door in to-room); a room is 0 from itself
+    room_count = len(room_ids)
+    room_distance = np.full((room_count, room_count), INFINITY, dtype=np.int64)
+    room_hops = np.full((room_count, room_count), INFINITY, dtype=np.int64)
+    for a in range(room_count):
+        from_doors = door_rooms == a
+        for b in range(room_count):
+            to_doors = door_rooms == b
+            if from_doors.any() and to_doors.any():
+                room_distance[a, b] = door_distance[np.ix_(from_doors, to_doors)].min()
+                room_hops[a, b] = door_hops[np.ix_(from_doors, to_doors)].min()
+    np.fill_diagonal(room_distance, 0)
+    np.fill_diagonal(room_hops, 0)
+
+    for a, b in zip(*np.nonzero(room_distance >= INFINITY)):
+        warnings.append(f"{room_ids[b]} is unreachable from {room_ids[a]}")
+
+    def table(values):
+        return np.where(values >= INFINITY, NO_PATH, np.minimum(values, NO_PATH - 1)).astype(np.uint16)
+
+    return {
+        "version": np.array(NAV_VERSION),
+        "rooms": np.array(room_ids),
+        "doors": np.array(door_ids),
+        "doorRooms": door_rooms.astype(np.uint16),
+        "doorDistance": table(door_distance),
+        "doorNext": np.where(door_next < 0, NO_PATH, door_next).astype(np.uint16),
+        "roomDistance": table(room_distance),
+        "roomHops": table(room_hops),
+    }, warnings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute door-to-door and room-to-room distances")
+    parser.add_argument("--rooms", default=None, help="Room definitions (default: assets/data/rooms.json)")
+    parser.add_argument("--pack", default=None, help="Read rooms from a binary room pack instead")
+    parser.add_argument("--output", default=None, help="Output file (default: assets/data/nav_graph.npz)")
+    args = parser.parse_args()
+
+    script_dir = Path(__file__).parent
+    project_dir = script_dir.parent
+
+    output_path = args.output or str(project_dir / "assets" / "data" / "nav_graph.npz")
+    if args.pack:
+        print(f"Reading rooms from {args.pack}...")
+        rooms = load_rooms_pack(args.pack)
+    else:
+        rooms_path = args.rooms or str(project_dir / "assets" / "data" / "rooms.json")
+        print(f"Reading rooms from {rooms_path}...")
+        rooms = load_rooms_json(rooms_path, project_dir)
+
+    tables, warnings = build_nav_graph(rooms)
+    for warning in warnings:
+        print(f"  WARNING: {warning}")
+
+    room_ids = list(tables["rooms"])
+    print(f"\n  {'':16s}" + "".join(f"{room_id[:10]:>11s}" for room_id in room_ids))
+    for room_id, row in zip(room_ids, tables["roomDistance"]):
+        print(f"  {room_id:16s}" + "".join(f"{'-' if d == NO_PATH else d:>11}" for d in row))
+
+    np.savez(output_path, **tables)
+    print(f"\n  {len(room_ids)} rooms, {len(tables['doors'])} doors -> {output_path} "
+          f"({os.path.getsize(output_path)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
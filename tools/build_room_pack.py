@@ -0,0 +1,138 @@
+"""
+Build the Binary Room Pack
+==========================
+Packs every room listed in assets/data/rooms.json (background PNG, collision
+JSON, doors and spawn point) into one versioned binary file that roompack.py
+memory-maps at runtime.
+
+Per room:
+- Background: quantized to its own 16-colour palette (rooms are captured from a
+  Mode 0 screen, so they never use more than 16 colours), stored as 4-bit pens
+- Collision: 40x18 grid as a bitset (90 bytes instead of ~5 KB of JSON)
+- Doors: fixed-size records (id, type, position, target room and door)
+- Spawn point
+
+The format (header, index table, struct layouts) is defined in roompack.py.
+
+Usage:
+    python build_room_pack.py [--rooms assets/data/rooms.json] [--output assets/data/rooms.pack]
+"""
+
+import os
+import sys
+import json
+import argparse
+from pathlib import Path
+
+try:
+    from PIL import Image
+    import numpy as np
+except ImportError:
+    print("ERROR: Requires Pillow and numpy. Install with: pip install Pillow numpy")
+    sys.exit(1)
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from roompack import (PACK_MAGIC, PACK_VERSION, HEADER, ROOM_ENTRY, DOOR_RECORD,  # noqa: E402
+                      DOOR_TYPES, NAME_SIZE)
+
+
+def index_background(image_path):
+    """
+    Convert a background PNG to 4-bit pens.
+
+    Returns:
+        (packed nibbles as bytes, palette as 48 bytes, width, height)
+    """
+    pixels = np.array(Image.open(image_path).convert("RGB"))
+    height, width = pixels.shape[:2]
+    colors, pens = np.unique(pixels.reshape(-1, 3), axis=0, return_inverse=True)
+    if len(colors) > 16:
+        raise ValueError(f"{image_path} uses {len(colors)} colours; a room pack background allows 16")
+
+    pens = pens.reshape(-1).astype(np.uint8)
+    if len(pens) % 2:
+        pens = np.append(pens, np.uint8(0))
+    packed = (pens[0::2] << 4) | pens[1::2]
+
+    palette = np.zeros((16, 3), dtype=np.uint8)
+    palette[:len(colors)] = colors
+    return packed.tobytes(), palette.tobytes(), width, height
+
+
+def collision_bitset(collision_path):
+    """Read a collision JSON and return (bitset bytes, cols, rows)."""
+    with open(collision_path) as f:
+        data = json.load(f)
+    grid = np.array(data["collision"], dtype=np.uint8)
+    return np.packbits(grid.reshape(-1), bitorder="little").tobytes(), data["width"], data["height"]
+
+
+def _fixed(text, field="id"):
+    raw = text.encode("ascii")
+    if len(raw) > NAME_SIZE:
+        raise ValueError(f"{field} '{text}' is longer than {NAME_SIZE} characters")
+    return raw
+
+
+def build_room_pack(rooms_path, output_path, project_dir):
+    """Write the pack. Returns the number of rooms."""
+    with open(rooms_path) as f:
+        rooms = json.load(f)["rooms"]
+
+    body = bytearray()
+    entries = []
+
+    def append(data):
+        while len(body) % 4:
+            body.append(0)
+        offset = HEADER.size + len(body)
+        body.extend(data)
+        return offset
+
+    for room in rooms:
+        background, palette, width, height = index_background(project_dir / room["background"])
+        bitset, cols, rows = collision_bitset(project_dir / room["collision"])
+        doors = b"".join(
+            DOOR_RECORD.pack(_fixed(d["doorId"]), DOOR_TYPES.index(d["type"]), d["x"], d["y"],
+                             _fixed(d["targetRoomId"]), _fixed(d["targetDoorId"]))
+            for d in room["doors"]
+        )
+
+        bg_offset = append(background)
+        palette_offset = append(palette)
+        collision_offset = append(bitset)
+        doors_offset = append(doors)
+        spawn_x, spawn_y = room["spawn"]
+        entries.append(ROOM_ENTRY.pack(_fixed(room["roomId"]), bg_offset, width, height, palette_offset,
+                                       collision_offset, cols, rows, doors_offset, len(room["doors"]),
+                                       spawn_x, spawn_y))
+        print(f"  {room['roomId']}: {width}x{height} background, {cols}x{rows} collision, "
+              f"{len(room['doors'])} door(s)")
+
+    index_offset = append(b"".join(entries))
+    with open(output_path, "wb") as f:
+        f.write(HEADER.pack(PACK_MAGIC, PACK_VERSION, len(rooms), index_offset))
+        f.write(body)
+
+    return len(rooms)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack all rooms into one binary room pack")
+    parser.add_argument("--rooms", default=None, help="Room definitions (default: assets/data/rooms.json)")
+    parser.add_argument("--output", default=None, help="Output pack (default: assets/data/rooms.pack)")
+    args = parser.parse_args()
+
+    script_dir = Path(__file__).parent
+    project_dir = script_dir.parent
+
+    rooms_path = args.rooms or str(project_dir / "assets" / "data" / "rooms.json")
+    output_path = args.output or str(project_dir / "assets" / "data" / "rooms.pack")
+
+    print(f"Packing rooms from {rooms_path}...")
+    count = build_room_pack(rooms_path, output_path, project_dir)
+    print(f"\n  {count} rooms -> {output_path} ({os.path.getsize(output_path)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
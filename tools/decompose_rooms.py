@@ -0,0 +1,144 @@
+"""
+Decompose Room Backgrounds into a Shared Tile Bank and Tilemaps
+===============================================================
+CPC room screens are built from 8x8 character tiles on the same 40x18 grid
+generate_collision_grid.py uses. This splits every room background into one
+global bank of unique tiles plus a 40x18 tile index map per room.
+
+Algorithm:
+- Every background is cut into 720 8x8 cells (dedupe_cells.slice_cells)
+- All cells of all rooms are deduplicated at once (np.unique over raw cell bytes);
+  unique tiles keep first-occurrence order, so tile 0 is the first room's top-left tile
+
+Output:
+- room_tiles.png: the tile bank, BANK_COLUMNS tiles per row
+- room_tilemaps.json: {"tileSize", "bank", "bankColumns", "tileCount",
+  "rooms": {roomId: 18 rows of 40 tile indices}}
+  tilebank.TileBank loads this at runtime.
+
+Usage:
+    python decompose_rooms.py [--rooms assets/data/rooms.json] [--output-dir assets/data]
+"""
+
+import os
+import sys
+import json
+import argparse
+from pathlib import Path
+
+try:
+    from PIL import Image
+    import numpy as np
+except ImportError:
+    print("ERROR: Requires Pillow and numpy. Install with: pip install Pillow numpy")
+    sys.exit(1)
+
+from dedupe_cells import slice_cells
+
+TILE_SIZE = 8
+GRID_COLS = 40
+GRID_ROWS = 18
+BANK_COLUMNS = 32
+
+
+def decompose_rooms(backgrounds):
+    """
+    Split backgrounds into a deduplicated tile bank and tilemaps.
+
+    Args:
+        backgrounds: {room_id: PIL image (320x144)}
+
+    Returns:
+        (tiles, tilemaps) where tiles is a (num_tiles, 8, 8, 4) uint8 array and
+        tilemaps maps room_id -> (18, 40) int array of tile indices
+    """
+    room_ids = list(backgrounds)
+    cells = []
+    for room_id in room_ids:
+        room_cells, rows, cols = slice_cells(backgrounds[room_id], TILE_SIZE, TILE_SIZE, black_threshold=1)
+        if (rows, cols) != (GRID_ROWS, GRID_COLS):
+            print(f"  WARNING: {room_id} is {cols}x{rows} tiles, expected {GRID_COLS}x{GRID_ROWS}")
+        cells.append(room_cells)
+    all_cells = np.concatenate(cells)
+
+    keys = np.ascontiguousarray(all_cells.reshape(len(all_cells), -1)).view(
+        np.dtype((np.void, TILE_SIZE * TILE_SIZE * 4))).ravel()
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    order = np.argsort(first)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    indices = rank[inverse.reshape(-1)]
+
+    tilemaps = {}
+    start = 0
+    for room_id, room_cells in zip(room_ids, cells):
+        tilemaps[room_id] = indices[start:start + len(room_cells)].reshape(GRID_ROWS, GRID_COLS)
+        start += len(room_cells)
+    return all_cells[first[order]], tilemaps
+
+
+def save_tile_bank(tiles, output_path):
+    """Write the tile bank as a grid PNG, BANK_COLUMNS tiles per row."""
+    rows = (len(tiles) + BANK_COLUMNS - 1) // BANK_COLUMNS
+    grid = np.zeros((rows * BANK_COLUMNS, TILE_SIZE, TILE_SIZE, 4), dtype=np.uint8)
+    grid[:len(tiles)] = tiles
+    grid[:len(tiles), :, :, 3] = 255  # Backgrounds are opaque; black tiles stay black
+    grid = grid.reshape(rows, BANK_COLUMNS, TILE_SIZE, TILE_SIZE, 4).transpose(0, 2, 1, 3, 4)
+    Image.fromarray(grid.reshape(rows * TILE_SIZE, BANK_COLUMNS * TILE_SIZE, 4), "RGBA").save(output_path)
+
+
+def print_stats(tiles, tilemaps):
+    """Print per-room and overall reuse statistics."""
+    total = sum(m.size for m in tilemaps.values())
+    print(f"\n  {'room':16s} {'unique':>6s} {'shared':>6s}")
+    for room_id, tilemap in tilemaps.items():
+        used = np.unique(tilemap)
+        others = [m for r, m in tilemaps.items() if r != room_id]
+        shared = np.isin(used, np.concatenate([m.ravel() for m in others])).sum() if others else 0
+        print(f"  {room_id:16s} {len(used):6d} {shared:6d}")
+
+    counts = np.bincount(np.concatenate([m.ravel() for m in tilemaps.values()]), minlength=len(tiles))
+    raw_bytes = total * TILE_SIZE * TILE_SIZE * 3
+    packed_bytes = len(tiles) * TILE_SIZE * TILE_SIZE * 3 + total * 2
+    print(f"\n  Tiles: {total} placed, {len(tiles)} unique ({100 * (1 - len(tiles) / total):.1f}% reused)")
+    print(f"  Most used tile: #{counts.argmax()} ({counts.max()} placements)")
+    print(f"  Memory: {raw_bytes / 1024:.0f} KB as RGB images -> {packed_bytes / 1024:.0f} KB as bank + 16-bit maps")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Split room backgrounds into a shared tile bank and tilemaps")
+    parser.add_argument("--rooms", default=None, help="Room definitions (default: assets/data/rooms.json)")
+    parser.add_argument("--output-dir", default=None, help="Output directory (default: assets/data)")
+    args = parser.parse_args()
+
+    script_dir = Path(__file__).parent
+    project_dir = script_dir.parent
+
+    rooms_path = args.rooms or str(project_dir / "assets" / "data" / "rooms.json")
+    output_dir = args.output_dir or str(project_dir / "assets" / "data")
+    os.makedirs(output_dir, exist_ok=True)
+
+    with open(rooms_path) as f:
+        rooms = json.load(f)["rooms"]
+    backgrounds = {room["roomId"]: Image.open(project_dir / room["background"]) for room in rooms}
+    print(f"Decomposing {len(backgrounds)} room backgrounds...")
+
+    tiles, tilemaps = decompose_rooms(backgrounds)
+    print_stats(tiles, tilemaps)
+
+    bank_path = os.path.join(output_dir, "room_tiles.png")
+    save_tile_bank(tiles, bank_path)
+    with open(os.path.join(output_dir, "room_tilemaps.json"), "w") as f:
+        json.dump({
+            "tileSize": TILE_SIZE,
+            "bank": "room_tiles.png",
+            "bankColumns": BANK_COLUMNS,
+            "tileCount": len(tiles),
+            "rooms": {room_id: tilemap.tolist() for room_id, tilemap in tilemaps.items()},
+        }, f)
+    print(f"\n  Bank: {bank_path}")
+    print(f"  Tilemaps: {os.path.join(output_dir, 'room_tilemaps.json')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""
+Find Duplicate and Mirrored Cells in a Grid Sprite Sheet
+========================================================
+Slices a sheet on a fixed grid (24x24 by default, 48x8 cells for Spritesheet2.png),
+hashes every cell together with its horizontally, vertically and doubly flipped
+forms, and groups cells that are identical up to a flip.
+
+Algorithm:
+- Background pixels (RGB < threshold or alpha 0) are normalised to transparent black
+- Each cell is hashed in all 4 orientations at once (np.unique over raw cell bytes)
+- A cell's canonical key is the smallest of its 4 orientation hashes; cells with the
+  same key form a group, the first cell of a group is kept as the unique copy
+- Flip to rebuild a cell from its unique copy = cell flip XOR copy flip (flips commute)
+
+Output:
+- <sheet>_unique.png: non-blank unique cells packed into a grid
+- <sheet>_remap.json: per source cell {"unique": index or -1 for blank, "flip": "none|h|v|hv"}
+
+Without --input, every default sheet is processed with its own grid (see
+default_sheets(); the Characters sheet has 1px spacing). Grid options given on
+the command line override the defaults.
+
+Usage:
+    python dedupe_cells.py [--input FILE] [--output-dir DIR] [--cell-width 24] [--cell-height 24]
+    python dedupe_cells.py --input "../assets/images/Amstrad CPC - Sorcery - Characters.png" --spacing 1 --verify
+"""
+
+import os
+import sys
+import json
+import argparse
+from pathlib import Path
+
+try:
+    from PIL import Image
+    import numpy as np
+except ImportError:
+    print("ERROR: Requires Pillow and numpy. Install with: pip install Pillow numpy")
+    sys.exit(1)
+
+FLIP_NONE = 0
+FLIP_H = 1
+FLIP_V = 2
+FLIP_NAMES = {FLIP_NONE: "none", FLIP_H: "h", FLIP_V: "v", FLIP_H | FLIP_V: "hv"}
+UNIQUE_COLUMNS = 16
+
+
+def default_sheets(project_dir):
+    """(path, cell_width, cell_height, origin, spacing) for the sheets processed when no --input is given."""
+    return [
+        (project_dir / "Content" / "Spritesheet2.png", 24, 24, (0, 0), 0),
+        (project_dir / "assets" / "images" / "Amstrad CPC - Sorcery - Characters.png", 24, 24, (0, 0), 1),
+    ]
+
+
+def slice_cells(img, cell_width, cell_height, black_threshold=10, origin=(0, 0), spacing=0):
+    """
+    Cut an image into grid cells.
+
+    Args:
+        img: PIL image
+        cell_width, cell_height: Cell size in pixels
+        black_threshold: Pixels with all RGB values below this are background
+        origin: (x, y) of the first cell's top-left corner
+        spacing: Gap in pixels between neighbouring cells
+
+    Returns:
+        (cells, rows, cols) where cells is an (N, cell_height, cell_width, 4) uint8 array
+        in row-major order; partial cells at the right/bottom edge are ignored
+    """
+    pixels = np.array(img.convert("RGBA"))
+    background = np.all(pixels[:, :, :3] < black_threshold, axis=2) | (pixels[:, :, 3] == 0)
+    pixels[background] = 0
+
+    origin_x, origin_y = origin
+    rows = (pixels.shape[0] - origin_y + spacing) // (cell_height + spacing)
+    cols = (pixels.shape[1] - origin_x + spacing) // (cell_width + spacing)
+    ys = (origin_y + np.arange(rows)[:, None] * (cell_height + spacing) + np.arange(cell_height)).ravel()
+    xs = (origin_x + np.arange(cols)[:, None] * (cell_width + spacing) + np.arange(cell_width)).ravel()
+    grid = pixels[ys[:, None], xs[None, :]]
+    cells = grid.reshape(rows, cell_height, cols, cell_width, 4).transpose(0, 2, 1, 3, 4)
+    return cells.reshape(rows * cols, cell_height, cell_width, 4), rows, cols
+
+
+def flip_cells(cells, flip):
+    """Apply a flip code (FLIP_H / FLIP_V bits) to an array of cells."""
+    if flip & FLIP_H:
+        cells = cells[:, :, ::-1]
+    if flip & FLIP_V:
+        cells = cells[:, ::-1]
+    return cells
+
+
+def find_duplicates(cells):
+    """
+    Group cells that are identical up to a horizontal and/or vertical flip.
+
+    Returns:
+        (unique_index, flips, blank, representatives)
+        - unique_index[i]: index into representatives, -1 for blank cells
+        - flips[i]: flip code that turns representatives[unique_index[i]] into cell i
+        - blank[i]: True for fully transparent cells
+        - representatives: source cell indices kept as unique copies
+    """
+    count = len(cells)
+    flat = np.stack([flip_cells(cells, flip).reshape(count, -1) for flip in range(4)])
+    rows = np.ascontiguousarray(flat.reshape(4 * count, -1))
+    keys = rows.view(np.dtype((np.void, rows.shape[1]))).ravel()
+    _, hashes = np.unique(keys, return_inverse=True)
+    hashes = hashes.reshape(4, count)
+
+    canonical_flip = np.argmin(hashes, axis=0)
+    canonical = hashes[canonical_flip, np.arange(count)]
+    blank = ~cells.reshape(count, -1).any(axis=1)
+
+    # First occurrence of each canonical key (in reading order) becomes the unique copy
+    _, first, group = np.unique(canonical, return_index=True, return_inverse=True)
+    group_order = np.argsort(first, kind="stable")
+    representative_of = first[group]
+
+    flips = canonical_flip ^ canonical_flip[representative_of]
+
+    kept = first[group_order]
+    kept = kept[~blank[kept]]
+    index_of_source = np.full(count, -1)
+    index_of_source[kept] = np.arange(len(kept))
+    unique_index = index_of_source[representative_of]
+    unique_index[blank] = -1
+    flips[blank] = FLIP_NONE
+    return unique_index, flips, blank, kept
+
+
+def pack_unique_sheet(cells, representatives, columns=UNIQUE_COLUMNS):
+    """Lay out the unique cells in a grid image."""
+    count = max(len(representatives), 1)
+    cell_h, cell_w = cells.shape[1:3]
+    columns = min(columns, count)
+    rows = (count + columns - 1) // columns
+    sheet = np.zeros((rows * cell_h, columns * cell_w, 4), dtype=np.uint8)
+    for slot, source in enumerate(representatives):
+        y, x = divmod(slot, columns)
+        sheet[y * cell_h:(y + 1) * cell_h, x * cell_w:(x + 1) * cell_w] = cells[source]
+    return Image.fromarray(sheet, "RGBA"), columns
+
+
+def rebuild_sheet(unique_img, remap):
+    """
+    Rebuild the original grid sheet from a unique-cell sheet and its remap table.
+    This is the transform step a runtime performs when it loads the deduplicated sheet.
+    Cells are laid out edge to edge (origin and spacing of the source are not restored).
+    """
+    cell_w, cell_h = remap["cellWidth"], remap["cellHeight"]
+    unique_cols = remap["uniqueColumns"]
+    unique = np.asarray(unique_img.convert("RGBA"))
+    sheet = np.zeros((remap["rows"] * cell_h, remap["columns"] * cell_w, 4), dtype=np.uint8)
+
+    for row, row_cells in enumerate(remap["cells"]):
+        for col, entry in enumerate(row_cells):
+            if entry["unique"] < 0:
+                continue
+            uy, ux = divmod(entry["unique"], unique_cols)
+            cell = unique[uy * cell_h:(uy + 1) * cell_h, ux * cell_w:(ux + 1) * cell_w]
+            flip = {name: code for code, name in FLIP_NAMES.items()}[entry["flip"]]
+            cell = flip_cells(cell[np.newaxis], flip)[0]
+            sheet[row * cell_h:(row + 1) * cell_h, col * cell_w:(col + 1) * cell_w] = cell
+    return Image.fromarray(sheet, "RGBA")
+
+
+def dedupe_sheet(image_path, output_dir, cell_width=24, cell_height=24, black_threshold=10,
+                 origin=(0, 0), spacing=0):
+    """Process one sheet; returns (remap dict, unique image)."""
+    img = Image.open(image_path)
+    cells, rows, cols = slice_cells(img, cell_width, cell_height, black_threshold, origin, spacing)
+    unique_index, flips, blank, representatives = find_duplicates(cells)
+    unique_img, unique_cols = pack_unique_sheet(cells, representatives)
+
+    stem = Path(image_path).stem.replace(" ", "_").lower()
+    unique_name = f"{stem}_unique.png"
+
+    remap = {
+        "source": Path(image_path).name,
+        "cellWidth": cell_width,
+        "cellHeight": cell_height,
+        "origin": list(origin),
+        "spacing": spacing,
+        "columns": cols,
+        "rows": rows,
+        "uniqueSheet": unique_name,
+        "uniqueColumns": unique_cols,
+        "uniqueCount": len(representatives),
+        "cells": [
+            [{"unique": int(unique_index[r * cols + c]), "flip": FLIP_NAMES[int(flips[r * cols + c])]}
+             for c in range(cols)]
+            for r in range(rows)
+        ],
+    }
+
+    # Report
+    total = len(cells)
+    blank_count = int(blank.sum())
+    exact = int(np.sum((unique_index >= 0) & (flips == FLIP_NONE))) - len(representatives)
+    mirrored = int(np.sum((unique_index >= 0) & (flips != FLIP_NONE)))
+    print(f"\nProcessing: {Path(image_path).name} ({img.width}x{img.height})")
+    print(f"  Grid: {cols}x{rows} cells of {cell_width}x{cell_height} = {total} cells")
+    print(f"  Blank: {blank_count}")
+    print(f"  Exact duplicates: {exact}")
+    print(f"  Mirror duplicates: {mirrored}")
+    print(f"  Unique: {len(representatives)} ({100 * len(representatives) / max(total, 1):.1f}% of cells)")
+
+    groups = {}
+    for source in np.nonzero(unique_index >= 0)[0]:
+        groups.setdefault(int(unique_index[source]), []).append(int(source))
+    for index, members in groups.items():
+        if len(members) > 1:
+            labels = [f"R{m // cols + 1}C{m % cols + 1}:{FLIP_NAMES[int(flips[m])]}" for m in members]
+            print(f"    group {index}: {', '.join(labels)}")
+
+    unique_path = os.path.join(output_dir, unique_name)
+    unique_img.save(unique_path)
+    remap_path = os.path.join(output_dir, f"{stem}_remap.json")
+    with open(remap_path, "w") as f:
+        json.dump(remap, f, indent=2)
+    print(f"  Unique sheet: {unique_path} ({unique_img.width}x{unique_img.height})")
+    print(f"  Remap: {remap_path}")
+
+    return remap, unique_img
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find duplicate / mirrored cells in a grid sprite sheet")
+    parser.add_argument("--input", action="append", default=None,
+                        help="Sheet to process (repeatable, default: Spritesheet2.png and the Characters sheet)")
+    parser.add_argument("--output-dir", default=None, help="Output directory (default: assets/data)")
+    parser.add_argument("--cell-width", type=int, default=None,
+                        help="Cell width in pixels (default: 24, or the default sheet's grid)")
+    parser.add_argument("--cell-height", type=int, default=None,
+                        help="Cell height in pixels (default: 24, or the default sheet's grid)")
+    parser.add_argument("--origin", type=int, nargs=2, default=None, metavar=("X", "Y"),
+                        help="Top-left corner of the first cell (default: 0 0, or the default sheet's grid)")
+    parser.add_argument("--spacing", type=int, default=None,
+                        help="Pixels between cells (default: 0, or the default sheet's grid)")
+    parser.add_argument("--threshold", type=int, default=10,
+                        help="Black threshold (pixels below this are background, default: 10)")
+    parser.add_argument("--verify", action="store_true",
+                        help="Rebuild each sheet from its unique cells and check it matches the source grid")
+    args = parser.parse_args()
+
+    script_dir = Path(__file__).parent
+    project_dir = script_dir.parent
+
+    if args.input:
+        sheets = [(path, 24, 24, (0, 0), 0) for path in args.input]
+    else:
+        sheets = [(str(path), *grid) for path, *grid in default_sheets(project_dir)]
+    output_dir = args.output_dir or str(project_dir / "assets" / "data")
+    os.makedirs(output_dir, exist_ok=True)
+
+    for image_path, cell_width, cell_height, origin, spacing in sheets:
+        # Explicit grid options override the sheet's own grid
+        cell_width = args.cell_width if args.cell_width is not None else cell_width
+        cell_height = args.cell_height if args.cell_height is not None else cell_height
+        origin = tuple(args.origin) if args.origin is not None else origin
+        spacing = args.spacing if args.spacing is not None else spacing
+
+        remap, unique_img = dedupe_sheet(image_path, output_dir, cell_width, cell_height,
+                                         args.threshold, origin, spacing)
+        if args.verify:
+            cells, rows, cols = slice_cells(Image.open(image_path), cell_width, cell_height,
+                                            args.threshold, origin, spacing)
+            expected = cells.reshape(rows, cols, cell_height, cell_width, 4)
+            expected = expected.transpose(0, 2, 1, 3, 4).reshape(rows * cell_height, -1, 4)
+            rebuilt = np.asarray(rebuild_sheet(unique_img, remap))
+            print(f"  Verify: {'OK' if np.array_equal(rebuilt, expected) else 'MISMATCH'}")
+
+
+if __name__ == "__main__":
+    main()
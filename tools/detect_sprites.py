@@ -0,0 +1,274 @@
+"""
+Detect Sprites in a Sheet by Connected-Component Labelling
+==========================================================
+Finds every sprite on a sheet (e.g. Content/Spritesheet2.png) without any
+hand-picked X ranges and writes a JSON atlas of their bounding boxes.
+
+Algorithm:
+- Foreground mask = any pixel that is not black (RGB >= threshold) and not transparent
+- Optional proximity merge: the mask is dilated by GAP pixels to the right and down,
+  so parts separated by at most GAP background pixels become one sprite
+- Foreground runs are extracted per row, runs that touch on adjacent rows are
+  joined (8- or 4-connectivity) and the run graph is collapsed with a vectorized union-find
+- Bounding boxes are taken from the original (undilated) pixels
+
+IDs are derived from each sprite's top-left corner (<sheet>_<x>_<y>), so adding or
+removing one sprite does not renumber the others.
+
+Output JSON:
+- "image", "width", "height", "gap", "connectivity", "threshold"
+- "sprites": list of {"id", "x", "y", "w", "h", "pixels"} in reading order
+
+Usage:
+    python detect_sprites.py [--input FILE] [--output FILE] [--gap 0] [--connectivity 8] [--min-pixels 4]
+    python detect_sprites.py --debug-png overlay.png
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+try:
+    from PIL import Image, ImageDraw
+    import numpy as np
+except ImportError:
+    print("ERROR: Requires Pillow and numpy. Install with: pip install Pillow numpy")
+    sys.exit(1)
+
+
+def foreground_mask(img, black_threshold=10):
+    """
+    Build a boolean mask of sprite pixels.
+
+    Args:
+        img: PIL image (any mode)
+        black_threshold: Pixels with all RGB values below this are background
+
+    Returns:
+        2D bool array (height x width), True where a sprite pixel is
+    """
+    pixels = np.asarray(img.convert("RGBA"))
+    mask = np.any(pixels[:, :, :3] >= black_threshold, axis=2)
+    return mask & (pixels[:, :, 3] > 0)
+
+
+def dilate_mask(mask, gap):
+    """
+    Grow the mask by `gap` pixels to the right and down (box dilation).
+
+    One-sided on purpose: a pixel then reaches the next one across at most `gap` empty
+    pixels, so sprites up to `gap` apart merge. Growing both ways would merge sprites
+    up to 2 * gap apart.
+    """
+    if gap <= 0:
+        return mask
+    grown = mask.copy()
+    for shift in range(1, gap + 1):
+        grown[:, shift:] |= mask[:, :-shift]
+    rows = grown.copy()
+    for shift in range(1, gap + 1):
+        grown[shift:, :] |= rows[:-shift, :]
+    return grown
+
+
+def find_runs(mask):
+    """
+    Extract horizontal foreground runs.
+
+    Returns:
+        (rows, starts, ends) int arrays in row-major order; ends are exclusive
+    """
+    height, width = mask.shape
+    padded = np.zeros((height, width + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+    edges = np.diff(padded, axis=1)
+    rows, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)
+    return rows, starts, ends
+
+
+def _touching_run_pairs(rows, starts, ends, width, connectivity=8):
+    """Pairs (a, b) of runs where b is on the row below a and touches it."""
+    stride = width + 4
+    start_keys = rows * stride + starts
+    end_keys = rows * stride + ends
+    diagonal = 1 if connectivity == 8 else 0
+
+    # Runs on the next row touching [start, end) have end > start - diagonal and start < end + diagonal
+    lo = np.searchsorted(end_keys, (rows + 1) * stride + starts - diagonal, side="right")
+    hi = np.searchsorted(start_keys, (rows + 1) * stride + ends + diagonal, side="left")
+    counts = np.maximum(hi - lo, 0)
+
+    total = int(counts.sum())
+    a = np.repeat(np.arange(len(rows)), counts)
+    group_offsets = np.repeat(np.cumsum(counts) - counts, counts)
+    b = np.repeat(lo, counts) + (np.arange(total) - group_offsets)
+    return a, b
+
+
+def _union_find(num_nodes, a, b):
+    """Collapse an edge list to component roots with vectorized hooking and pointer jumping."""
+    parent = np.arange(num_nodes)
+    while True:
+        pa = parent[a]
+        pb = parent[b]
+        differs = pa != pb
+        if not np.any(differs):
+            return parent
+        np.minimum.at(parent, np.maximum(pa[differs], pb[differs]),
+                      np.minimum(pa[differs], pb[differs]))
+        while True:
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                break
+            parent = jumped
+
+
+def label_runs(mask, connectivity=8):
+    """
+    Label connected components of a mask at run granularity.
+
+    Args:
+        mask: 2D bool array
+        connectivity: 8 (diagonal neighbours join) or 4
+
+    Returns:
+        (rows, starts, ends, labels, count) where labels[i] is the component of run i
+    """
+    rows, starts, ends = find_runs(mask)
+    if len(rows) == 0:
+        return rows, starts, ends, np.zeros(0, dtype=np.intp), 0
+
+    a, b = _touching_run_pairs(rows, starts, ends, mask.shape[1], connectivity)
+    roots = _union_find(len(rows), a, b)
+    _, labels = np.unique(roots, return_inverse=True)
+    return rows, starts, ends, labels, int(labels.max()) + 1
+
+
+def detect_sprites(mask, gap=0, min_pixels=1, connectivity=8):
+    """
+    Find sprite bounding boxes in a foreground mask.
+
+    Args:
+        mask: 2D bool array from foreground_mask()
+        gap: Merge parts separated by at most this many background pixels
+        min_pixels: Drop components with fewer opaque pixels (specks, stray dots)
+        connectivity: 8 or 4; use 4 on tightly packed sheets where sprites touch at corners
+
+    Returns:
+        List of (x, y, w, h, pixels) tuples in reading order (top-to-bottom, left-to-right)
+    """
+    merged = dilate_mask(mask, gap)
+    m_rows, m_starts, m_ends, m_labels, count = label_runs(merged, connectivity)
+    if count == 0:
+        return []
+
+    # Map every original run to the merged run that contains its first pixel
+    rows, starts, ends = find_runs(mask)
+    stride = mask.shape[1] + 4
+    owner = np.searchsorted(m_rows * stride + m_starts, rows * stride + starts, side="right") - 1
+    labels = m_labels[owner]
+
+    x0 = np.full(count, np.iinfo(np.intp).max)
+    y0 = np.full(count, np.iinfo(np.intp).max)
+    x1 = np.full(count, -1)
+    y1 = np.full(count, -1)
+    np.minimum.at(x0, labels, starts)
+    np.minimum.at(y0, labels, rows)
+    np.maximum.at(x1, labels, ends)
+    np.maximum.at(y1, labels, rows + 1)
+    pixels = np.bincount(labels, weights=ends - starts, minlength=count).astype(int)
+
+    keep = pixels >= max(min_pixels, 1)
+    order = np.lexsort((x0[keep], y0[keep]))
+    boxes = np.stack([x0[keep], y0[keep], (x1 - x0)[keep], (y1 - y0)[keep], pixels[keep]], axis=1)
+    return [tuple(int(v) for v in box) for box in boxes[order]]
+
+
+def build_atlas(image_path, gap=0, black_threshold=10, min_pixels=1, connectivity=8):
+    """Detect sprites in an image and return the atlas dictionary."""
+    img = Image.open(image_path)
+    mask = foreground_mask(img, black_threshold)
+    prefix = Path(image_path).stem.replace(" ", "_").lower()
+
+    sprites = []
+    for x, y, w, h, count in detect_sprites(mask, gap, min_pixels, connectivity):
+        sprites.append({
+            "id": f"{prefix}_{x:04d}_{y:04d}",
+            "x": x,
+            "y": y,
+            "w": w,
+            "h": h,
+            "pixels": count,
+        })
+
+    return {
+        "image": Path(image_path).name,
+        "width": img.width,
+        "height": img.height,
+        "gap": gap,
+        "connectivity": connectivity,
+        "threshold": black_threshold,
+        "sprites": sprites,
+    }
+
+
+def create_debug_overlay(image_path, atlas, output_path):
+    """Draw every detected bounding box on a 4x copy of the sheet."""
+    scale = 4
+    img = Image.open(image_path).convert("RGB")
+    big = img.resize((img.width * scale, img.height * scale), Image.NEAREST)
+    draw = ImageDraw.Draw(big)
+    for sprite in atlas["sprites"]:
+        x, y = sprite["x"] * scale, sprite["y"] * scale
+        draw.rectangle([x, y, x + sprite["w"] * scale - 1, y + sprite["h"] * scale - 1],
+                       outline=(255, 0, 0))
+    big.save(output_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Detect sprite bounding boxes on a sprite sheet")
+    parser.add_argument("--input", default=None, help="Sprite sheet (default: Content/Spritesheet2.png)")
+    parser.add_argument("--output", default=None, help="Output atlas JSON (default: assets/data/<sheet>_atlas.json)")
+    parser.add_argument("--gap", type=int, default=0,
+                        help="Merge parts separated by at most this many black pixels (default: 0)")
+    parser.add_argument("--connectivity", type=int, choices=(4, 8), default=8,
+                        help="Pixel connectivity; 4 keeps corner-touching sprites apart (default: 8)")
+    parser.add_argument("--threshold", type=int, default=10,
+                        help="Black threshold (pixels below this are background, default: 10)")
+    parser.add_argument("--min-pixels", type=int, default=4,
+                        help="Ignore components smaller than this many pixels (default: 4)")
+    parser.add_argument("--debug-png", default=None, help="Also save a 4x overlay with the detected boxes")
+    args = parser.parse_args()
+
+    script_dir = Path(__file__).parent
+    project_dir = script_dir.parent
+
+    input_path = args.input or str(project_dir / "Content" / "Spritesheet2.png")
+    stem = Path(input_path).stem.replace(" ", "_").lower()
+    output_path = args.output or str(project_dir / "assets" / "data" / f"{stem}_atlas.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+
+    start = time.perf_counter()
+    atlas = build_atlas(input_path, args.gap, args.threshold, args.min_pixels, args.connectivity)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    print(f"Sheet: {input_path} ({atlas['width']}x{atlas['height']})")
+    print(f"  Sprites found: {len(atlas['sprites'])} "
+          f"(gap={args.gap}, connectivity={args.connectivity}, min pixels={args.min_pixels})")
+    print(f"  Detection time: {elapsed_ms:.1f} ms")
+
+    with open(output_path, "w") as f:
+        json.dump(atlas, f, indent=2)
+    print(f"  Atlas: {output_path}")
+
+    if args.debug_png:
+        create_debug_overlay(input_path, atlas, args.debug_png)
+        print(f"  Debug: {args.debug_png}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,104 +1,106 @@
 """
 Find actual sprite boundaries in the door area by scanning for non-black pixels.
 This identifies where each door sprite actually sits regardless of grid alignment.
+
+The scan works on a numpy foreground mask (see detect_sprites.py); use
+detect_sprites.py directly to find every sprite on the sheet.
+find_band_spans() is importable (tools/benchmark_tools.py times it).
 """
 
 from PIL import Image
+import numpy as np
 import os
 
-script_dir = os.path.dirname(os.path.abspath(__file__))
-project_dir = os.path.dirname(script_dir)
-spritesheet_path = os.path.join(project_dir, "Content", "Spritesheet2.png")
-output_dir = os.path.join(project_dir, "assets", "images", "door_frames")
-os.makedirs(output_dir, exist_ok=True)
-
-img = Image.open(spritesheet_path)
-
-def is_black(pixel):
-    """Check if pixel is black (background)."""
-    if len(pixel) == 4:
-        return pixel[0] == 0 and pixel[1] == 0 and pixel[2] == 0
-    return pixel[0] == 0 and pixel[1] == 0 and pixel[2] == 0
-
-# Scan the area from X=520 to X=700, full height
-# For each row of pixels, find non-black spans
-# This will reveal sprite widths and positions
-
-print("=== Horizontal non-black spans per pixel row ===")
-print("Looking for vertical bar patterns (door sprites) in X=520-700\n")
-
-# For each 24-pixel band (row), find the sprite bounding boxes
-for band_row in range(8):
-    y_start = band_row * 24
-    y_end = y_start + 24
-
-    print(f"\n--- Row {band_row+1} (Y={y_start}-{y_end-1}) ---")
-
-    # Find the overall non-black bounding box for this row band in X=520-700
-    min_x = 700
-    max_x = 520
-    min_y = y_end
-    max_y = y_start
-
-    for y in range(y_start, y_end):
-        for x in range(520, 700):
-            px = img.getpixel((x, y))
-            if not is_black(px):
-                min_x = min(min_x, x)
-                max_x = max(max_x, x)
-                min_y = min(min_y, y)
-                max_y = max(max_y, y)
-
-    if min_x <= max_x:
+from detect_sprites import foreground_mask, find_runs
+
+DOOR_X_START = 520
+DOOR_X_END = 700
+BAND_HEIGHT = 24
+NUM_BANDS = 8
+
+
+def find_band_spans(mask, x_start=DOOR_X_START, x_end=DOOR_X_END, band_height=BAND_HEIGHT, num_bands=NUM_BANDS):
+    """
+    Find the sprites in each horizontal band of a foreground mask.
+
+    Args:
+        mask: 2D bool array (True = non-black pixel), e.g. from foreground_mask()
+        x_start, x_end: Column range scanned (end exclusive)
+        band_height: Height of a band in pixels
+        num_bands: Bands scanned from the top (None = the whole sheet)
+
+    Returns:
+        List of (band_row, bounds, spans) for every band with pixels, where bounds is
+        (min_x, max_x, min_y, max_y) and spans is a list of (x_min, x_max, y_min, y_max),
+        one per contiguous run of non-empty columns (all inclusive, sheet coordinates)
+    """
+    if num_bands is None:
+        num_bands = -(-mask.shape[0] // band_height)
+    bands = []
+    for band_row in range(num_bands):
+        y_start = band_row * band_height
+        band = mask[y_start:y_start + band_height, x_start:x_end]
+        if not band.any():
+            continue
+
+        # Overall non-black bounding box for this band
+        ys, xs = np.nonzero(band)
+        bounds = (x_start + xs.min(), x_start + xs.max(), y_start + ys.min(), y_start + ys.max())
+
+        # Individual sprites as contiguous spans of columns that contain any pixel
+        col_has_pixels = band.any(axis=0)
+        _, span_starts, span_ends = find_runs(col_has_pixels[np.newaxis, :])
+        spans = []
+        for sx, ex in zip(span_starts, span_ends):
+            span_rows = np.nonzero(band[:, sx:ex].any(axis=1))[0]
+            spans.append((x_start + sx, x_start + ex - 1, y_start + span_rows.min(), y_start + span_rows.max()))
+        bands.append((band_row, bounds, spans))
+    return bands
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    project_dir = os.path.dirname(script_dir)
+    spritesheet_path = os.path.join(project_dir, "Content", "Spritesheet2.png")
+    output_dir = os.path.join(project_dir, "assets", "images", "door_frames")
+    os.makedirs(output_dir, exist_ok=True)
+
+    img = Image.open(spritesheet_path)
+
+    # Foreground mask of the whole sheet, computed once (True = non-black pixel)
+    mask = foreground_mask(img, black_threshold=1)
+
+    # Scan the area from X=520 to X=700, one 24-pixel band at a time
+    # This will reveal sprite widths and positions
+    print("=== Horizontal non-black spans per pixel row ===")
+    print(f"Looking for vertical bar patterns (door sprites) in X={DOOR_X_START}-{DOOR_X_END}\n")
+
+    bands = {band_row: (bounds, spans) for band_row, bounds, spans in find_band_spans(mask)}
+    for band_row in range(NUM_BANDS):
+        y_start = band_row * BAND_HEIGHT
+        print(f"\n--- Row {band_row+1} (Y={y_start}-{y_start + BAND_HEIGHT - 1}) ---")
+        if band_row not in bands:
+            continue
+
+        (min_x, max_x, min_y, max_y), spans = bands[band_row]
         print(f"  Overall non-black bounds: X=[{min_x}, {max_x}] Y=[{min_y}, {max_y}]")
         print(f"  Width: {max_x - min_x + 1}, Height: {max_y - min_y + 1}")
+        for sx, ex, spy_min, spy_max in spans:
+            print(f"  Sprite span: X=[{sx}, {ex}] width={ex - sx + 1}px")
+            print(f"    Y bounds: [{spy_min}, {spy_max}] height={spy_max - spy_min + 1}px")
+
+    print("\n\n=== Now extracting wider view for manual inspection ===")
+
+    # Extract rows 1-4 from X=528 to X=672 at 8x scale
+    for band_row in range(NUM_BANDS):
+        y_start = band_row * BAND_HEIGHT
+        strip = img.crop((528, y_start, 672, y_start + BAND_HEIGHT))
+        scale = 8
+        big = strip.resize((strip.width * scale, strip.height * scale), Image.NEAREST)
+        path = os.path.join(output_dir, f"row{band_row+1}_strip_8x.png")
+        big.save(path)
+        print(f"Saved row {band_row+1} strip: {path}")
+
 
-    # Now find individual sprites by looking for black vertical gaps
-    # Scan each X column and check if it's entirely black in this band
-    col_has_pixels = []
-    for x in range(520, 700):
-        has_pixel = False
-        for y in range(y_start, y_end):
-            if not is_black(img.getpixel((x, y))):
-                has_pixel = True
-                break
-        col_has_pixels.append((x, has_pixel))
-
-    # Find contiguous non-black spans
-    spans = []
-    span_start = None
-    for x, has in col_has_pixels:
-        if has and span_start is None:
-            span_start = x
-        elif not has and span_start is not None:
-            spans.append((span_start, x - 1))
-            span_start = None
-    if span_start is not None:
-        spans.append((span_start, col_has_pixels[-1][0]))
-
-    for sx, ex in spans:
-        w = ex - sx + 1
-        print(f"  Sprite span: X=[{sx}, {ex}] width={w}px")
-
-        # Find exact Y bounds for this span
-        spy_min = y_end
-        spy_max = y_start
-        for y in range(y_start, y_end):
-            for x in range(sx, ex + 1):
-                if not is_black(img.getpixel((x, y))):
-                    spy_min = min(spy_min, y)
-                    spy_max = max(spy_max, y)
-                    break
-        print(f"    Y bounds: [{spy_min}, {spy_max}] height={spy_max - spy_min + 1}px")
-
-print("\n\n=== Now extracting wider view for manual inspection ===")
-
-# Extract rows 1-4 from X=528 to X=672 at 8x scale
-for band_row in range(8):
-    y_start = band_row * 24
-    strip = img.crop((528, y_start, 672, y_start + 24))
-    scale = 8
-    big = strip.resize((strip.width * scale, strip.height * scale), Image.NEAREST)
-    path = os.path.join(output_dir, f"row{band_row+1}_strip_8x.png")
-    big.save(path)
-    print(f"Saved row {band_row+1} strip: {path}")
+if __name__ == "__main__":
+    main()
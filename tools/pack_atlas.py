@@ -0,0 +1,286 @@
+"""
+Pack Sprite, Door and Tile Frames into Texture Atlas Pages
+==========================================================
+Collects frames from every sheet the game uses and packs them into as few
+power-of-two pages as possible with a MaxRects bin packer.
+
+Sources (missing files are skipped):
+- Characters sheet (assets/images): 24x24 cells, 1px spacing
+- Content/Spritesheet2.png: 24x24 cells
+- Content/LeftDoorFrames.png / RightDoorFrames.png: 48x48 door animation frames
+- Content/Tiles.png: 8x8 tiles
+- extraction/png/conalp_tiles.png: 8x8 HUD glyphs (from convert_tiles.py)
+
+Algorithm:
+- Black pixels become transparent (pen 0 is the transparent ink on the CPC)
+- Every frame is trimmed to its opaque bounding box; blank frames are dropped
+- Identical trimmed frames share one packed rectangle
+- MaxRects with best-short-side-fit, frames sorted by longest side; full pages are
+  max-size, the last page is the smallest power-of-two size that holds the rest
+
+Output:
+- <name>_<page>.png pages
+- <name>.json with "pages" and "frames"; each frame records its page rectangle,
+  trim offset, untrimmed size and the rectangle it came from on its source sheet.
+  spritesheet.Spritesheet.from_atlas() loads this file directly.
+
+Usage:
+    python pack_atlas.py [--output-dir DIR] [--name atlas] [--max-size 1024] [--padding 1]
+"""
+
+import os
+import sys
+import json
+import argparse
+from pathlib import Path
+
+try:
+    from PIL import Image
+    import numpy as np
+except ImportError:
+    print("ERROR: Requires Pillow and numpy. Install with: pip install Pillow numpy")
+    sys.exit(1)
+
+
+def default_sources(project_dir):
+    """(prefix, path, cell_width, cell_height, spacing) for every sheet the game loads."""
+    return [
+        ("characters", project_dir / "assets" / "images" / "Amstrad CPC - Sorcery - Characters.png", 24, 24, 1),
+        ("sprites2", project_dir / "Content" / "Spritesheet2.png", 24, 24, 0),
+        ("door_left", project_dir / "Content" / "LeftDoorFrames.png", 48, 48, 0),
+        ("door_right", project_dir / "Content" / "RightDoorFrames.png", 48, 48, 0),
+        ("tiles", project_dir / "Content" / "Tiles.png", 8, 8, 0),
+        ("hud", project_dir / "extraction" / "png" / "conalp_tiles.png", 8, 8, 0),
+    ]
+
+
+def collect_frames(prefix, path, cell_width, cell_height, spacing, black_threshold=10):
+    """
+    Slice a sheet into trimmed frames.
+
+    Returns:
+        List of frame dicts with "name", "pixels" (trimmed RGBA array), "offset",
+        "sourceSize", "source" and "sourceRect"; blank cells are skipped
+    """
+    pixels = np.array(Image.open(path).convert("RGBA"))
+    pixels[np.all(pixels[:, :, :3] < black_threshold, axis=2)] = 0
+    opaque = pixels[:, :, 3] > 0
+
+    frames = []
+    step_x, step_y = cell_width + spacing, cell_height + spacing
+    rows = (pixels.shape[0] + spacing) // step_y
+    cols = (pixels.shape[1] + spacing) // step_x
+    for row in range(rows):
+        for col in range(cols):
+            x, y = col * step_x, row * step_y
+            cell_mask = opaque[y:y + cell_height, x:x + cell_width]
+            ys = np.nonzero(cell_mask.any(axis=1))[0]
+            xs = np.nonzero(cell_mask.any(axis=0))[0]
+            if len(ys) == 0:
+                continue
+            top, bottom, left, right = ys[0], ys[-1] + 1, xs[0], xs[-1] + 1
+            frames.append({
+                "name": f"{prefix}_r{row}c{col}",
+                "pixels": pixels[y + top:y + bottom, x + left:x + right],
+                "offset": (int(left), int(top)),
+                "sourceSize": (cell_width, cell_height),
+                "source": path.name,
+                "sourceRect": (x, y, cell_width, cell_height),
+            })
+    return frames
+
+
+class MaxRectsBin:
+    """MaxRects bin packer (best short side fit)."""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.free = [(0, 0, width, height)]
+
+    def insert(self, width, height):
+        """Place a rectangle; returns (x, y) or None if it does not fit."""
+        best = None
+        best_score = None
+        for fx, fy, fw, fh in self.free:
+            if width <= fw and height <= fh:
+                leftover = (min(fw - width, fh - height), max(fw - width, fh - height))
+                if best_score is None or leftover < best_score:
+                    best, best_score = (fx, fy), leftover
+        if best is None:
+            return None
+
+        self._split_free((best[0], best[1], width, height))
+        return best
+
+    def _split_free(self, placed):
+        px, py, pw, ph = placed
+        remaining = []
+        for fx, fy, fw, fh in self.free:
+            if px >= fx + fw or px + pw <= fx or py >= fy + fh or py + ph <= fy:
+                remaining.append((fx, fy, fw, fh))
+                continue
+            if px > fx:
+                remaining.append((fx, fy, px - fx, fh))
+            if px + pw < fx + fw:
+                remaining.append((px + pw, fy, fx + fw - px - pw, fh))
+            if py > fy:
+                remaining.append((fx, fy, fw, py - fy))
+            if py + ph < fy + fh:
+                remaining.append((fx, py + ph, fw, fy + fh - py - ph))
+
+        # Drop free rectangles fully contained in another one
+        self.free = [
+            a for i, a in enumerate(remaining)
+            if not any(j != i and b[0] <= a[0] and b[1] <= a[1] and
+                       a[0] + a[2] <= b[0] + b[2] and a[1] + a[3] <= b[1] + b[3] and
+                       (a != b or j < i)
+                       for j, b in enumerate(remaining))
+        ]
+
+
+def _fill_page(items, width, height, padding):
+    """Pack as many items as fit on one page; returns (placements, leftover items)."""
+    bin_ = MaxRectsBin(width, height)
+    placed = {}
+    leftover = []
+    for key, pixels in items:
+        h, w = pixels.shape[:2]
+        spot = bin_.insert(w + padding, h + padding)
+        if spot is None:
+            leftover.append((key, pixels))
+        else:
+            placed[key] = spot
+    return placed, leftover
+
+
+def _page_sizes(max_size):
+    """Power-of-two page sizes up to max_size, smallest area first (wide before tall)."""
+    sizes = []
+    side = 1
+    while side <= max_size:
+        sizes.append(side)
+        side *= 2
+    return sorted(((w, h) for w in sizes for h in sizes if h <= w), key=lambda s: (s[0] * s[1], -s[0]))
+
+
+def pack_frames(frames, max_size=1024, padding=1):
+    """
+    Assign every frame a page and position.
+
+    Pages are filled at max_size until the remaining frames fit on a smaller
+    page; the last page uses the smallest power-of-two size that holds them all.
+
+    Returns:
+        (pages, placements) where pages is a list of (width, height) and placements
+        maps (shape, pixel bytes) -> (page, x, y)
+    """
+    unique = {}
+    for frame in frames:
+        key = (frame["pixels"].shape, frame["pixels"].tobytes())
+        unique.setdefault(key, frame["pixels"])
+
+    remaining = sorted(unique.items(), key=lambda kv: (-max(kv[1].shape[:2]), -kv[1].shape[0] * kv[1].shape[1]))
+    for key, pixels in remaining:
+        h, w = pixels.shape[:2]
+        if w + padding > max_size or h + padding > max_size:
+            raise ValueError(f"Frame of {w}x{h} does not fit a {max_size}x{max_size} page")
+
+    pages = []
+    placements = {}
+    while remaining:
+        needed = sum((p.shape[0] + padding) * (p.shape[1] + padding) for _, p in remaining)
+        for width, height in _page_sizes(max_size):
+            if width * height < needed and (width, height) != (max_size, max_size):
+                continue
+            placed, leftover = _fill_page(remaining, width, height, padding)
+            if not leftover or (width, height) == (max_size, max_size):
+                break
+        page = len(pages)
+        pages.append((width, height))
+        for key, (x, y) in placed.items():
+            placements[key] = (page, x, y)
+        remaining = leftover
+
+    return pages, placements
+
+
+def build_atlas(sources, output_dir, name="atlas", max_size=1024, padding=1):
+    """Pack all sources and write the pages and metadata JSON. Returns the metadata dict."""
+    frames = []
+    for prefix, path, cell_w, cell_h, spacing in sources:
+        if not path.exists():
+            print(f"  SKIPPED: {path} (not found)")
+            continue
+        sheet_frames = collect_frames(prefix, path, cell_w, cell_h, spacing)
+        print(f"  {path.name}: {len(sheet_frames)} frames")
+        frames.extend(sheet_frames)
+
+    return write_atlas(frames, output_dir, name, max_size, padding)
+
+
+def write_atlas(frames, output_dir, name="atlas", max_size=1024, padding=1):
+    """
+    Pack already trimmed frames (as returned by collect_frames) and write the
+    pages and metadata JSON. Returns the metadata dict.
+    """
+    pages, placements = pack_frames(frames, max_size, padding)
+
+    page_pixels = [np.zeros((h, w, 4), dtype=np.uint8) for w, h in pages]
+    metadata = {"pages": [], "frames": {}}
+    for frame in frames:
+        pixels = frame["pixels"]
+        page, x, y = placements[(pixels.shape, pixels.tobytes())]
+        h, w = pixels.shape[:2]
+        page_pixels[page][y:y + h, x:x + w] = pixels
+        metadata["frames"][frame["name"]] = {
+            "page": page,
+            "x": x,
+            "y": y,
+            "w": w,
+            "h": h,
+            "offsetX": frame["offset"][0],
+            "offsetY": frame["offset"][1],
+            "sourceW": frame["sourceSize"][0],
+            "sourceH": frame["sourceSize"][1],
+            "source": frame["source"],
+            "sourceRect": list(frame["sourceRect"]),
+        }
+
+    for page, pixels in enumerate(page_pixels):
+        page_name = f"{name}_{page}.png"
+        Image.fromarray(pixels, "RGBA").save(os.path.join(output_dir, page_name))
+        metadata["pages"].append({"image": page_name, "width": pixels.shape[1], "height": pixels.shape[0]})
+
+    with open(os.path.join(output_dir, f"{name}.json"), "w") as f:
+        json.dump(metadata, f, indent=2)
+
+    packed_area = sum(w * h for w, h in pages)
+    frame_area = sum(f["pixels"].shape[0] * f["pixels"].shape[1] for f in frames)
+    print(f"\n  Frames: {len(frames)} ({len(placements)} unique after trimming)")
+    print(f"  Pages: {len(pages)} -> {', '.join(f'{w}x{h}' for w, h in pages)}")
+    print(f"  Occupancy: {100 * frame_area / max(packed_area, 1):.1f}% (before sharing duplicates)")
+    return metadata
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack all game frames into power-of-two atlas pages")
+    parser.add_argument("--output-dir", default=None, help="Output directory (default: assets/atlas)")
+    parser.add_argument("--name", default="atlas", help="Base name for pages and metadata (default: atlas)")
+    parser.add_argument("--max-size", type=int, default=1024, help="Maximum page size in pixels (default: 1024)")
+    parser.add_argument("--padding", type=int, default=1, help="Pixels between packed frames (default: 1)")
+    args = parser.parse_args()
+
+    script_dir = Path(__file__).parent
+    project_dir = script_dir.parent
+
+    output_dir = args.output_dir or str(project_dir / "assets" / "atlas")
+    os.makedirs(output_dir, exist_ok=True)
+
+    print("Collecting frames...")
+    build_atlas(default_sources(project_dir), output_dir, args.name, args.max_size, args.padding)
+    print(f"\n  Metadata: {os.path.join(output_dir, args.name + '.json')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""
+Quantize Assets to the Amstrad CPC Hardware Palette
+===================================================
+Snaps every pixel to the nearest CPC colour, reports pixels that were not
+already exact palette colours (emulator colour drift, filtering) and rewrites
+the image as a 4-bit indexed PNG or a raw nibble-packed blob.
+
+Palettes:
+- hardware (default): the 27 Gate Array colours, every R/G/B combination of 0, 128, 255
+- pens16: the 16-entry CPC_PALETTE from extraction/cpc_decode.py
+
+Emulator levels:
+- WinAPE renders the three hardware levels as R/B 0, 99, 206 and G 0, 101, 207
+  (measured from its screenshots in assets/images). Each palette colour is also
+  matched at those levels (--emulator winape, the default), and such pixels are
+  counted separately instead of as drift. Output colours are always the
+  hardware values
+
+Algorithm:
+- Pixels are reduced to their unique colours first (np.unique), nearest palette
+  entries are found for those only (squared RGB distance), then mapped back
+- Pixels with alpha < 128 become a transparent index 0
+- Each output gets its own <=16 entry palette of the colours it actually uses
+
+Output (per input, in --output-dir):
+- png:     <name>.png, 4-bit indexed (tRNS marks index 0 when transparent)
+- nibbles: <name>.nib (two pixels per byte, high nibble = left pixel, as in rooms.pack)
+           + <name>.json with width, height, bitsPerPixel, palette and transparent index;
+           images using more than 16 colours are written one byte per pixel (bitsPerPixel 8)
+
+Usage:
+    python quantize_cpc_palette.py [--input FILE ...] [--output-dir DIR] [--format png|nibbles]
+    python quantize_cpc_palette.py --palette pens16 --report-only [--emulator none]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+try:
+    from PIL import Image
+    import numpy as np
+except ImportError:
+    print("ERROR: Requires Pillow and numpy. Install with: pip install Pillow numpy")
+    sys.exit(1)
+
+HARDWARE_PALETTE = np.array([(r, g, b) for g in (0, 128, 255) for r in (0, 128, 255) for b in (0, 128, 255)],
+                            dtype=np.uint8)
+
+# WinAPE's R, G, B values for the hardware levels 0, 128 and 255 (one row per level)
+WINAPE_LEVELS = np.array([(0, 0, 0), (99, 101, 99), (206, 207, 206)], dtype=np.uint8)
+
+
+def load_palette(name):
+    """Return the named palette as an (n, 3) uint8 array."""
+    if name == "hardware":
+        return HARDWARE_PALETTE
+    sys.path.insert(0, str(Path(__file__).parent.parent / "extraction"))
+    from cpc_decode import CPC_PALETTE
+    return np.array(CPC_PALETTE, dtype=np.uint8)
+
+
+def emulator_palette(palette, levels=WINAPE_LEVELS):
+    """The same colours at an emulator's channel levels (palette values must be 0, 128 or 255)."""
+    return levels[palette // 127, np.arange(3)]
+
+
+def quantize(pixels, palette, alpha_threshold=128, emulator=None):
+    """
+    Map every pixel to its nearest palette colour.
+
+    Args:
+        pixels: (h, w, 4) uint8 RGBA array
+        palette: (n, 3) uint8 palette
+        emulator: Optional (n, 3) palette of the same colours at emulator levels
+            (see emulator_palette()); a pixel matches a colour at either
+
+    Returns:
+        (pens, colors, transparent, stats) where pens is an (h, w) uint8 array of
+        indices into colors (the <=16 palette colours used, index 0 reserved for
+        transparency when transparent is True) and stats has "exact", "emulator"
+        (exact at the emulator levels), "drifted" (neither) and "maxDistance"
+        (to the nearer of the two)
+    """
+    rgb = pixels[:, :, :3].reshape(-1, 3)
+    opaque = pixels[:, :, 3].reshape(-1) >= alpha_threshold
+
+    unique, inverse = np.unique(rgb, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    distances = ((unique[:, None, :].astype(np.int32) - palette[None, :, :].astype(np.int32)) ** 2).sum(axis=2)
+    on_emulator = np.zeros(len(unique), dtype=bool)
+    if emulator is not None:
+        emulator_distances = ((unique[:, None, :].astype(np.int32) -
+                               emulator[None, :, :].astype(np.int32)) ** 2).sum(axis=2)
+        on_emulator = (emulator_distances.min(axis=1) == 0) & (distances.min(axis=1) > 0)
+        distances = np.minimum(distances, emulator_distances)
+    nearest = distances.argmin(axis=1)
+    nearest_distance = np.sqrt(distances.min(axis=1))
+
+    pixel_palette = nearest[inverse]
+    drifted = (nearest_distance[inverse] > 0) & opaque
+    emulated = on_emulator[inverse] & opaque
+    stats = {
+        "exact": int(np.count_nonzero(opaque) - np.count_nonzero(drifted) - np.count_nonzero(emulated)),
+        "emulator": int(np.count_nonzero(emulated)),
+        "drifted": int(np.count_nonzero(drifted)),
+        "maxDistance": float(nearest_distance[inverse][opaque].max()) if opaque.any() else 0.0,
+    }
+
+    transparent = not opaque.all()
+    used = np.unique(pixel_palette[opaque])
+    offset = 1 if transparent else 0
+    lookup = np.zeros(len(palette), dtype=np.uint8)
+    lookup[used] = np.arange(len(used)) + offset
+    pens = np.where(opaque, lookup[pixel_palette], 0).astype(np.uint8)
+
+    colors = palette[used]
+    if transparent:
+        colors = np.vstack([np.zeros((1, 3), dtype=np.uint8), colors])
+    return pens.reshape(pixels.shape[:2]), colors, transparent, stats
+
+
+def save_png(pens, colors, transparent, output_path):
+    """Write a 4-bit indexed PNG (8-bit if more than 16 colours are used)."""
+    img = Image.fromarray(pens, "P")
+    img.putpalette(colors.reshape(-1).tolist())
+    options = {"bits": 4} if len(colors) <= 16 else {}
+    if transparent:
+        options["transparency"] = 0
+    img.save(output_path, optimize=True, **options)
+
+
+def save_nibbles(pens, colors, transparent, output_path):
+    """
+    Write pens as a nibble-packed blob plus a JSON sidecar with the palette.
+    Pens >= 16 do not fit a nibble, so images with more than 16 colours are written
+    one byte per pixel instead (bitsPerPixel 8 in the sidecar).
+    Returns:
+        int: Bits per pixel written (4 or 8)
+    """
+    height, width = pens.shape
+    flat = pens.reshape(-1)
+    if len(colors) <= 16:
+        bits = 4
+        if len(flat) % 2:
+            flat = np.append(flat, np.uint8(0))
+        ((flat[0::2] << 4) | flat[1::2]).astype(np.uint8).tofile(output_path)
+    else:
+        bits = 8
+        flat.astype(np.uint8).tofile(output_path)
+    with open(os.path.splitext(output_path)[0] + ".json", "w") as f:
+        json.dump({
+            "width": width,
+            "height": height,
+            "bitsPerPixel": bits,
+            "palette": colors.tolist(),
+            "transparent": 0 if transparent else None,
+        }, f, indent=2)
+    return bits
+
+
+def _decode_ms(path, runs=5):
+    start = time.perf_counter()
+    for _ in range(runs):
+        Image.open(path).convert("RGBA").load()
+    return (time.perf_counter() - start) * 1000 / runs
+
+
+def process_image(path, palette, output_dir, fmt="png", report_only=False, emulator=None):
+    """Quantize one image, write it (unless report_only) and print a report line. Returns stats."""
+    pixels = np.array(Image.open(path).convert("RGBA"))
+    pens, colors, transparent, stats = quantize(pixels, palette, emulator=emulator)
+
+    total = stats["exact"] + stats["emulator"] + stats["drifted"]
+    emulated = f"{stats['emulator']} at emulator levels, " if emulator is not None else ""
+    print(f"  {Path(path).name}: {pixels.shape[1]}x{pixels.shape[0]}, {len(colors)} colours, {emulated}"
+          f"{stats['drifted']} of {total} pixels off-palette (max distance {stats['maxDistance']:.0f})")
+    if len(colors) > 16 and not report_only:
+        written_as = "8-bit indexed PNG" if fmt == "png" else "8 bits per pixel (bitsPerPixel 8 in the JSON)"
+        print(f"    WARNING: {len(colors)} colours do not fit 4 bits; written as {written_as}")
+    elif len(colors) > 16:
+        print(f"    WARNING: {len(colors)} colours do not fit 4 bits")
+
+    if not report_only:
+        stem = Path(path).stem
+        if fmt == "png":
+            output_path = os.path.join(output_dir, stem + ".png")
+            save_png(pens, colors, transparent, output_path)
+            print(f"    {os.path.getsize(path)} -> {os.path.getsize(output_path)} bytes, "
+                  f"decode {_decode_ms(path):.2f} -> {_decode_ms(output_path):.2f} ms")
+        else:
+            output_path = os.path.join(output_dir, stem + ".nib")
+            save_nibbles(pens, colors, transparent, output_path)
+            print(f"    {os.path.getsize(path)} -> {os.path.getsize(output_path)} bytes (+ palette JSON)")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Quantize images to the CPC palette and write 4-bit assets")
+    parser.add_argument("--input", action="append", default=None,
+                        help="Image to quantize (repeatable; default: all PNGs in assets/images and Content)")
+    parser.add_argument("--output-dir", default=None, help="Output directory (default: assets/indexed)")
+    parser.add_argument("--palette", choices=("hardware", "pens16"), default="hardware",
+                        help="Target palette (default: hardware, the 27 CPC colours)")
+    parser.add_argument("--emulator", choices=("winape", "none"), default="winape",
+                        help="Also match colours at these emulator levels (default: winape)")
+    parser.add_argument("--format", choices=("png", "nibbles"), default="png", help="Output format (default: png)")
+    parser.add_argument("--report-only", action="store_true", help="Only report off-palette pixels")
+    args = parser.parse_args()
+
+    script_dir = Path(__file__).parent
+    project_dir = script_dir.parent
+
+    inputs = args.input or sorted(
+        [str(p) for p in (project_dir / "assets" / "images").glob("*.png")] +
+        [str(p) for p in (project_dir / "Content").glob("*.png")]
+    )
+    output_dir = args.output_dir or str(project_dir / "assets" / "indexed")
+    if not args.report_only:
+        os.makedirs(output_dir, exist_ok=True)
+
+    palette = load_palette(args.palette)
+    emulator = emulator_palette(palette) if args.emulator == "winape" else None
+    print(f"Quantizing {len(inputs)} images to the {args.palette} palette ({len(palette)} colours)...")
+    drifted = 0
+    for path in inputs:
+        drifted += process_image(path, palette, output_dir, args.format, args.report_only, emulator)["drifted"]
+    print(f"\n  Total off-palette pixels: {drifted}")
+
+
+if __name__ == "__main__":
+    main()